@@ -0,0 +1,143 @@
+import hashlib
+import time
+from typing import Any, Callable
+
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from library_service.replicas import use_primary
+
+
+CACHE_TIMEOUT = 300
+LOCK_TIMEOUT = 10
+LOCK_WAIT = 5
+LOCK_POLL_INTERVAL = 0.05
+
+VERSION_KEY = "books:version"
+HITS_KEY = "books:stats:hits"
+MISSES_KEY = "books:stats:misses"
+
+
+def get_version() -> int:
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        # Start from the clock so that an evicted version never goes back
+        # to a value whose responses may still be cached.
+        cache.add(VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def invalidate_books() -> None:
+    """
+    Drop every cached book response by moving to a new version.
+    The bump is repeated after the current transaction commits,
+    so that responses cached from not yet committed data are dropped too.
+    """
+    _bump_version()
+    transaction.on_commit(_bump_version)
+
+
+def _bump_version() -> None:
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.add(VERSION_KEY, time.time_ns(), timeout=None)
+
+
+def response_cache_key(request: Request, action: str, **kwargs) -> str:
+    """
+    Build a cache key from the action, its url kwargs and the normalized
+    query params (sorted, empty values dropped).
+    """
+    params = sorted(
+        (key, values)
+        for key, values in request.query_params.lists()
+        if any(values)
+    )
+    raw = f"{request.get_host()}|{action}|{sorted(kwargs.items())}|{params}"
+    digest = hashlib.md5(raw.encode()).hexdigest()
+    return f"books:{get_version()}:{action}:{digest}"
+
+
+def get_or_compute(
+    key: str, compute: Callable[[], Any], track_stats: bool = True
+) -> Any:
+    """
+    Return the cached value for "key", computing it on a miss.
+
+    Only one process computes a missing value (single flight), reading
+    from the primary database: the others wait up to LOCK_WAIT seconds
+    for it to appear in the cache before computing it themselves.
+    """
+    value = cache.get(key)
+    if value is not None:
+        if track_stats:
+            _count(HITS_KEY)
+        return value
+    if track_stats:
+        _count(MISSES_KEY)
+
+    lock_key = f"{key}:lock"
+    if cache.add(lock_key, 1, timeout=LOCK_TIMEOUT):
+        try:
+            # Cached for every user under the current version: read from
+            # the primary, a lagging replica could still hold older rows.
+            with use_primary():
+                value = compute()
+            cache.set(key, value, timeout=CACHE_TIMEOUT)
+        finally:
+            cache.delete(lock_key)
+        return value
+
+    deadline = time.monotonic() + LOCK_WAIT
+    while time.monotonic() < deadline:
+        time.sleep(LOCK_POLL_INTERVAL)
+        value = cache.get(key)
+        if value is not None:
+            return value
+        if cache.get(lock_key) is None:
+            break
+    return compute()
+
+
+def get_stats() -> dict:
+    hits = cache.get(HITS_KEY, 0)
+    misses = cache.get(MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": round(hits / total, 4) if total else None,
+        "version": get_version(),
+    }
+
+
+def _count(key: str) -> None:
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+
+class CachedResponseMixin:
+    """Viewset mixin caching list and retrieve responses of books."""
+
+    def list(self, request: Request, *args, **kwargs) -> Response:
+        data = get_or_compute(
+            response_cache_key(request, "list"),
+            lambda: super(CachedResponseMixin, self).list(request).data,
+        )
+        return Response(data)
+
+    def retrieve(self, request: Request, *args, **kwargs) -> Response:
+        data = get_or_compute(
+            response_cache_key(request, "retrieve", **kwargs),
+            lambda: super(CachedResponseMixin, self)
+            .retrieve(request, **kwargs)
+            .data,
+        )
+        return Response(data)
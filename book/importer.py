@@ -0,0 +1,147 @@
+import csv
+import json
+from itertools import islice
+from typing import Callable, Iterable, Iterator, TextIO
+
+from django.db import connection, transaction
+from django.db.backends.utils import CursorWrapper
+from django.utils import timezone
+
+from book.cache import invalidate_books
+from book.models import Book, merge_conflict_clause
+from book.serializers import BookImportSerializer
+
+
+IMPORT_FORMATS = ("csv", "ndjson")
+IMPORT_COLUMNS = ("title", "author", "cover", "inventory", "daily_fee")
+STAGING_TABLE = "book_import_staging"
+
+
+def read_records(
+    stream: TextIO, file_format: str
+) -> Iterator[tuple[int, dict | None]]:
+    """
+    Yield "(line number, record)" pairs from a CSV or NDJSON stream.
+    Records that cannot be decoded are yielded as None.
+    """
+    if file_format == "csv":
+        reader = csv.DictReader(stream)
+        for record in reader:
+            yield reader.line_num, record
+        return
+
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            record = None
+        yield line_number, record if isinstance(record, dict) else None
+
+
+def chunked(iterable: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def import_books(
+    stream: TextIO,
+    file_format: str = "csv",
+    chunk_size: int = 5000,
+    max_errors: int = 100,
+    on_progress: Callable[[dict], None] | None = None,
+) -> dict:
+    """
+    Import books from a CSV or NDJSON stream in a single transaction.
+
+    Rows are validated in chunks and loaded into a temporary staging table
+    ("COPY" on Postgres), then merged into the catalog with one
+    "INSERT ... ON CONFLICT" statement: existing books (same title, author
+    and cover) get their inventory increased, new ones are created.
+    Only one chunk is held in memory at a time. Invalid rows are skipped
+    and reported; at most "max_errors" of them are kept in the report.
+    """
+    report = {"rows": 0, "imported": 0, "failed": 0, "books": 0, "errors": []}
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        _create_staging_table(cursor)
+        for chunk in chunked(read_records(stream, file_format), chunk_size):
+            rows = []
+            for line_number, record in chunk:
+                row, errors = _validate(record)
+                if errors:
+                    report["failed"] += 1
+                    if len(report["errors"]) < max_errors:
+                        report["errors"].append(
+                            {"line": line_number, "errors": errors}
+                        )
+                else:
+                    rows.append(row)
+            _load_staging(cursor, rows)
+            report["rows"] += len(chunk)
+            report["imported"] += len(rows)
+            if on_progress:
+                on_progress(report)
+        report["books"] = _merge_staging(cursor)
+        cursor.execute(f"DROP TABLE {STAGING_TABLE}")
+        invalidate_books()
+
+    return report
+
+
+def _validate(record: dict | None) -> tuple[tuple | None, dict | None]:
+    if record is None:
+        return None, {"non_field_errors": ["Row could not be decoded."]}
+    serializer = BookImportSerializer(data=record)
+    if not serializer.is_valid():
+        return None, serializer.errors
+    data = serializer.validated_data
+    return tuple(data[column] for column in IMPORT_COLUMNS), None
+
+
+def _create_staging_table(cursor: CursorWrapper) -> None:
+    on_commit = " ON COMMIT DROP" if connection.vendor == "postgresql" else ""
+    cursor.execute(f"DROP TABLE IF EXISTS {STAGING_TABLE}")
+    cursor.execute(
+        f"CREATE TEMPORARY TABLE {STAGING_TABLE} ("
+        "title varchar(255) NOT NULL, "
+        "author varchar(255) NOT NULL, "
+        "cover varchar(5) NOT NULL, "
+        "inventory integer NOT NULL, "
+        "daily_fee numeric(6, 2) NOT NULL"
+        f"){on_commit}"
+    )
+
+
+def _load_staging(cursor: CursorWrapper, rows: list[tuple]) -> None:
+    if not rows:
+        return
+    columns = ", ".join(IMPORT_COLUMNS)
+    if connection.vendor == "postgresql":
+        with cursor.copy(
+            f"COPY {STAGING_TABLE} ({columns}) FROM STDIN"
+        ) as copy:
+            for row in rows:
+                copy.write_row(row)
+        return
+    placeholders = ", ".join(["%s"] * len(IMPORT_COLUMNS))
+    cursor.executemany(
+        f"INSERT INTO {STAGING_TABLE} ({columns}) VALUES ({placeholders})",
+        rows,
+    )
+
+
+def _merge_staging(cursor: CursorWrapper) -> int:
+    """Merge the staged rows into the catalog, return the books touched."""
+    table = Book._meta.db_table
+    cursor.execute(
+        f"INSERT INTO {table} ({', '.join(IMPORT_COLUMNS)}, updated_at) "
+        "SELECT title, author, cover, SUM(inventory), MAX(daily_fee), %s "
+        f"FROM {STAGING_TABLE} "
+        "GROUP BY title, author, cover "
+        f"{merge_conflict_clause(table)}",
+        [timezone.now()],
+    )
+    return cursor.rowcount
@@ -0,0 +1,143 @@
+import random
+import statistics
+import time
+from typing import Callable
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import connection, transaction
+from django.db.models import Q, QuerySet
+
+from book.models import Book
+from book.search import search_books
+
+
+WORDS = [
+    "history",
+    "garden",
+    "shadow",
+    "river",
+    "empire",
+    "silent",
+    "winter",
+    "journey",
+    "secret",
+    "kingdom",
+    "ocean",
+    "mountain",
+    "letters",
+    "night",
+    "machine",
+    "island",
+    "memory",
+    "forest",
+    "stranger",
+    "city",
+    "storm",
+    "dragon",
+    "clock",
+    "mirror",
+    "lantern",
+    "harbor",
+    "voyage",
+    "castle",
+]
+NAMES = [
+    "Austen",
+    "Orwell",
+    "Tolkien",
+    "Dickens",
+    "Atwood",
+    "Murakami",
+    "Hemingway",
+    "Morrison",
+    "Tolstoy",
+    "Borges",
+    "Woolf",
+    "Achebe",
+]
+QUERIES = [
+    "secret garden",
+    "winter kingdom",
+    "murakami",
+    "tolkein",
+    "dragn castle",
+    "silent ocean",
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the ranked ?q= search with the legacy icontains filters. "
+        "Seeded rows are rolled back unless --keep is given."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--rows", type=int, default=1_000_000)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--page-size", type=int, default=5)
+        parser.add_argument("--keep", action="store_true")
+
+    def handle(self, *args, **options) -> None:
+        with transaction.atomic():
+            self.seed(options["rows"])
+            if connection.vendor == "postgresql":
+                with connection.cursor() as cursor:
+                    cursor.execute("ANALYZE book_book")
+
+            for query in QUERIES:
+                legacy = self.measure(
+                    lambda: self.legacy_filter(query),
+                    options["repeat"],
+                    options["page_size"],
+                )
+                search = self.measure(
+                    lambda: search_books(Book.objects.all(), query),
+                    options["repeat"],
+                    options["page_size"],
+                )
+                self.stdout.write(
+                    f"{query!r:>18}: icontains {legacy:8.2f} ms, "
+                    f"search {search:8.2f} ms"
+                )
+
+            if not options["keep"]:
+                transaction.set_rollback(True)
+
+    def seed(self, rows: int) -> None:
+        self.stdout.write(f"Seeding {rows} books...")
+        rng = random.Random(42)
+        batch = []
+        for number in range(rows):
+            batch.append(
+                Book(
+                    title=" ".join(rng.sample(WORDS, 3)) + f" {number}",
+                    author=f"{rng.choice(NAMES)} {number % 997}",
+                    cover=rng.choice(["HARD", "SOFT"]),
+                    inventory=rng.randint(0, 20),
+                    daily_fee=rng.randint(50, 500) / 100,
+                )
+            )
+            if len(batch) == 10_000:
+                Book.objects.bulk_create(batch)
+                batch = []
+        Book.objects.bulk_create(batch)
+
+    @staticmethod
+    def legacy_filter(query: str) -> QuerySet:
+        return Book.objects.filter(
+            Q(title__icontains=query) | Q(author__icontains=query)
+        ).order_by("id")
+
+    @staticmethod
+    def measure(
+        build: Callable[[], QuerySet], repeat: int, page_size: int
+    ) -> float:
+        """Median time in ms of a paginated request: count + first page."""
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            queryset = build()
+            queryset.count()
+            list(queryset[:page_size])
+            timings.append((time.perf_counter() - start) * 1000)
+        return statistics.median(timings)
@@ -0,0 +1,50 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from book.importer import IMPORT_FORMATS, import_books
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk import books from a CSV or NDJSON file. "
+        "Existing books get their inventory increased."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("path")
+        parser.add_argument(
+            "--format", choices=IMPORT_FORMATS, dest="file_format"
+        )
+        parser.add_argument("--chunk-size", type=int, default=5000)
+        parser.add_argument("--max-errors", type=int, default=100)
+
+    def handle(self, *args, **options) -> None:
+        path = options["path"]
+        file_format = options["file_format"] or (
+            "ndjson" if path.endswith((".ndjson", ".jsonl")) else "csv"
+        )
+        with open(path, encoding="utf-8", newline="") as stream:
+            report = import_books(
+                stream,
+                file_format=file_format,
+                chunk_size=options["chunk_size"],
+                max_errors=options["max_errors"],
+                on_progress=self.progress,
+            )
+
+        for error in report["errors"]:
+            self.stderr.write(
+                f"Line {error['line']}: {json.dumps(error['errors'])}"
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {report['imported']} of {report['rows']} rows "
+                f"into {report['books']} books, {report['failed']} failed."
+            )
+        )
+
+    def progress(self, report: dict) -> None:
+        self.stdout.write(
+            f"Processed {report['rows']} rows ({report['failed']} failed)..."
+        )
@@ -0,0 +1,49 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.operations import TrigramExtension
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+
+SEARCH_INDEXES = [
+    GinIndex(
+        fields=["title"],
+        opclasses=["gin_trgm_ops"],
+        name="book_title_trgm_idx",
+    ),
+    GinIndex(
+        fields=["author"],
+        opclasses=["gin_trgm_ops"],
+        name="book_author_trgm_idx",
+    ),
+    GinIndex(
+        SearchVector("title", "author", config="english"),
+        name="book_search_vector_idx",
+    ),
+]
+
+
+def create_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    Book = apps.get_model("book", "Book")
+    for index in SEARCH_INDEXES:
+        schema_editor.add_index(Book, index)
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    Book = apps.get_model("book", "Book")
+    for index in SEARCH_INDEXES:
+        schema_editor.remove_index(Book, index)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("book", "0002_alter_book_author_alter_book_cover_alter_book_title"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
@@ -0,0 +1,54 @@
+from django.db import migrations
+from django.db.models import Count, Min, Sum
+
+
+def merge_duplicate_books(apps, schema_editor):
+    """Combine existing duplicates the same way BookSerializer.create does."""
+    Book = apps.get_model("book", "Book")
+    BorrowingBook = apps.get_model("borrowing", "Borrowing").book.through
+    duplicates = (
+        Book.objects.values("title", "author", "cover")
+        .annotate(
+            copies=Count("id"), keep_id=Min("id"), total=Sum("inventory")
+        )
+        .filter(copies__gt=1)
+    )
+    for group in duplicates:
+        keep_id = group["keep_id"]
+        extra_books = Book.objects.filter(
+            title=group["title"], author=group["author"], cover=group["cover"]
+        ).exclude(id=keep_id)
+        links = BorrowingBook.objects.filter(book__in=extra_books)
+        # A borrowing linked to several of the duplicates keeps a single
+        # link to the kept book.
+        borrowing_ids = set(
+            links.values_list("borrowing_id", flat=True)
+        ) - set(
+            BorrowingBook.objects.filter(book_id=keep_id).values_list(
+                "borrowing_id", flat=True
+            )
+        )
+        BorrowingBook.objects.bulk_create(
+            BorrowingBook(borrowing_id=borrowing_id, book_id=keep_id)
+            for borrowing_id in sorted(borrowing_ids)
+        )
+        links.delete()
+        extra_books.delete()
+        Book.objects.filter(id=keep_id).update(inventory=group["total"])
+
+
+class Migration(migrations.Migration):
+    """
+    Runs before the unique constraint, in its own transaction: on
+    PostgreSQL the constraint cannot be added in the transaction that
+    deleted the duplicates.
+    """
+
+    dependencies = [
+        ("book", "0004_book_title_id_idx"),
+        ("borrowing", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_books, migrations.RunPython.noop),
+    ]
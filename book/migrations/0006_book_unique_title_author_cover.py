@@ -0,0 +1,19 @@
+# Generated by Django 5.0 on 2026-10-18 04:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("book", "0005_merge_duplicate_books"),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name="book",
+            constraint=models.UniqueConstraint(
+                fields=("title", "author", "cover"),
+                name="book_unique_title_author_cover",
+            ),
+        ),
+    ]
@@ -1,4 +1,82 @@
-from django.db import models
+from typing import Iterable
+
+from django.db import models, router, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from book.cache import invalidate_books
+
+
+class OutOfStockError(Exception):
+    """Raised when a book has no copies left to reserve."""
+
+
+class BookQuerySet(models.QuerySet):
+    def reserve(self, book_ids: Iterable[int]) -> None:
+        """
+        Take one copy of each book, all or nothing.
+
+        The rows are locked in id order, so concurrent reservations of
+        overlapping books queue up instead of deadlocking, and decremented
+        with a single conditional UPDATE. If any book has no copies left,
+        the whole reservation is rolled back and OutOfStockError is raised.
+        """
+        book_ids = sorted(set(book_ids))
+        with transaction.atomic(using=router.db_for_write(self.model)):
+            locked = self.select_for_update().filter(id__in=book_ids)
+            list(locked.order_by("id").values_list("id", flat=True))
+            reserved = self.filter(id__in=book_ids, inventory__gt=0).update(
+                inventory=F("inventory") - 1, updated_at=timezone.now()
+            )
+            if reserved != len(book_ids):
+                raise OutOfStockError("Book is out of stock.")
+        invalidate_books()
+
+    def release(self) -> int:
+        """Put one copy of every book in the queryset back on the shelf."""
+        released = self.update(
+            inventory=F("inventory") + 1, updated_at=timezone.now()
+        )
+        invalidate_books()
+        return released
+
+    def add_stock(
+        self,
+        title: str,
+        author: str,
+        cover: str,
+        inventory: int,
+        daily_fee: float,
+    ) -> "Book":
+        """
+        Create a book, or add "inventory" to the existing copy
+        with the same title, author and cover, in a single statement.
+        """
+        table = self.model._meta.db_table
+        book = self.raw(
+            f"INSERT INTO {table} "
+            "(title, author, cover, inventory, daily_fee, updated_at) "
+            "VALUES (%s, %s, %s, %s, %s, %s) "
+            f"{merge_conflict_clause(table)} "
+            "RETURNING id, title, author, cover, inventory, daily_fee, "
+            "updated_at",
+            [title, author, cover, inventory, daily_fee, timezone.now()],
+            using=router.db_for_write(self.model),
+        )[0]
+        invalidate_books()
+        return book
+
+
+def merge_conflict_clause(table: str) -> str:
+    """
+    "ON CONFLICT" clause that combines a new copy of a book
+    with an existing one by adding up their inventory.
+    """
+    return (
+        "ON CONFLICT (title, author, cover) "
+        f"DO UPDATE SET inventory = {table}.inventory + EXCLUDED.inventory, "
+        "updated_at = EXCLUDED.updated_at"
+    )
 
 
 class Book(models.Model):
@@ -12,6 +90,20 @@ class Book(models.Model):
     cover = models.CharField(max_length=5, choices=COVER_CHOICES)
     inventory = models.PositiveIntegerField()
     daily_fee = models.DecimalField(max_digits=6, decimal_places=2)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = BookQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["title", "author", "cover"],
+                name="book_unique_title_author_cover",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["title", "id"], name="book_title_id_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"{self.title} by {self.author}"
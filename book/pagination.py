@@ -0,0 +1,107 @@
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.db import connections
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.request import Request
+from rest_framework.views import APIView
+
+
+def estimated_count(queryset: QuerySet, threshold: int) -> int | None:
+    """
+    Return the planner's row estimate for an unfiltered queryset.
+
+    The estimate comes from "pg_class.reltuples", so it costs a catalog
+    lookup instead of a full "COUNT(*)" scan. Returns None when no usable
+    estimate exists: other databases, filtered querysets and tables small
+    enough (below "threshold") to be counted exactly.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql" or queryset.query.where:
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+            [queryset.model._meta.db_table],
+        )
+        row = cursor.fetchone()
+    if row is None or row[0] < threshold:
+        return None
+    return row[0]
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that trusts the planner estimate for large tables: page
+    counts and the last page are approximate for those. As the table may
+    have grown since the estimate, pages past it are served while they
+    hold rows.
+    """
+
+    estimate_threshold = 100_000
+
+    @cached_property
+    def estimate(self) -> int | None:
+        if isinstance(self.object_list, QuerySet):
+            return estimated_count(self.object_list, self.estimate_threshold)
+        return None
+
+    @cached_property
+    def count(self) -> int:
+        if self.estimate is not None:
+            return self.estimate
+        return super().count
+
+    def validate_number(self, number: int | float | str) -> int:
+        if self.estimate is None:
+            return super().validate_number(number)
+        try:
+            if isinstance(number, float) and not number.is_integer():
+                raise ValueError
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(self.error_messages["invalid_page"])
+        if number < 1:
+            raise EmptyPage(self.error_messages["min_page"])
+        return number
+
+    def page(self, number: int | float | str) -> Page:
+        number = self.validate_number(number)
+        if self.estimate is None:
+            return super().page(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom : bottom + self.per_page])
+        if not rows and number > 1:
+            raise EmptyPage(self.error_messages["no_results"])
+        return self._get_page(rows, number, self)
+
+
+class BookPagination(PageNumberPagination):
+    """
+    Page number pagination. Views opt in to approximate counts of large
+    tables (EstimatedCountPaginator) with "estimate_count = True".
+    """
+
+    page_size = 5
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+    def paginate_queryset(
+        self, queryset: QuerySet, request: Request, view: APIView = None
+    ) -> list | None:
+        if getattr(view, "estimate_count", False):
+            self.django_paginator_class = EstimatedCountPaginator
+        return super().paginate_queryset(queryset, request, view)
+
+
+class BookCursorPagination(CursorPagination):
+    """
+    Keyset pagination over "(title, id)", backed by "book_title_id_idx".
+    Pages never run "COUNT(*)" or "OFFSET" scans. The "(title, id)" order
+    replaces any other: "?q=" results come in title order, not by rank.
+    """
+
+    page_size = 5
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = ("title", "id")
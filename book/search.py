@@ -0,0 +1,63 @@
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+    TrigramWordSimilarity,
+)
+from django.db import connections
+from django.db.models import Q, QuerySet
+from django.db.models.functions import Greatest
+
+
+SEARCH_CONFIG = "english"
+
+# Must stay identical to the expression of "book_search_vector_idx"
+# (see book/migrations/0003_book_search_indexes.py), otherwise Postgres
+# will not use the index.
+BOOK_SEARCH_VECTOR = SearchVector("title", "author", config=SEARCH_CONFIG)
+
+
+def search_books(queryset: QuerySet, query: str) -> QuerySet:
+    """
+    Filter books by a free text query, best matches first.
+
+    On Postgres full-text matches and typo-tolerant trigram matches on
+    title and author are combined and ranked.
+    Other databases (SQLite test runs) fall back to "icontains" matching.
+    """
+    query = query.strip()
+    if not query:
+        return queryset
+    if connections[queryset.db].vendor == "postgresql":
+        return _postgres_search(queryset, query)
+    return _fallback_search(queryset, query)
+
+
+def _postgres_search(queryset: QuerySet, query: str) -> QuerySet:
+    search_query = SearchQuery(
+        query, config=SEARCH_CONFIG, search_type="websearch"
+    )
+    return (
+        queryset.alias(search=BOOK_SEARCH_VECTOR)
+        .annotate(
+            rank=SearchRank(BOOK_SEARCH_VECTOR, search_query),
+            similarity=Greatest(
+                TrigramWordSimilarity(query, "title"),
+                TrigramWordSimilarity(query, "author"),
+            ),
+        )
+        .filter(
+            Q(search=search_query)
+            | Q(title__trigram_word_similar=query)
+            | Q(author__trigram_word_similar=query)
+        )
+        .order_by("-rank", "-similarity", "id")
+    )
+
+
+def _fallback_search(queryset: QuerySet, query: str) -> QuerySet:
+    for term in query.split():
+        queryset = queryset.filter(
+            Q(title__icontains=term) | Q(author__icontains=term)
+        )
+    return queryset.order_by("title", "id")
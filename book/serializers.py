@@ -1,48 +1,99 @@
 from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
 from rest_framework import serializers
 
 from book.models import Book
+from library_service.fastpath import FastReader, decimal_string
+from library_service.fields import SelectableFieldsMixin
 
 
-class BookSerializer(serializers.ModelSerializer):
+class BookSerializer(SelectableFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Book
         fields = ["id", "title", "author", "cover", "inventory", "daily_fee"]
+        # Duplicates are combined in create/update instead of rejected.
+        validators = []
 
     def create(self, validated_data: dict) -> Book:
         """Create a book, if one does not exist yet, or combine."""
-        book = Book.objects.filter(
-            title=validated_data["title"],
-            author=validated_data["author"],
-            cover=validated_data["cover"],
-        )
-        if book:
-            book = book[0]
-            book.inventory += validated_data["inventory"]
-            book.save()
-            return book
-        return Book.objects.create(**validated_data)
+        return Book.objects.add_stock(**validated_data)
 
     def update(self, instance: Book, validated_data: dict) -> Book:
-        """Update and return an existing book."""
-        book = Book.objects.filter(
-            title=validated_data["title"],
-            author=validated_data["author"],
-            cover=validated_data["cover"],
-        ).exclude(id=instance.id)
-        if book:
-            with transaction.atomic():
-                book = book[0]
-                book.inventory += validated_data["inventory"]
-                book.save()
-                instance.delete()
-                return book
-        return super().update(instance, validated_data)
-
-
-class BookReadSerializer(serializers.ModelSerializer):
+        """
+        Update and return an existing book.
+        If the new title, author and cover match another book, the two are
+        combined: its inventory is increased and this book is deleted.
+        Both rows are locked, in id order, for the duration of the merge.
+        """
+        key = {
+            field: validated_data.get(field, getattr(instance, field))
+            for field in ("title", "author", "cover")
+        }
+        with transaction.atomic():
+            books = (
+                Book.objects.select_for_update()
+                .filter(Q(id=instance.id) | Q(**key))
+                .order_by("id")
+            )
+            locked = {book.id: book for book in books}
+            instance = locked.pop(instance.id, instance)
+            if not locked:
+                return super().update(instance, validated_data)
+
+            book = locked.popitem()[1]
+            inventory = validated_data.get("inventory", instance.inventory)
+            Book.objects.filter(id=book.id).update(
+                inventory=F("inventory") + inventory,
+                updated_at=timezone.now(),
+            )
+            instance.delete()
+        book.refresh_from_db()
+        return book
+
+
+class BookReadSerializer(SelectableFieldsMixin, serializers.ModelSerializer):
     """Serializer for reading books."""
 
     class Meta:
         model = Book
         fields = ["title", "author", "inventory"]
+
+
+class BookImportSerializer(serializers.ModelSerializer):
+    """Serializer for validating rows of a bulk catalog import."""
+
+    class Meta:
+        model = Book
+        fields = ["title", "author", "cover", "inventory", "daily_fee"]
+        validators = []
+
+
+class BookImportFileSerializer(serializers.Serializer):
+    """Serializer for the uploaded bulk import file."""
+
+    file = serializers.FileField()
+    file_format = serializers.ChoiceField(
+        choices=["csv", "ndjson"], required=False
+    )
+
+
+def book_rows(rows: list[dict]) -> list[dict]:
+    """Render ".values()" rows exactly like "BookSerializer"."""
+    return [
+        {
+            "id": row["id"],
+            "title": row["title"],
+            "author": row["author"],
+            "cover": row["cover"],
+            "inventory": row["inventory"],
+            "daily_fee": decimal_string(row["daily_fee"], 2),
+        }
+        for row in rows
+    ]
+
+
+BOOK_READER = FastReader(
+    columns=("id", "title", "author", "cover", "inventory", "daily_fee"),
+    build=book_rows,
+)
@@ -1,10 +1,19 @@
+from types import SimpleNamespace
+from unittest.mock import patch
+
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.test import TestCase, override_settings
 from django.urls import reverse
 from rest_framework import status
-from rest_framework.test import APIClient
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
 
+from book.cache import get_stats
 from book.models import Book
+from book.pagination import BookPagination, EstimatedCountPaginator
 
 
 def sample_book(**params):
@@ -172,3 +181,258 @@ class UserBookTests(TestCase):
         res = self.client.get(url)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+
+class BookSearchTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        sample_book(title="The Secret Garden", author="Frances Burnett")
+        sample_book(title="Winter Garden", author="Kristin Hannah")
+        sample_book(title="Dune", author="Frank Herbert")
+
+    def test_search_matches_title_and_author(self):
+        url = reverse("books:books-list")
+
+        res = self.client.get(url, {"q": "garden hannah"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        titles = [book["title"] for book in res.data["results"]]
+        self.assertEqual(titles, ["Winter Garden"])
+
+    def test_search_returns_all_matches(self):
+        url = reverse("books:books-list")
+
+        res = self.client.get(url, {"q": "garden"})
+
+        titles = [book["title"] for book in res.data["results"]]
+        self.assertEqual(len(titles), 2)
+        self.assertNotIn("Dune", titles)
+
+    def test_blank_search_returns_every_book(self):
+        url = reverse("books:books-list")
+
+        res = self.client.get(url, {"q": " "})
+
+        self.assertEqual(res.data["count"], 3)
+
+
+class BookPaginationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        for title in ["Emma", "Beloved", "Dune", "Adam Bede", "Circe"]:
+            sample_book(title=title)
+        sample_book(title="Frankenstein")
+        self.url = reverse("books:books-list")
+
+    def test_page_size_can_be_chosen_by_client(self):
+        res = self.client.get(self.url, {"page_size": 6})
+
+        self.assertEqual(res.data["count"], 6)
+        self.assertEqual(len(res.data["results"]), 6)
+        self.assertIsNone(res.data["next"])
+
+    def test_cursor_pagination_orders_by_title_without_count(self):
+        res = self.client.get(
+            self.url, {"pagination": "cursor", "page_size": 4}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotIn("count", res.data)
+        titles = [book["title"] for book in res.data["results"]]
+        self.assertEqual(titles, ["Adam Bede", "Beloved", "Circe", "Dune"])
+
+        res = self.client.get(res.data["next"])
+
+        titles = [book["title"] for book in res.data["results"]]
+        self.assertEqual(titles, ["Emma", "Frankenstein"])
+        self.assertIsNone(res.data["next"])
+
+    def test_estimated_count_is_opt_in_per_view(self):
+        request = Request(APIRequestFactory().get("/"))
+        paginators = {}
+        for estimate_count in (False, True):
+            pagination = BookPagination()
+            view = SimpleNamespace(estimate_count=estimate_count)
+            pagination.paginate_queryset(Book.objects.all(), request, view)
+            paginators[estimate_count] = type(pagination.page.paginator)
+
+        self.assertEqual(
+            paginators, {False: Paginator, True: EstimatedCountPaginator}
+        )
+
+    @patch("book.pagination.estimated_count", return_value=2)
+    def test_pages_past_a_low_estimate_are_served(self, _):
+        res = self.client.get(self.url, {"page": 3, "page_size": 2})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["count"], 2)
+        self.assertEqual(len(res.data["results"]), 2)
+
+        res = self.client.get(self.url, {"page": 4, "page_size": 2})
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class BookImportTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin_user = get_user_model().objects.create_superuser(
+            email="admin@test.com",
+            password="password123",
+            first_name="Admin",
+            last_name="User",
+        )
+        self.client.force_authenticate(self.admin_user)
+        self.url = reverse("books:books-import-books")
+
+    def upload(self, name, content):
+        return self.client.post(
+            self.url,
+            {"file": SimpleUploadedFile(name, content.encode())},
+            format="multipart",
+        )
+
+    def test_import_csv_merges_duplicates(self):
+        sample_book(title="Dune", author="Frank Herbert", inventory=1)
+        content = (
+            "title,author,cover,inventory,daily_fee\n"
+            "Dune,Frank Herbert,HARD,2,5.99\n"
+            "Dune,Frank Herbert,HARD,3,5.99\n"
+            "Emma,Jane Austen,SOFT,4,1.50\n"
+        )
+
+        res = self.upload("books.csv", content)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["imported"], 3)
+        self.assertEqual(res.data["failed"], 0)
+        self.assertEqual(Book.objects.get(title="Dune").inventory, 6)
+        self.assertEqual(Book.objects.get(title="Emma").inventory, 4)
+
+    def test_import_ndjson_reports_invalid_rows(self):
+        content = (
+            '{"title": "Emma", "author": "Jane Austen", "cover": "SOFT", '
+            '"inventory": 4, "daily_fee": "1.50"}\n'
+            '{"title": "Dune", "author": "Frank Herbert", "cover": "PAPER", '
+            '"inventory": 1, "daily_fee": "5.99"}\n'
+            "not json\n"
+        )
+
+        res = self.upload("books.ndjson", content)
+
+        self.assertEqual(res.data["imported"], 1)
+        self.assertEqual(res.data["failed"], 2)
+        self.assertEqual(
+            [error["line"] for error in res.data["errors"]], [2, 3]
+        )
+        self.assertEqual(Book.objects.count(), 1)
+
+    def test_common_user_cannot_import(self):
+        user = get_user_model().objects.create_user(
+            email="user@test.com",
+            password="password123",
+            first_name="Common",
+            last_name="User",
+        )
+        self.client.force_authenticate(user)
+
+        res = self.upload("books.csv", "title,author,cover,inventory\n")
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class BookUpsertTests(TestCase):
+    def test_add_stock_is_a_single_statement(self):
+        book = sample_book(title="Dune", author="Frank Herbert")
+
+        with self.assertNumQueries(1):
+            merged = Book.objects.add_stock(
+                title="Dune",
+                author="Frank Herbert",
+                cover="HARD",
+                inventory=3,
+                daily_fee=5.99,
+            )
+
+        self.assertEqual(merged.id, book.id)
+        self.assertEqual(merged.inventory, 13)
+
+    def test_add_stock_creates_missing_book(self):
+        book = Book.objects.add_stock(
+            title="Emma",
+            author="Jane Austen",
+            cover="SOFT",
+            inventory=2,
+            daily_fee=1.5,
+        )
+
+        self.assertEqual(Book.objects.get(id=book.id).inventory, 2)
+
+    def test_rename_into_existing_book_merges_current_inventory(self):
+        admin_user = get_user_model().objects.create_superuser(
+            email="admin@test.com",
+            password="password123",
+            first_name="Admin",
+            last_name="User",
+        )
+        client = APIClient()
+        client.force_authenticate(admin_user)
+        book1 = sample_book(title="Dune", cover="HARD", inventory=4)
+        book2 = sample_book(title="Dune", cover="SOFT", inventory=3)
+
+        url = reverse("books:books-detail", args=[book2.id])
+        res = client.patch(url, {"cover": "HARD"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["id"], book1.id)
+        self.assertEqual(res.data["inventory"], 7)
+        self.assertFalse(Book.objects.filter(id=book2.id).exists())
+
+
+@override_settings(
+    CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+)
+class BookCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.book = sample_book(title="Dune")
+        self.url = reverse("books:books-list")
+
+    def test_repeated_list_is_served_from_cache(self):
+        self.client.get(self.url)
+
+        with self.assertNumQueries(0):
+            res = self.client.get(self.url)
+
+        self.assertEqual(res.data["results"][0]["title"], "Dune")
+        self.assertEqual(get_stats()["hits"], 1)
+        self.assertEqual(get_stats()["misses"], 1)
+
+    def test_saving_book_invalidates_cache(self):
+        detail_url = reverse("books:books-detail", args=[self.book.id])
+        self.client.get(detail_url)
+
+        self.book.inventory = 3
+        self.book.save()
+        res = self.client.get(detail_url)
+
+        self.assertEqual(res.data["inventory"], 3)
+
+    def test_query_params_are_normalized(self):
+        self.client.get(self.url, {"page_size": 5, "title": ""})
+
+        with self.assertNumQueries(0):
+            self.client.get(self.url, {"page_size": 5})
+
+    def test_unchanged_list_returns_not_modified_from_cache(self):
+        etag = self.client.get(self.url).headers["ETag"]
+
+        with self.assertNumQueries(0):
+            res = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
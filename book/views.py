@@ -1,36 +1,144 @@
+import io
+
 import django_filters
-from rest_framework import viewsets
-from rest_framework.pagination import PageNumberPagination
+from django.db.models import QuerySet
+from rest_framework import serializers, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.pagination import BasePagination
+from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import IsAdminUser
+from rest_framework.request import Request
+from rest_framework.response import Response
 
+from book.cache import (
+    CachedResponseMixin,
+    get_or_compute,
+    get_stats,
+    response_cache_key,
+)
+from book.importer import import_books
 from book.models import Book
+from book.pagination import BookCursorPagination, BookPagination
 from book.permissions import IsAdminOrReadOnly
-from book.serializers import BookSerializer
-
-
-class BookPagination(PageNumberPagination):
-    page_size = 5
-    max_page_size = 100
+from book.search import search_books
+from book.serializers import (
+    BOOK_READER,
+    BookImportFileSerializer,
+    BookSerializer,
+)
+from library_service.conditional import ConditionalGetMixin
+from library_service.fastpath import FastReadMixin
+from library_service.fields import FieldSelectionMixin
 
 
 class BookFilters(django_filters.FilterSet):
     title = django_filters.CharFilter(lookup_expr="icontains")
     author = django_filters.CharFilter(lookup_expr="icontains")
+    q = django_filters.CharFilter(
+        method="filter_search",
+        label="Search by title and author, best matches first.",
+    )
 
     class Meta:
         model = Book
-        fields = ["title", "author"]
+        fields = ["title", "author", "q"]
 
+    def filter_search(
+        self, queryset: QuerySet, name: str, value: str
+    ) -> QuerySet:
+        return search_books(queryset, value)
 
-class BookViewSet(viewsets.ModelViewSet):
+
+class BookViewSet(
+    ConditionalGetMixin,
+    CachedResponseMixin,
+    FieldSelectionMixin,
+    FastReadMixin,
+    viewsets.ModelViewSet,
+):
     """
     A viewset for viewing and editing book instances.
     - List and retrieve actions use the "BookSerializer".
     - Create action uses the "BookSerializer".
+    - Import action bulk loads a CSV or NDJSON file (staff only).
+    - List and retrieve responses are cached until a book changes
+      and support conditional requests (ETag / Last-Modified).
+    - "?fields=" limits the fields of list and retrieve responses;
+      full responses are built from ".values()" rows, without serializers.
     - The queryset is filtered based on the authenticated user.
+    - Lists are page-number paginated by default, with estimated counts
+      for large tables; "?pagination=cursor" switches to keyset
+      pagination, ordered by title even for "?q=" searches.
     """
 
     queryset = Book.objects.all()
     serializer_class = BookSerializer
     permission_classes = [IsAdminOrReadOnly]
     pagination_class = BookPagination
+    cursor_pagination_class = BookCursorPagination
+    estimate_count = True
     filterset_class = BookFilters
+    throttle_scope = "books"
+    fast_readers = {"list": BOOK_READER, "retrieve": BOOK_READER}
+
+    @property
+    def paginator(self) -> BasePagination:
+        """
+        Use keyset pagination when the client asks for it
+        or follows a cursor link.
+        """
+        if not hasattr(self, "_paginator"):
+            params = getattr(self.request, "query_params", {})
+            if "cursor" in params or params.get("pagination") == "cursor":
+                self._paginator = self.cursor_pagination_class()
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
+
+    def get_validators(self, queryset: QuerySet) -> tuple[str, int | None]:
+        """Cache the validators along with the responses they describe."""
+        return get_or_compute(
+            response_cache_key(self.request, "validators", **self.kwargs),
+            lambda: super(BookViewSet, self).get_validators(queryset),
+            track_stats=False,
+        )
+
+    def get_serializer_class(self) -> serializers.SerializerMetaclass:
+        if self.action == "import_books":
+            return BookImportFileSerializer
+        return BookSerializer
+
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="import",
+        permission_classes=[IsAdminUser],
+        parser_classes=[MultiPartParser],
+    )
+    def import_books(self, request: Request) -> Response:
+        """
+        Bulk import books from an uploaded CSV or NDJSON file.
+        Books that already exist get their inventory increased.
+        Returns a report with row counts and per-row errors.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        upload = serializer.validated_data["file"]
+        file_format = serializer.validated_data.get("file_format")
+        if file_format is None:
+            is_ndjson = upload.name.endswith((".ndjson", ".jsonl"))
+            file_format = "ndjson" if is_ndjson else "csv"
+
+        stream = io.TextIOWrapper(upload.file, encoding="utf-8", newline="")
+        report = import_books(stream, file_format=file_format)
+        return Response(report, status=status.HTTP_200_OK)
+
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="cache-stats",
+        permission_classes=[IsAdminUser],
+    )
+    def cache_stats(self, request: Request) -> Response:
+        """Return hit and miss counters of the book response cache."""
+        return Response(get_stats())
@@ -0,0 +1,154 @@
+import random
+import statistics
+import time
+from datetime import date, timedelta
+from typing import Callable
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import connection, transaction
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from book.models import Book
+from borrowing.models import Borrowing
+from borrowing.views import BorrowingViewSet
+
+
+User = get_user_model()
+
+REQUESTS = (
+    ("staff, first page", "staff", {}),
+    ("staff, is_active", "staff", {"is_active": "true"}),
+    ("user, is_active", "user", {"is_active": "true"}),
+    ("staff, 5 pages deep", "staff", {"depth": 5}),
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure GET /api/borrowings/ latency while the table grows "
+        "from 10k to 10M rows. Seeded rows are rolled back unless "
+        "--keep is given."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--sizes",
+            type=int,
+            nargs="+",
+            default=[10_000, 100_000, 1_000_000, 10_000_000],
+        )
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--keep", action="store_true")
+
+    def handle(self, *args, **options) -> None:
+        view = BorrowingViewSet.as_view({"get": "list"}, throttle_classes=[])
+        factory = APIRequestFactory(SERVER_NAME="localhost")
+
+        with transaction.atomic():
+            users = self.seed_users(options["users"])
+            staff = User.objects.create_superuser(
+                email="bench-staff@example.com",
+                password="password",
+                first_name="Bench",
+                last_name="Staff",
+            )
+            book = Book.objects.create(
+                title="Bench book",
+                author="Bench",
+                cover="SOFT",
+                inventory=1,
+                daily_fee=1,
+            )
+            clients = {"staff": staff, "user": users[0]}
+
+            seeded = 0
+            for size in sorted(options["sizes"]):
+                self.seed(size - seeded, users, book)
+                seeded = size
+                if connection.vendor == "postgresql":
+                    with connection.cursor() as cursor:
+                        cursor.execute("ANALYZE borrowing_borrowing")
+
+                timings = []
+                for _, client, params in REQUESTS:
+                    timings.append(
+                        self.measure(
+                            view,
+                            factory,
+                            clients[client],
+                            params,
+                            options["repeat"],
+                        )
+                    )
+                self.stdout.write(
+                    f"{size:>11,} rows: "
+                    + ", ".join(
+                        f"{label} {timing:7.2f} ms"
+                        for (label, _, _), timing in zip(REQUESTS, timings)
+                    )
+                )
+
+            if not options["keep"]:
+                transaction.set_rollback(True)
+
+    @staticmethod
+    def seed_users(count: int) -> list:
+        User.objects.bulk_create(
+            User(
+                email=f"bench-{number}@example.com",
+                first_name="Bench",
+                last_name=str(number),
+            )
+            for number in range(count)
+        )
+        return list(User.objects.filter(email__startswith="bench-"))
+
+    def seed(self, rows: int, users: list, book: Book) -> None:
+        self.stdout.write(f"Seeding {rows} borrowings...")
+        rng = random.Random(42)
+        today = date.today()
+        while rows > 0:
+            size = min(rows, 10_000)
+            borrowings = Borrowing.objects.bulk_create(
+                Borrowing(
+                    user=rng.choice(users),
+                    expected_return_date=today + timedelta(days=7),
+                    actual_return_date=(
+                        None if rng.random() < 0.05 else today
+                    ),
+                )
+                for _ in range(size)
+            )
+            Borrowing.book.through.objects.bulk_create(
+                Borrowing.book.through(borrowing_id=borrowing.id, book=book)
+                for borrowing in borrowings
+            )
+            rows -= size
+
+    @staticmethod
+    def measure(
+        view: Callable,
+        factory: APIRequestFactory,
+        user: User,
+        params: dict,
+        repeat: int,
+    ) -> float:
+        """Median time in ms of a list request, following "next" links."""
+        params = dict(params)
+        depth = params.pop("depth", 1)
+        timings = []
+        for _ in range(repeat):
+            url = "/api/borrowings/"
+            start = time.perf_counter()
+            for _ in range(depth):
+                request = factory.get(url, params)
+                force_authenticate(request, user=user)
+                response = view(request)
+                response.render()
+                url, params = response.data["next"], None
+                if url is None:
+                    break
+            timings.append((time.perf_counter() - start) * 1000 / depth)
+        return statistics.median(timings)
@@ -0,0 +1,22 @@
+# Generated by Django 5.0 on 2026-10-18 04:47
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("book", "0007_book_updated_at"),
+        ("borrowing", "0003_borrowing_updated_at"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="borrowing",
+            index=models.Index(
+                fields=["user", "actual_return_date", "id"],
+                name="borrowing_user_active_id_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.0 on 2026-10-18 04:58
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("book", "0007_book_updated_at"),
+        ("borrowing", "0004_borrowing_user_active_id_idx"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="borrowing",
+            index=models.Index(
+                condition=models.Q(("actual_return_date__isnull", True)),
+                fields=["id", "expected_return_date"],
+                name="borrowing_active_id_idx",
+            ),
+        ),
+    ]
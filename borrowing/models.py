@@ -14,6 +14,20 @@ class Borrowing(models.Model):
         on_delete=models.CASCADE,
         related_name="borrowings",
     )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["user", "actual_return_date", "id"],
+                name="borrowing_user_active_id_idx",
+            ),
+            models.Index(
+                fields=["id", "expected_return_date"],
+                condition=models.Q(actual_return_date__isnull=True),
+                name="borrowing_active_id_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"{self.book.title} borrowed by {self.user.email}"
@@ -0,0 +1,14 @@
+from rest_framework.pagination import CursorPagination
+
+
+class BorrowingCursorPagination(CursorPagination):
+    """
+    Keyset pagination, newest borrowings first.
+    Backed by "borrowing_user_active_id_idx" for the user and
+    "is_active" filters; pages never run "COUNT(*)" or "OFFSET" scans.
+    """
+
+    page_size = 10
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = "-id"
@@ -1,13 +1,26 @@
+from collections import defaultdict
+from typing import Iterable
+
 from django.db import transaction
+from django.db.models import F
 from django.utils import timezone
 from rest_framework import serializers
 
+from book.models import Book, OutOfStockError
 from book.serializers import BookReadSerializer
 from borrowing.models import Borrowing
-from borrowing.telegram_helper import send_message
+from library_service.fastpath import FastReader, date_string
+from library_service.fields import SelectableFieldsMixin
+from notification.outbox import enqueue_message
+from payment.pricing import (
+    FINE_MULTIPLIER,
+    basket_daily_fee,
+    rental_price,
+    to_money,
+)
 
 
-class BorrowingSerializer(serializers.ModelSerializer):
+class BorrowingSerializer(SelectableFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for Borrowing model.
     Includes book and user fields as read-only.
@@ -31,6 +44,64 @@ class BorrowingSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "borrow_date", "book", "user"]
 
 
+BORROWING_COLUMNS = (
+    "id",
+    "borrow_date",
+    "expected_return_date",
+    "actual_return_date",
+    "user__email",
+)
+
+
+def borrowing_rows(rows: list[dict], prefix: str = "") -> list[dict]:
+    """
+    Render ".values()" rows exactly like "BorrowingSerializer".
+    "prefix" is the lookup of the borrowing when the rows are of another
+    model, e.g. "borrowing__" for payments.
+    """
+    books = books_by_borrowing(row[f"{prefix}id"] for row in rows)
+    return [
+        {
+            "id": row[f"{prefix}id"],
+            "borrow_date": date_string(row[f"{prefix}borrow_date"]),
+            "expected_return_date": date_string(
+                row[f"{prefix}expected_return_date"]
+            ),
+            "actual_return_date": date_string(
+                row[f"{prefix}actual_return_date"]
+            ),
+            "book": books.get(row[f"{prefix}id"], []),
+            "user": row[f"{prefix}user__email"],
+        }
+        for row in rows
+    ]
+
+
+def books_by_borrowing(borrowing_ids: Iterable[int]) -> dict[int, list]:
+    """
+    Render the books of the borrowings like "BookReadSerializer",
+    with one query shaped like the "book" prefetch.
+    """
+    books = defaultdict(list)
+    rows = (
+        Book.objects.filter(borrowings__in=list(borrowing_ids))
+        .annotate(borrowing_id=F("borrowings"))
+        .values("borrowing_id", "title", "author", "inventory")
+    )
+    for row in rows:
+        books[row["borrowing_id"]].append(
+            {
+                "title": row["title"],
+                "author": row["author"],
+                "inventory": row["inventory"],
+            }
+        )
+    return books
+
+
+BORROWING_READER = FastReader(columns=BORROWING_COLUMNS, build=borrowing_rows)
+
+
 class BorrowingCreateSerializer(serializers.ModelSerializer):
     """
     Serializer for creating a new Borrowing instance.
@@ -60,15 +131,14 @@ class BorrowingCreateSerializer(serializers.ModelSerializer):
         """
         Create a new borrowing instance
         and decrease the inventory of the borrowed books.
-        Send a notification message via Telegram.
+        Queue a notification message for Telegram.
         """
         with transaction.atomic():
             books = validated_data.pop("book")
-            for book in books:
-                if book.inventory <= 0:
-                    raise serializers.ValidationError("Book is out of stock.")
-                book.inventory -= 1
-                book.save()
+            try:
+                Book.objects.reserve(book.id for book in books)
+            except OutOfStockError as error:
+                raise serializers.ValidationError(str(error))
 
             borrowing = Borrowing.objects.create(
                 user=self.context["request"].user, **validated_data
@@ -83,6 +153,53 @@ class BorrowingCreateSerializer(serializers.ModelSerializer):
                 f"Borrow Date: {borrowing.borrow_date}\n"
                 f"Expected return date: {borrowing.expected_return_date}"
             )
-            send_message(message)
+            enqueue_message(message)
 
             return borrowing
+
+
+class BorrowingQuoteSerializer(serializers.Serializer):
+    """
+    Serializer for pricing a basket of books for a date range.
+    Nothing is created.
+    """
+
+    book = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=100,
+    )
+    borrow_date = serializers.DateField(required=False)
+    expected_return_date = serializers.DateField()
+
+    def validate(self, attrs: dict) -> dict:
+        """
+        Validate the date range and the books.
+        """
+        borrow_date = attrs.setdefault("borrow_date", timezone.now().date())
+        if attrs["expected_return_date"] < borrow_date:
+            raise serializers.ValidationError(
+                "The expected return date "
+                "cannot be earlier than the borrowing date."
+            )
+
+        attrs["daily_fee"] = basket_daily_fee(attrs["book"])
+        if attrs["daily_fee"] is None:
+            raise serializers.ValidationError(
+                {"book": "Some of the books do not exist."}
+            )
+        return attrs
+
+    def to_representation(self, instance: dict) -> dict:
+        fee = instance["daily_fee"]
+        borrow_date = instance["borrow_date"]
+        return_date = instance["expected_return_date"]
+        return {
+            "book": sorted(set(instance["book"])),
+            "borrow_date": borrow_date,
+            "expected_return_date": return_date,
+            "days": (return_date - borrow_date).days,
+            "daily_fee": str(fee),
+            "total": str(rental_price(fee, borrow_date, return_date)),
+            "fine_per_day": str(to_money(fee * FINE_MULTIPLIER)),
+        }
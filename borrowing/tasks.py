@@ -1,29 +1,92 @@
-from celery import shared_task
 from datetime import date
+from typing import Iterable, Iterator
+
+from celery import shared_task
+from django.db.models import Prefetch
 
+from book.models import Book
 from borrowing.models import Borrowing
-from borrowing.telegram_helper import send_message
+from notification.outbox import enqueue_message
+
+
+MESSAGE_LIMIT = 4096
+MAX_DIGEST_MESSAGES = 10
+MAX_LINE_LENGTH = 300
+OVERDUE_CHUNK_SIZE = 2000
 
 
 @shared_task
 def check_overdue_borrowings() -> None:
-    today = date.today()
-    all_borrowings = Borrowing.objects.filter(actual_return_date__isnull=True)
+    """
+    Report borrowings that are past their expected return date.
 
-    if all_borrowings.exists():
-        for borrowing in all_borrowings:
-            books_title = ", ".join(
-                borrowing.book.values_list("title", flat=True)
-            )
-            status = (
-                "Overdue"
-                if borrowing.expected_return_date <= today
-                else "Not overdue"
-            )
-            message = (
-                f"Overdue borrowing: {books_title} by {borrowing.user.email}\n"
-                f"Status: {status}"
+    Rows are streamed in chunks with their user and book titles loaded
+    in bulk, and reported as at most MAX_DIGEST_MESSAGES digest messages,
+    so memory, queries and messages stay bounded however many borrowings
+    are overdue.
+    """
+    overdue = (
+        Borrowing.objects.filter(
+            actual_return_date__isnull=True,
+            expected_return_date__lt=date.today(),
+        )
+        .select_related("user")
+        .only("expected_return_date", "user__email")
+        .prefetch_related(
+            Prefetch(
+                "book", queryset=Book.objects.only("title").order_by("id")
             )
-            send_message(message)
-    else:
-        send_message("No active borrowings today!")
+        )
+        .order_by("expected_return_date", "id")
+    )
+    total = overdue.count()
+    if not total:
+        enqueue_message("No overdue borrowings today!")
+        return
+
+    for message in overdue_digests(
+        overdue.iterator(chunk_size=OVERDUE_CHUNK_SIZE), total
+    ):
+        enqueue_message(message)
+
+
+def overdue_digests(
+    borrowings: Iterable[Borrowing], total: int
+) -> Iterator[str]:
+    """
+    Pack one line per borrowing into messages of at most MESSAGE_LIMIT
+    characters. Borrowings that do not fit into MAX_DIGEST_MESSAGES
+    messages are summed up in the last one.
+    """
+    lines = [f"Overdue borrowings: {total}"]
+    length = len(lines[0])
+    messages = listed = 0
+    for borrowing in borrowings:
+        line = overdue_line(borrowing)
+        last = messages == MAX_DIGEST_MESSAGES - 1
+        # The last message keeps room for the "... more" summary.
+        limit = MESSAGE_LIMIT - MAX_LINE_LENGTH if last else MESSAGE_LIMIT
+        if length + 1 + len(line) > limit:
+            if last:
+                break
+            yield "\n".join(lines)
+            messages += 1
+            lines, length = [], -1
+        lines.append(line)
+        length += 1 + len(line)
+        listed += 1
+
+    if listed < total:
+        lines.append(f"... and {total - listed} more.")
+    yield "\n".join(lines)
+
+
+def overdue_line(borrowing: Borrowing) -> str:
+    titles = ", ".join(book.title for book in borrowing.book.all())
+    line = (
+        f"{borrowing.user.email}: {titles} "
+        f"(due {borrowing.expected_return_date:%Y-%m-%d})"
+    )
+    if len(line) > MAX_LINE_LENGTH:
+        line = line[: MAX_LINE_LENGTH - 3] + "..."
+    return line
@@ -10,15 +10,9 @@ CHAT_ID = os.getenv("CHAT_ID")
 bot = telebot.TeleBot(BOT_TOKEN)
 
 
-def send_message(text: str) -> dict:
+def send_chat_message(chat_id: str, text: str) -> None:
     """
-    Send a message to the Telegram chat.
+    Send a message to a Telegram chat, raising on failure.
     """
-    try:
-        bot.send_message(CHAT_ID, text)
-        return {"success": True, "message": "Message sent successfully"}
-    except Exception as e:
-        return {
-            "success": False,
-            "message": f"Failed to send message: {str(e)}",
-        }
+    bot.send_message(chat_id, text)
+
@@ -1,8 +1,10 @@
 from datetime import date, timedelta
+from types import SimpleNamespace
 from unittest.mock import patch
 
 from django.urls import reverse
 from django.contrib.auth import get_user_model
+from django.test import override_settings
 from rest_framework import status
 from rest_framework.test import APITestCase, APIClient
 
@@ -38,17 +40,28 @@ class BorrowingUserTests(APITestCase):
         self.borrowing_url = reverse("borrowings:borrowing-list")
         self.client.force_authenticate(user=self.user)
 
-    @patch("borrowing.serializers.send_message")
-    def test_create_borrowing_authenticated(self, mock_send_message):
+    @override_settings(STRIPE_SECRET_KEY="sk_test_fake")
+    @patch("payment.gateway.StripeGateway.create_checkout_session")
+    @patch("borrowing.serializers.enqueue_message")
+    def test_create_borrowing_authenticated(
+        self, mock_enqueue_message, mock_create_session
+    ):
+        mock_create_session.return_value = SimpleNamespace(
+            id="cs_test_1", url="https://checkout.stripe.com/c/pay/cs_test_1"
+        )
         data = {
             "expected_return_date": (date.today() + timedelta(days=10)),
             "book": [self.book.id],
         }
         response = self.client.post(self.borrowing_url, data, format="json")
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            response.json()["checkout_url"],
+            "https://checkout.stripe.com/c/pay/cs_test_1",
+        )
         self.book.refresh_from_db()
         self.assertEqual(self.book.inventory, 4)
-        mock_send_message.assert_called_once()
+        mock_enqueue_message.assert_called_once()
 
     def test_create_borrowing_out_of_stock(self):
         self.book.inventory = 0
@@ -101,8 +114,8 @@ class BorrowingUserTests(APITestCase):
     def test_user_sees_only_their_borrowings(self):
         response = self.client.get(self.borrowing_url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]["id"], self.borrowing.id)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["id"], self.borrowing.id)
 
 
 class BorrowingAdminTests(APITestCase):
@@ -133,7 +146,7 @@ class BorrowingAdminTests(APITestCase):
     def test_list_borrowings_admin_user(self):
         response = self.client.get(self.borrowing_url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
+        self.assertEqual(len(response.data["results"]), 1)
 
     def test_admin_user_can_filter_by_user_id(self):
         another_user = User.objects.create_user(
@@ -152,14 +165,38 @@ class BorrowingAdminTests(APITestCase):
             self.borrowing_url, {"user_id": another_user.id}
         )
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]["id"], another_borrowing.id)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(
+            response.data["results"][0]["id"], another_borrowing.id
+        )
 
     def test_admin_user_can_filter_by_is_active(self):
         response = self.client.get(self.borrowing_url, {"is_active": "true"})
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]["id"], self.borrowing.id)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["id"], self.borrowing.id)
+
+    def test_list_borrowings_cursor_paginated(self):
+        for days in range(1, 4):
+            borrowing = Borrowing.objects.create(
+                expected_return_date=(date.today() + timedelta(days=days)),
+                user=self.admin_user,
+            )
+            borrowing.book.set([self.book])
+
+        response = self.client.get(self.borrowing_url, {"page_size": 3})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        first_page = [item["id"] for item in response.data["results"]]
+        self.assertEqual(first_page, sorted(first_page, reverse=True))
+        self.assertNotIn("count", response.data)
+
+        response = self.client.get(response.data["next"])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [item["id"] for item in response.data["results"]],
+            [self.borrowing.id],
+        )
+        self.assertIsNone(response.data["next"])
 
 
 class BorrowingUnauthorizedTests(APITestCase):
@@ -170,3 +207,57 @@ class BorrowingUnauthorizedTests(APITestCase):
     def test_unauthenticated_access(self):
         response = self.client.get(self.borrowing_url)
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class BorrowingConditionalGetTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email="user@example.com",
+            password="password123",
+            first_name="User",
+            last_name="Example",
+        )
+        self.book = Book.objects.create(
+            title="Test Book",
+            author="Author",
+            cover="SOFT",
+            inventory=5,
+            daily_fee=1.50,
+        )
+        self.borrowing = Borrowing.objects.create(
+            expected_return_date=(date.today() + timedelta(days=10)),
+            user=self.user,
+        )
+        self.borrowing.book.set([self.book])
+        self.borrowing_url = reverse("borrowings:borrowing-list")
+        self.client.force_authenticate(user=self.user)
+
+    def test_unchanged_list_returns_not_modified(self):
+        response = self.client.get(self.borrowing_url)
+        etag = response.headers["ETag"]
+
+        response = self.client.get(self.borrowing_url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b"")
+
+    def test_changed_book_changes_etag(self):
+        detail_url = reverse(
+            "borrowings:borrowing-detail", args=[self.borrowing.id]
+        )
+        etag = self.client.get(detail_url).headers["ETag"]
+
+        self.book.inventory = 4
+        self.book.save()
+        response = self.client.get(detail_url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response.headers["ETag"], etag)
+
+    def test_malformed_id_returns_not_found(self):
+        detail_url = reverse("borrowings:borrowing-detail", args=["abc"])
+
+        response = self.client.get(detail_url)
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,160 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TransactionTestCase, skipUnlessDBFeature
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+
+from book.models import Book, OutOfStockError
+from book.tests.test_book_api import sample_book
+from borrowing.models import Borrowing
+
+
+User = get_user_model()
+
+
+class BookReservationTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email="user@example.com",
+            password="password123",
+            first_name="User",
+            last_name="Example",
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def test_reserve_decrements_each_book_once(self):
+        book = sample_book(inventory=2)
+
+        Book.objects.reserve([book.id, book.id])
+
+        book.refresh_from_db()
+        self.assertEqual(book.inventory, 1)
+
+    def test_reserve_is_all_or_nothing(self):
+        available = sample_book(title="Available", inventory=2)
+        sold_out = sample_book(title="Sold out", inventory=0)
+
+        with self.assertRaises(OutOfStockError):
+            Book.objects.reserve([available.id, sold_out.id])
+
+        available.refresh_from_db()
+        self.assertEqual(available.inventory, 2)
+
+    @patch("borrowing.serializers.enqueue_message")
+    def test_borrowing_with_sold_out_book_keeps_other_inventory(self, _):
+        available = sample_book(title="Available", inventory=2)
+        sold_out = sample_book(title="Sold out", inventory=0)
+        data = {
+            "expected_return_date": date.today() + timedelta(days=3),
+            "book": [available.id, sold_out.id],
+        }
+
+        response = self.client.post(
+            reverse("borrowings:borrowing-list"), data, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("Book is out of stock.", str(response.data))
+        available.refresh_from_db()
+        self.assertEqual(available.inventory, 2)
+
+    def test_return_restores_every_book_in_one_statement(self):
+        books = [sample_book(title=f"Book {i}", inventory=1) for i in range(3)]
+        borrowing = Borrowing.objects.create(
+            user=self.user,
+            expected_return_date=date.today() + timedelta(days=3),
+        )
+        borrowing.book.set(books)
+        url = reverse("borrowings:borrowing-return-book", args=[borrowing.id])
+
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            list(
+                Book.objects.order_by("id").values_list("inventory", flat=True)
+            ),
+            [2, 2, 2],
+        )
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            sum(Book.objects.values_list("inventory", flat=True)), 6
+        )
+
+    def test_return_other_users_borrowing_not_found(self):
+        book = sample_book(inventory=1)
+        other = User.objects.create_user(
+            email="other@example.com",
+            password="password123",
+            first_name="Other",
+            last_name="Example",
+        )
+        borrowing = Borrowing.objects.create(
+            user=other,
+            expected_return_date=date.today() + timedelta(days=3),
+        )
+        borrowing.book.add(book)
+
+        response = self.client.get(
+            reverse("borrowings:borrowing-return-book", args=[borrowing.id])
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        borrowing.refresh_from_db()
+        self.assertIsNone(borrowing.actual_return_date)
+        book.refresh_from_db()
+        self.assertEqual(book.inventory, 1)
+
+
+@skipUnlessDBFeature("has_select_for_update")
+class ConcurrentReservationTests(TransactionTestCase):
+    attempts = 200
+
+    def reserve(self, book_ids):
+        try:
+            Book.objects.reserve(book_ids)
+            return True
+        except OutOfStockError:
+            return False
+        finally:
+            connection.close()
+
+    def run_concurrently(self, book_ids):
+        with ThreadPoolExecutor(max_workers=50) as executor:
+            results = executor.map(self.reserve, [book_ids] * self.attempts)
+            return sum(results)
+
+    def test_last_copies_are_never_oversold(self):
+        book = sample_book(inventory=25)
+
+        reserved = self.run_concurrently([book.id])
+
+        book.refresh_from_db()
+        self.assertEqual(reserved, 25)
+        self.assertEqual(book.inventory, 0)
+
+    def test_overlapping_reservations_do_not_deadlock(self):
+        first = sample_book(title="First", inventory=100)
+        second = sample_book(title="Second", inventory=30)
+
+        with ThreadPoolExecutor(max_workers=50) as executor:
+            forward = executor.submit(
+                self.run_concurrently, [first.id, second.id]
+            )
+            backward = executor.submit(
+                self.run_concurrently, [second.id, first.id]
+            )
+            reserved = forward.result() + backward.result()
+
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(reserved, 30)
+        self.assertEqual(second.inventory, 0)
+        self.assertEqual(first.inventory, 70)
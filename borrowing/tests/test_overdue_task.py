@@ -0,0 +1,79 @@
+from datetime import date, timedelta
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from book.models import Book
+from borrowing import tasks
+from borrowing.models import Borrowing
+
+
+User = get_user_model()
+
+
+@patch("borrowing.tasks.enqueue_message")
+class CheckOverdueBorrowingsTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="user@example.com",
+            password="password123",
+            first_name="User",
+            last_name="Example",
+        )
+        self.book = Book.objects.create(
+            title="Test Book",
+            author="Author",
+            cover="SOFT",
+            inventory=5,
+            daily_fee=1.50,
+        )
+
+    def borrow(self, days, count=1, **params):
+        for _ in range(count):
+            borrowing = Borrowing.objects.create(
+                user=self.user,
+                expected_return_date=date.today() + timedelta(days=days),
+                **params,
+            )
+            borrowing.book.add(self.book)
+
+    def test_no_overdue_borrowings(self, enqueue_message):
+        self.borrow(days=0)
+        self.borrow(days=-1, actual_return_date=date.today())
+
+        tasks.check_overdue_borrowings()
+
+        enqueue_message.assert_called_once_with("No overdue borrowings today!")
+
+    def test_only_overdue_borrowings_are_reported(self, enqueue_message):
+        self.borrow(days=-2)
+        self.borrow(days=3)
+
+        tasks.check_overdue_borrowings()
+
+        enqueue_message.assert_called_once()
+        message = enqueue_message.call_args.args[0]
+        self.assertIn("Overdue borrowings: 1", message)
+        self.assertIn("user@example.com: Test Book", message)
+
+    def test_query_count_does_not_grow_with_borrowings(self, enqueue_message):
+        self.borrow(days=-1, count=3)
+        with self.assertNumQueries(3):
+            tasks.check_overdue_borrowings()
+
+        self.borrow(days=-1, count=30)
+        with self.assertNumQueries(3):
+            tasks.check_overdue_borrowings()
+
+    @patch.object(tasks, "MAX_DIGEST_MESSAGES", 2)
+    @patch.object(tasks, "MESSAGE_LIMIT", 400)
+    def test_digest_messages_are_bounded(self, enqueue_message):
+        self.borrow(days=-1, count=40)
+
+        tasks.check_overdue_borrowings()
+
+        messages = [call.args[0] for call in enqueue_message.call_args_list]
+        self.assertEqual(len(messages), 2)
+        self.assertTrue(all(len(message) <= 400 for message in messages))
+        self.assertRegex(messages[-1], r"\.\.\. and \d+ more\.$")
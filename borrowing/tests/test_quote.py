@@ -0,0 +1,106 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from book.models import Book
+from borrowing.models import Borrowing
+from payment.pricing import daily_fees, fine_amount, rental_amount
+
+
+User = get_user_model()
+
+
+class PricingTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="user@example.com",
+            password="password123",
+            first_name="User",
+            last_name="Example",
+        )
+        self.books = [
+            Book.objects.create(
+                title=f"Book {fee}",
+                author="Author",
+                cover="SOFT",
+                inventory=5,
+                daily_fee=fee,
+            )
+            for fee in (Decimal("1.50"), Decimal("2.25"))
+        ]
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse("borrowings:borrowing-quote")
+
+    def borrowing(self, days, books):
+        borrowing = Borrowing.objects.create(
+            user=self.user,
+            expected_return_date=date.today() + timedelta(days=days),
+        )
+        borrowing.book.set(books)
+        return borrowing
+
+    def test_amounts_keep_cents(self):
+        borrowing = self.borrowing(3, self.books)
+        borrowing.actual_return_date = borrowing.expected_return_date + (
+            timedelta(days=2)
+        )
+
+        self.assertEqual(rental_amount(borrowing), Decimal("11.25"))
+        self.assertEqual(fine_amount(borrowing), Decimal("15.00"))
+
+    def test_daily_fees_of_many_borrowings_in_one_query(self):
+        first = self.borrowing(1, self.books)
+        second = self.borrowing(1, self.books[:1])
+
+        with self.assertNumQueries(1):
+            fees = daily_fees([first.id, second.id])
+
+        self.assertEqual(
+            fees, {first.id: Decimal("3.75"), second.id: Decimal("1.50")}
+        )
+
+    def test_quote_prices_basket_without_creating_anything(self):
+        response = self.client.post(
+            self.url,
+            {
+                "book": [book.id for book in self.books],
+                "expected_return_date": date.today() + timedelta(days=3),
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["days"], 3)
+        self.assertEqual(response.data["daily_fee"], "3.75")
+        self.assertEqual(response.data["total"], "11.25")
+        self.assertEqual(response.data["fine_per_day"], "7.50")
+        self.assertFalse(Borrowing.objects.exists())
+
+    def test_quote_with_unknown_book(self):
+        response = self.client.post(
+            self.url,
+            {
+                "book": [self.books[0].id, 999],
+                "expected_return_date": date.today() + timedelta(days=3),
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("book", response.data)
+
+    def test_quote_with_invalid_date_range(self):
+        response = self.client.post(
+            self.url,
+            {
+                "book": [self.books[0].id],
+                "expected_return_date": date.today() - timedelta(days=1),
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -3,36 +3,66 @@ import datetime
 from django.db import transaction
 from django.db.models import QuerySet
 from django.http import JsonResponse
-from django.shortcuts import get_object_or_404
+from django.utils import timezone
 from drf_spectacular.utils import OpenApiParameter, extend_schema
 from rest_framework import viewsets, status, serializers
 from rest_framework.exceptions import ValidationError
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.throttling import BaseThrottle
 from rest_framework.decorators import action
 
+from book.models import Book
 from borrowing.models import Borrowing
+from borrowing.pagination import BorrowingCursorPagination
 from borrowing.serializers import (
+    BORROWING_READER,
     BorrowingCreateSerializer,
+    BorrowingQuoteSerializer,
     BorrowingSerializer,
 )
+from library_service.conditional import ConditionalGetMixin
+from library_service.fastpath import FastReadMixin
+from library_service.fields import FieldSelectionMixin
+from library_service.replicas import use_primary
 from payment.payment_helper import payment_create_borrowing, fine_payment
 
 
-class BorrowingViewSet(viewsets.ModelViewSet):
+class BorrowingViewSet(
+    ConditionalGetMixin,
+    FieldSelectionMixin,
+    FastReadMixin,
+    viewsets.ModelViewSet,
+):
     """
     A viewset for viewing and editing borrowing instances.
     - List and retrieve actions use the `BorrowingSerializer`.
     - Create action uses the `BorrowingCreateSerializer`.
     - The queryset is filtered based on the authenticated user.
+    - Lists are cursor paginated, newest first.
+    - List and retrieve support conditional requests (ETag / Last-Modified)
+      and "?fields=" / "?expand=" field selection.
+    - Full list and retrieve responses are built from ".values()" rows,
+      without serializers.
     """
 
     queryset = Borrowing.objects.select_related("user").prefetch_related(
         "book"
     )
     permission_classes = [IsAuthenticated]
+    pagination_class = BorrowingCursorPagination
     filterset_fields = ("user_id",)
+    select_related_fields = {"user": "user"}
+    prefetch_related_fields = {"book": "book"}
+    fast_readers = {"list": BORROWING_READER, "retrieve": BORROWING_READER}
+    last_modified_fields = ("updated_at", "book__updated_at")
+
+    def get_throttles(self) -> list[BaseThrottle]:
+        """Creating borrowings has its own, tighter, throttle budget."""
+        if self.action == "create":
+            self.throttle_scope = "borrowing_create"
+        return super().get_throttles()
 
     def get_serializer_class(self) -> serializers.SerializerMetaclass:
         """
@@ -40,6 +70,8 @@ class BorrowingViewSet(viewsets.ModelViewSet):
         """
         if self.action in ["list", "retrieve"]:
             return BorrowingSerializer
+        if self.action == "quote":
+            return BorrowingQuoteSerializer
         return BorrowingCreateSerializer
 
     def get_queryset(self) -> QuerySet:
@@ -80,28 +112,48 @@ class BorrowingViewSet(viewsets.ModelViewSet):
         url_path="return",
         permission_classes=[IsAuthenticated],
     )
+    @use_primary()
     def return_book(
         self, request: Request, pk: int = None
     ) -> Response | JsonResponse:
         """
         Return a borrowed book. If the book is returned late,
         a fine payment is processed.
+        Marking the borrowing returned is a conditional update,
+        so returning the same borrowing twice is rejected.
+        A GET that writes: it reads from the primary only.
         """
-        borrowing = get_object_or_404(Borrowing, pk=pk)
-        if borrowing.actual_return_date:
-            raise ValidationError("You already returned book")
         with transaction.atomic():
-            borrowing.actual_return_date = datetime.date.today()
-            borrowing.save()
-            for book in borrowing.book.all():
-                book.inventory += 1
-                book.save()
-            if borrowing.expected_return_date < borrowing.actual_return_date:
-                return fine_payment(borrowing=borrowing)
-
-            serializer = BorrowingSerializer(borrowing)
-
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            returned = (
+                self.get_queryset()
+                .filter(pk=pk, actual_return_date__isnull=True)
+                .update(
+                    actual_return_date=datetime.date.today(),
+                    updated_at=timezone.now(),
+                )
+            )
+            if not returned:
+                self.get_object()
+                raise ValidationError("You already returned book")
+            Book.objects.filter(borrowings__id=pk).release()
+
+        borrowing = self.get_object()
+        if borrowing.expected_return_date < borrowing.actual_return_date:
+            return fine_payment(borrowing=borrowing)
+
+        serializer = BorrowingSerializer(borrowing)
+
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=["post"])
+    def quote(self, request: Request) -> Response:
+        """
+        Price a basket of books for a date range without creating anything.
+        The daily fees are summed by the database in one query.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return Response(serializer.data, status=status.HTTP_200_OK)
 
     @extend_schema(
         parameters=[
@@ -17,6 +17,18 @@ app.conf.beat_schedule = {
         "task": "borrowing.tasks.check_overdue_borrowings",
         "schedule": crontab(minute=0, hour=0),
     },
+    "assess-overdue-fines-nightly": {
+        "task": "payment.tasks.assess_overdue_fines",
+        "schedule": crontab(minute=30, hour=0),
+    },
+    "reconcile-stripe-payments-every-15-minutes": {
+        "task": "payment.tasks.reconcile_stripe_payments",
+        "schedule": crontab(minute="*/15"),
+    },
+    "drain-notification-outbox-every-minute": {
+        "task": "notification.tasks.drain_outbox",
+        "schedule": crontab(),
+    },
 }
 
 
@@ -0,0 +1,123 @@
+import hashlib
+from datetime import datetime
+from typing import Callable
+
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max, QuerySet
+from django.http import Http404, HttpResponseBase
+from django.utils.cache import (
+    get_conditional_response,
+    patch_vary_headers,
+    quote_etag,
+)
+from django.utils.http import http_date
+from rest_framework.pagination import CursorPagination
+from rest_framework.request import Request
+
+
+class ConditionalGetMixin:
+    """
+    Viewset mixin adding ETag / Last-Modified validators to list and
+    retrieve responses.
+
+    The validators are derived from the row count and the latest
+    "last_modified_fields" of the filtered queryset, which takes a single
+    aggregate query. Requests whose If-None-Match / If-Modified-Since still
+    match get "304 Not Modified" without serializing anything.
+    Cursor paginated lists are validated per page, so the cost of the
+    validators does not grow with the size of the table.
+    """
+
+    last_modified_fields = ("updated_at",)
+
+    def list(self, request: Request, *args, **kwargs) -> HttpResponseBase:
+        queryset = self.filter_queryset(self.get_queryset())
+        return self.conditional_response(
+            request,
+            queryset,
+            lambda: super(ConditionalGetMixin, self).list(
+                request, *args, **kwargs
+            ),
+        )
+
+    def retrieve(self, request: Request, *args, **kwargs) -> HttpResponseBase:
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            queryset = self.filter_queryset(self.get_queryset()).filter(
+                **{self.lookup_field: kwargs[lookup_url_kwarg]}
+            )
+        except (TypeError, ValueError, ValidationError):
+            raise Http404
+        return self.conditional_response(
+            request,
+            queryset,
+            lambda: super(ConditionalGetMixin, self).retrieve(
+                request, *args, **kwargs
+            ),
+        )
+
+    def get_validators(self, queryset: QuerySet) -> tuple[str, int | None]:
+        """
+        Return the ETag and the Last-Modified timestamp of a queryset.
+        The ETag also covers the full path and the user, as responses
+        differ per query string and per user.
+        """
+        page = None
+        if self.action == "list" and isinstance(
+            self.paginator, CursorPagination
+        ):
+            page = self.get_page_keys(queryset)
+            queryset = queryset.filter(pk__in=page)
+
+        aggregates = {"rows": Count("pk", distinct=True)}
+        for index, field in enumerate(self.last_modified_fields):
+            aggregates[f"modified_{index}"] = Max(field)
+        values = queryset.order_by().aggregate(**aggregates)
+
+        modified = [
+            value
+            for key, value in values.items()
+            if key != "rows" and isinstance(value, datetime)
+        ]
+        last_modified = max(modified, default=None)
+        request = self.request
+        raw = f"{request.get_full_path()}|{request.user.pk}|{values}|{page}"
+        return (
+            hashlib.md5(raw.encode()).hexdigest(),
+            int(last_modified.timestamp()) if last_modified else None,
+        )
+
+    def get_page_keys(self, queryset: QuerySet) -> list:
+        """Return the primary keys of the requested page, in page order."""
+        paginator = type(self.paginator)()
+        ordering = paginator.get_ordering(self.request, queryset, self)
+        rows = paginator.paginate_queryset(
+            queryset.select_related(None)
+            .prefetch_related(None)
+            .only("pk", *(field.lstrip("-") for field in ordering)),
+            self.request,
+            view=self,
+        )
+        return [row.pk for row in rows]
+
+    def conditional_response(
+        self,
+        request: Request,
+        queryset: QuerySet,
+        render: Callable[[], HttpResponseBase],
+    ) -> HttpResponseBase:
+        etag, last_modified = self.get_validators(queryset)
+        etag = quote_etag(etag)
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = render()
+            if response.status_code != 200:
+                return response
+
+        response.headers["ETag"] = etag
+        if last_modified is not None:
+            response.headers["Last-Modified"] = http_date(last_modified)
+        patch_vary_headers(response, ["Authorization"])
+        return response
@@ -0,0 +1,42 @@
+from typing import Any
+
+from django.db import connections
+
+
+def pool_stats() -> dict[str, dict[str, Any]]:
+    """
+    Return the connection pool statistics of each pooled database of
+    this process, with its utilization (share of the maximum size in
+    use) and the average time a request waited for a connection.
+    """
+    stats = {}
+    for alias in connections:
+        pool = getattr(connections[alias], "pool", None)
+        if pool is None:
+            continue
+        values = pool.get_stats()
+        in_use = values["pool_size"] - values["pool_available"]
+        queued = values.get("requests_queued", 0)
+        values["utilization"] = round(in_use / values["pool_max"], 3)
+        values["avg_wait_ms"] = (
+            round(values.get("requests_wait_ms", 0) / queued, 1)
+            if queued
+            else 0
+        )
+        stats[alias] = values
+    return stats
+
+
+def release_pooled_connections() -> None:
+    """
+    Return the pooled connections of this thread to their pools before
+    a slow call to another service, so idle requests do not hold them.
+    Connections in a transaction are kept; the next query takes a
+    connection from the pool again.
+    """
+    for connection in connections.all(initialized_only=True):
+        if (
+            getattr(connection, "pool", None) is not None
+            and not connection.in_atomic_block
+        ):
+            connection.close()
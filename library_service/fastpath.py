@@ -0,0 +1,86 @@
+from decimal import Decimal
+from typing import Callable, NamedTuple
+
+from django.core.exceptions import ValidationError
+from django.db.models import QuerySet
+from django.http import Http404
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+
+class FastReader(NamedTuple):
+    """
+    A read path bypassing the serializers: "build" turns a page of
+    "queryset.values(*columns)" rows into the serializer's output.
+    """
+
+    columns: tuple[str, ...]
+    build: Callable[[list[dict]], list[dict]]
+
+
+def decimal_string(value: Decimal | None, decimal_places: int) -> str | None:
+    """Format a decimal like "serializers.DecimalField" does."""
+    if value is None:
+        return None
+    return f"{value.quantize(Decimal(1).scaleb(-decimal_places)):f}"
+
+
+def date_string(value: object) -> str | None:
+    return None if value is None else value.isoformat()
+
+
+class FastReadMixin:
+    """
+    Viewset mixin serving list and retrieve from plain ".values()" rows
+    instead of model instances and serializer fields.
+
+    "fast_readers" maps an action to its FastReader, whose output must
+    match the serializer of that action byte for byte. Requests with a
+    "?fields=" / "?expand=" selection (see FieldSelectionMixin) still go
+    through the serializers. Object permissions are not checked on this
+    path, so it is only for views whose permissions ignore the object.
+    """
+
+    fast_readers = {}
+
+    def get_fast_reader(self) -> FastReader | None:
+        if self.get_field_selection() is not None:
+            return None
+        return self.fast_readers.get(self.action)
+
+    def get_fast_rows(self, reader: FastReader) -> QuerySet:
+        return (
+            self.filter_queryset(self.get_queryset())
+            .select_related(None)
+            .prefetch_related(None)
+            .values(*reader.columns)
+        )
+
+    def list(self, request: Request, *args, **kwargs) -> Response:
+        reader = self.get_fast_reader()
+        if reader is None:
+            return super().list(request, *args, **kwargs)
+
+        rows = self.get_fast_rows(reader)
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(reader.build(page))
+        return Response(reader.build(list(rows)))
+
+    def retrieve(self, request: Request, *args, **kwargs) -> Response:
+        reader = self.get_fast_reader()
+        if reader is None:
+            return super().retrieve(request, *args, **kwargs)
+
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            rows = list(
+                self.get_fast_rows(reader).filter(
+                    **{self.lookup_field: kwargs[lookup_url_kwarg]}
+                )[:2]
+            )
+        except (TypeError, ValueError, ValidationError):
+            raise Http404
+        if len(rows) != 1:
+            raise Http404
+        return Response(reader.build(rows)[0])
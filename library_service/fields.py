@@ -0,0 +1,174 @@
+from django.db.models import QuerySet
+from rest_framework import serializers
+from rest_framework.fields import Field
+from rest_framework.request import Request
+
+
+def parse_paths(value: str | None) -> frozenset[str] | None:
+    if value is None:
+        return None
+    return frozenset(path.strip() for path in value.split(",") if path.strip())
+
+
+def field_path(field: Field) -> str:
+    """Return the dotted path of a bound field, e.g. "borrowing.book"."""
+    names = []
+    while field.parent is not None:
+        if field.field_name:
+            names.append(field.field_name)
+        field = field.parent
+    return ".".join(reversed(names))
+
+
+class FieldSelection:
+    """
+    The fields and relations requested with "?fields=" and "?expand=".
+
+    Both take comma separated dotted paths, e.g.
+    "?fields=id,status,borrowing.id". Without "?fields=" every field is
+    rendered; a relation without selected subfields is rendered whole.
+    Without "?expand=" nested relations are rendered as before; with it,
+    only the listed relations are nested and the others are collapsed
+    to their primary keys.
+    """
+
+    def __init__(
+        self, fields: frozenset[str] | None, expand: frozenset[str] | None
+    ) -> None:
+        self.fields = fields
+        self.expand = expand
+
+    @classmethod
+    def from_request(cls, request: Request) -> "FieldSelection | None":
+        params = getattr(request, "query_params", {})
+        if "fields" not in params and "expand" not in params:
+            return None
+        return cls(
+            parse_paths(params.get("fields")),
+            parse_paths(params.get("expand")),
+        )
+
+    def includes(self, path: str) -> bool:
+        if self.fields is None:
+            return True
+        parent = path.rpartition(".")[0]
+        if parent and not self._has_children(self.fields, parent):
+            return True
+        return path in self.fields or self._has_children(self.fields, path)
+
+    def expands(self, path: str) -> bool:
+        if self.expand is None:
+            return True
+        return (
+            path in self.expand
+            or self._has_children(self.expand, path)
+            or self._has_children(self.fields or frozenset(), path)
+        )
+
+    @staticmethod
+    def _has_children(paths: frozenset[str], path: str) -> bool:
+        return any(item.startswith(f"{path}.") for item in paths)
+
+
+def collapse(field: serializers.BaseSerializer) -> Field:
+    """Replace a nested serializer with the primary keys it renders."""
+    kwargs = {"read_only": True}
+    if isinstance(field, serializers.ListSerializer):
+        kwargs["many"] = True
+    if field.source is not None:
+        kwargs["source"] = field.source
+    return serializers.PrimaryKeyRelatedField(**kwargs)
+
+
+def rendered_fields(
+    serializer: serializers.BaseSerializer, prefix: str = ""
+) -> dict[str, Field]:
+    """Map the dotted path of every field a serializer renders to it."""
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+    paths = {}
+    for name, field in serializer.fields.items():
+        path = f"{prefix}.{name}" if prefix else name
+        paths[path] = field
+        if isinstance(field, serializers.BaseSerializer):
+            paths.update(rendered_fields(field, path))
+    return paths
+
+
+class SelectableFieldsMixin:
+    """
+    Serializer mixin dropping the fields that were not requested and
+    collapsing the relations that were not expanded (see FieldSelection).
+    Nested serializers need the mixin too to be pruned.
+    """
+
+    def get_fields(self) -> dict[str, Field]:
+        fields = super().get_fields()
+        selection = self.context.get("field_selection")
+        if selection is None:
+            return fields
+
+        prefix = field_path(self)
+        selected = {}
+        for name, field in fields.items():
+            path = f"{prefix}.{name}" if prefix else name
+            if not selection.includes(path):
+                continue
+            if isinstance(
+                field, serializers.BaseSerializer
+            ) and not selection.expands(path):
+                field = collapse(field)
+            selected[name] = field
+        return selected
+
+
+class FieldSelectionMixin:
+    """
+    Viewset mixin adding "?fields=" and "?expand=" to list and retrieve.
+
+    The queryset only joins and prefetches the relations that are still
+    rendered: "select_related_fields" and "prefetch_related_fields" map
+    the dotted serializer path of a relation to its ORM lookup.
+    Relations collapsed to a foreign key need no join at all.
+    """
+
+    select_related_fields = {}
+    prefetch_related_fields = {}
+
+    def get_field_selection(self) -> FieldSelection | None:
+        if self.action not in ("list", "retrieve"):
+            return None
+        return FieldSelection.from_request(self.request)
+
+    def get_serializer_context(self) -> dict:
+        context = super().get_serializer_context()
+        context["field_selection"] = self.get_field_selection()
+        return context
+
+    def get_queryset(self) -> QuerySet:
+        queryset = super().get_queryset()
+        if self.get_field_selection() is None:
+            return queryset
+
+        rendered = rendered_fields(self.get_serializer())
+
+        def needed(path: str) -> bool:
+            return path in rendered and not isinstance(
+                rendered[path], serializers.PrimaryKeyRelatedField
+            )
+
+        queryset = queryset.select_related(None).prefetch_related(None)
+        select = [
+            lookup
+            for path, lookup in self.select_related_fields.items()
+            if needed(path)
+        ]
+        if select:
+            queryset = queryset.select_related(*select)
+        return queryset.prefetch_related(
+            *(
+                lookup
+                for path, lookup in self.prefetch_related_fields.items()
+                if needed(path)
+            )
+        )
@@ -0,0 +1,64 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+    CommandParser,
+)
+from django.core.signals import request_finished, request_started
+from django.db import connection
+
+from book.models import Book
+from library_service.db import pool_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare requests per second with and without the connection "
+        "pool. Each request runs one query between the request_started "
+        "and request_finished signals, as Django does around a view."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--requests", type=int, default=2000)
+        parser.add_argument("--threads", type=int, nargs="+", default=[1, 8])
+
+    def handle(self, *args, **options) -> None:
+        if connection.vendor != "postgresql" or connection.pool is None:
+            raise CommandError("Configure a pooled PostgreSQL database.")
+
+        def request(_: int) -> None:
+            request_started.send(sender=self.__class__)
+            list(Book.objects.values_list("id")[:1])
+            # Closes the connection, or returns it to the pool.
+            request_finished.send(sender=self.__class__)
+
+        database_options = connection.settings_dict["OPTIONS"]
+        pool_options = database_options["pool"]
+        for threads in options["threads"]:
+            pooled = self.measure(request, options["requests"], threads)
+            stats = pool_stats()[connection.alias]
+            connection.close_pool()
+            del database_options["pool"]
+            try:
+                direct = self.measure(request, options["requests"], threads)
+            finally:
+                database_options["pool"] = pool_options
+            self.stdout.write(
+                f"{threads:>3} threads: pooled {pooled:8.0f} req/s "
+                f"({stats['pool_size']} connections, average wait "
+                f"{stats['avg_wait_ms']} ms) | new connection per request "
+                f"{direct:8.0f} req/s"
+            )
+
+    @staticmethod
+    def measure(
+        request: Callable[[int], None], requests: int, threads: int
+    ) -> float:
+        """Requests per second over "requests" requests."""
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            list(executor.map(request, range(requests)))
+        return requests / (time.perf_counter() - start)
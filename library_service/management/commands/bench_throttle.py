@@ -0,0 +1,67 @@
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+    CommandParser,
+)
+from django.test import override_settings
+from rest_framework.test import APIRequestFactory
+
+from book.views import BookViewSet
+from library_service.throttling import ScopedRateThrottle
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the overhead of one throttle check of the book list, "
+        "with the history in Redis and in the local cache."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--checks", type=int, default=2000)
+        parser.add_argument("--threads", type=int, nargs="+", default=[1, 8])
+
+    def handle(self, *args, **options) -> None:
+        if not settings.REDIS_URL:
+            raise CommandError("Set REDIS_URL to benchmark the Redis store.")
+
+        factory = APIRequestFactory()
+        view = BookViewSet()
+        # A budget that is never exhausted, so every check does the work.
+        rates = {"books": f"{options['checks'] * 100}/hour"}
+
+        def check(client: int) -> float:
+            request = factory.get("/", REMOTE_ADDR=f"198.51.100.{client}")
+            request.user = AnonymousUser()
+            start = time.perf_counter()
+            ScopedRateThrottle().allow_request(request, view)
+            return (time.perf_counter() - start) * 1_000_000
+
+        ScopedRateThrottle.THROTTLE_RATES = rates
+        for threads in options["threads"]:
+            redis_store = self.measure(check, options["checks"], threads)
+            with override_settings(REDIS_URL=None):
+                local_cache = self.measure(check, options["checks"], threads)
+            self.stdout.write(
+                f"{threads:>3} threads: redis p50 {redis_store[0]:7.1f} us, "
+                f"p99 {redis_store[1]:7.1f} us | local cache "
+                f"p50 {local_cache[0]:7.1f} us, p99 {local_cache[1]:7.1f} us"
+            )
+
+    @staticmethod
+    def measure(
+        check: Callable[[int], float], checks: int, threads: int
+    ) -> tuple[float, float]:
+        """Median and 99th percentile of one check, in microseconds."""
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            timings = list(
+                executor.map(check, (n % 250 for n in range(checks)))
+            )
+        percentiles = statistics.quantiles(timings, n=100)
+        return statistics.median(timings), percentiles[98]
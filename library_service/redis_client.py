@@ -0,0 +1,29 @@
+import threading
+
+import redis
+from django.conf import settings
+
+
+# Callers fail open or fall back when Redis is slow: give up quickly.
+SOCKET_TIMEOUT = 0.1
+
+_clients = {}
+_lock = threading.Lock()
+
+
+def get_redis() -> redis.Redis | None:
+    """
+    Return the Redis client for REDIS_URL shared by the whole process,
+    or None when REDIS_URL is not configured.
+    """
+    url = settings.REDIS_URL
+    if not url:
+        return None
+    with _lock:
+        if url not in _clients:
+            _clients[url] = redis.Redis.from_url(
+                url,
+                socket_timeout=SOCKET_TIMEOUT,
+                socket_connect_timeout=SOCKET_TIMEOUT,
+            )
+        return _clients[url]
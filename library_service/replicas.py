@@ -0,0 +1,143 @@
+import contextvars
+import random
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+from django.conf import settings
+from django.contrib.auth.models import AbstractBaseUser, AnonymousUser
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import Model
+from django.http import HttpRequest, HttpResponse
+from django.utils.functional import SimpleLazyObject, empty
+from rest_framework.permissions import SAFE_METHODS
+
+
+STICKY_KEY = "db:sticky:{}"
+
+
+def known_user(
+    request: HttpRequest,
+) -> AbstractBaseUser | AnonymousUser | None:
+    """
+    Return the user of a request once it is known (set by the DRF
+    authentication, or the lazy session user once loaded), None before:
+    it must not be loaded from the router.
+    """
+    user = request.__dict__.get("user")
+    if isinstance(user, SimpleLazyObject):
+        return None if user._wrapped is empty else user._wrapped
+    return user
+
+
+class ReadState:
+    """Routing state of a safe-method request."""
+
+    def __init__(self, request: HttpRequest) -> None:
+        self.request = request
+        self.wrote = False
+        self.sticky = None
+
+    def is_sticky(self) -> bool:
+        """Whether the user of the request wrote in the last seconds."""
+        if self.sticky is None:
+            user = known_user(self.request)
+            if user is None:
+                return False
+            self.sticky = (
+                user.is_authenticated
+                and cache.get(STICKY_KEY.format(user.pk)) is not None
+            )
+        return self.sticky
+
+
+_state = contextvars.ContextVar("read_state", default=None)
+_primary = contextvars.ContextVar("use_primary", default=False)
+
+
+@contextmanager
+def use_primary() -> Iterator[None]:
+    """Send the reads of the block, or decorated function, to the primary."""
+    token = _primary.set(True)
+    try:
+        yield
+    finally:
+        _primary.reset(token)
+
+
+class ReplicaRouter:
+    """
+    Sends the reads of safe-method requests to a DATABASE_REPLICAS alias.
+    Everything else stays on the primary: writes, reads in a transaction
+    or after a write of the same request, reads of a user who wrote in
+    the last REPLICA_STICKY_SECONDS, reads outside of a request (Celery
+    tasks, commands) and in "use_primary" blocks.
+    """
+
+    def db_for_read(self, model: type[Model], **hints) -> str | None:
+        state = _state.get()
+        if state is None or not settings.DATABASE_REPLICAS:
+            return None
+        if (
+            _primary.get()
+            or state.wrote
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+            or state.is_sticky()
+        ):
+            return DEFAULT_DB_ALIAS
+        return random.choice(settings.DATABASE_REPLICAS)
+
+    def db_for_write(self, model: type[Model], **hints) -> str:
+        # Explicit: the default would be the database the instance was
+        # read from, a replica.
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1: Model, obj2: Model, **hints) -> bool | None:
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db: str, app_label: str, **hints) -> bool | None:
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
+
+
+class ReplicaMiddleware:
+    """
+    Lets the router use the replicas during safe-method requests, and
+    keeps the reads of a user on the primary for REPLICA_STICKY_SECONDS
+    after a request of theirs wrote, so they see their own changes.
+    """
+
+    def __init__(
+        self, get_response: Callable[[HttpRequest], HttpResponse]
+    ) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if not settings.DATABASE_REPLICAS:
+            return self.get_response(request)
+
+        state = ReadState(request) if request.method in SAFE_METHODS else None
+        token = _state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.reset(token)
+
+        user = known_user(request)
+        if (
+            (state is None or state.wrote)
+            and response.status_code < 400
+            and user is not None
+            and user.is_authenticated
+        ):
+            cache.set(
+                STICKY_KEY.format(user.pk), 1, settings.REPLICA_STICKY_SECONDS
+            )
+        return response
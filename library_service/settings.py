@@ -49,15 +49,18 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "drf_spectacular",
     "rest_framework",
     "debug_toolbar",
     "django_filters",
     "django_celery_beat",
+    "library_service",
     "user",
     "book",
     "borrowing",
     "payment",
+    "notification",
 ]
 
 MIDDLEWARE = [
@@ -69,6 +72,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "library_service.replicas.ReplicaMiddleware",
 ]
 
 ROOT_URLCONF = "library_service.urls"
@@ -95,6 +99,14 @@ WSGI_APPLICATION = "library_service.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
+# Connection pool sizes per process type, picked with DB_POOL_PROFILE:
+# web workers serve many short requests, Celery workers few long tasks.
+DB_POOL_PROFILES = {
+    "web": {"min_size": 2, "max_size": 10},
+    "celery": {"min_size": 1, "max_size": 4},
+}
+DB_POOL = DB_POOL_PROFILES[os.getenv("DB_POOL_PROFILE", "web")]
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.postgresql",
@@ -103,11 +115,54 @@ DATABASES = {
         "PASSWORD": os.environ["POSTGRES_PASSWORD"],
         "HOST": os.environ["POSTGRES_HOST"],
         "PORT": os.environ["POSTGRES_PORT"],
+        "OPTIONS": {
+            "pool": {
+                "min_size": int(
+                    os.getenv("DB_POOL_MIN_SIZE", DB_POOL["min_size"])
+                ),
+                "max_size": int(
+                    os.getenv("DB_POOL_MAX_SIZE", DB_POOL["max_size"])
+                ),
+                # Seconds a request waits for a free connection.
+                "timeout": 10,
+                # Connections above min_size idle for longer are closed.
+                "max_idle": 300,
+            },
+        },
+        # With a pool, checks each connection before it is handed out.
+        "CONN_HEALTH_CHECKS": True,
     }
 }
 
+# Read replica: safe-method requests read from it (see
+# library_service/replicas.py). Tests read the primary through it.
+if os.getenv("POSTGRES_REPLICA_HOST"):
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "HOST": os.environ["POSTGRES_REPLICA_HOST"],
+        "PORT": os.getenv(
+            "POSTGRES_REPLICA_PORT", os.environ["POSTGRES_PORT"]
+        ),
+        "TEST": {"MIRROR": "default"},
+    }
+
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != "default"]
+DATABASE_ROUTERS = ["library_service.replicas.ReplicaRouter"]
+# Seconds the reads of a user stay on the primary after they wrote.
+REPLICA_STICKY_SECONDS = 5
+
 AUTH_USER_MODEL = "user.User"
 
+REDIS_URL = os.getenv("REDIS_URL")
+
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -150,15 +205,27 @@ STATIC_URL = "static/"
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+JWT_STATELESS = os.getenv("JWT_STATELESS", "").lower() in ("1", "true")
+
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
+        "library_service.throttling.AnonRateThrottle",
+        "library_service.throttling.UserRateThrottle",
+        "library_service.throttling.ScopedRateThrottle",
     ],
-    "DEFAULT_THROTTLE_RATES": {"anon": "3/minute", "user": "10/minute"},
+    "DEFAULT_THROTTLE_RATES": {
+        "anon": "3/minute",
+        "user": "10/minute",
+        "books": "60/minute",
+        "borrowing_create": "5/minute",
+        "login": "5/minute",
+    },
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        # Stateless: trust the token claims, no user lookup at all.
+        "user.authentication.StatelessJWTAuthentication"
+        if JWT_STATELESS
+        else "user.authentication.CachedJWTAuthentication",
     ),
     "DEFAULT_FILTER_BACKENDS": (
         "django_filters.rest_framework.DjangoFilterBackend",
@@ -172,6 +239,8 @@ SIMPLE_JWT = {
 }
 
 STRIPE_SECRET_KEY = os.getenv("STRIPE_API_KEY")
+STRIPE_WEBHOOK_SECRET = os.getenv("STRIPE_WEBHOOK_SECRET")
+STRIPE_API_BASE = os.getenv("STRIPE_API_BASE")
 
 
 CELERY_BROKER_URL = os.environ["CELERY_BROKER_URL"]
@@ -0,0 +1,58 @@
+from unittest.mock import Mock, patch
+
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from library_service.db import pool_stats, release_pooled_connections
+
+
+class PoolStatsTests(APITestCase):
+    def test_databases_without_pool_are_skipped(self):
+        with patch.object(connections["default"], "pool", None, create=True):
+            self.assertEqual(pool_stats(), {})
+
+    def test_utilization_and_average_wait(self):
+        pool = Mock()
+        pool.get_stats.return_value = {
+            "pool_min": 2,
+            "pool_max": 10,
+            "pool_size": 6,
+            "pool_available": 2,
+            "requests_waiting": 0,
+            "requests_queued": 4,
+            "requests_wait_ms": 50,
+        }
+
+        with patch.object(connections["default"], "pool", pool, create=True):
+            stats = pool_stats()["default"]
+
+        self.assertEqual(stats["utilization"], 0.4)
+        self.assertEqual(stats["avg_wait_ms"], 12.5)
+
+    def test_pooled_connections_outside_transactions_are_released(self):
+        idle = Mock(pool=Mock(), in_atomic_block=False)
+        in_transaction = Mock(pool=Mock(), in_atomic_block=True)
+        not_pooled = Mock(pool=None, in_atomic_block=False)
+
+        with patch("library_service.db.connections") as mocked:
+            mocked.all.return_value = [idle, in_transaction, not_pooled]
+            release_pooled_connections()
+
+        idle.close.assert_called_once()
+        in_transaction.close.assert_not_called()
+        not_pooled.close.assert_not_called()
+
+    def test_statistics_are_staff_only(self):
+        user = get_user_model().objects.create_user(
+            email="reader@example.com",
+            password="password123",
+            first_name="Test",
+            last_name="Reader",
+        )
+        self.client.force_authenticate(user)
+
+        response = self.client.get(reverse("db-pool-stats"))
+
+        self.assertEqual(response.status_code, 403)
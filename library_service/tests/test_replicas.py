@@ -0,0 +1,136 @@
+from unittest import skipUnless
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connections, router, transaction
+from django.http import HttpResponse
+from django.test import (
+    RequestFactory,
+    TransactionTestCase,
+    override_settings,
+)
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITransactionTestCase
+
+from book.cache import get_or_compute
+from book.models import Book
+from library_service.replicas import ReplicaMiddleware, use_primary
+
+
+User = get_user_model()
+
+LOCMEM_CACHE = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+}
+
+
+# Not a TestCase: reads in its test transaction would stay on the primary.
+@override_settings(
+    DATABASE_REPLICAS=["replica"],
+    CACHES=LOCMEM_CACHE,
+    REPLICA_STICKY_SECONDS=5,
+)
+class ReplicaRoutingTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User(pk=1, email="reader@example.com")
+
+    def request(self, method, view=lambda: None, user=None):
+        """Run "view" in a request, return the database it read from."""
+        databases = []
+
+        def get_response(request):
+            request.user = user or self.user
+            view()
+            databases.append(Book.objects.all().db)
+            return HttpResponse()
+
+        request = getattr(RequestFactory(), method)("/")
+        ReplicaMiddleware(get_response)(request)
+        return databases[0]
+
+    def test_safe_requests_read_from_the_replica(self):
+        self.assertEqual(self.request("get"), "replica")
+        self.assertEqual(self.request("post"), "default")
+
+    def test_reads_outside_of_requests_use_the_primary(self):
+        self.assertEqual(Book.objects.all().db, "default")
+
+    def test_transactions_and_use_primary_read_from_the_primary(self):
+        def in_transaction():
+            with transaction.atomic():
+                self.assertEqual(Book.objects.all().db, "default")
+
+        self.request("get", in_transaction)
+
+        with use_primary():
+            self.assertEqual(self.request("get"), "default")
+
+    def test_cache_fills_read_from_the_primary(self):
+        databases = []
+
+        def compute():
+            databases.append(Book.objects.all().db)
+            return "value"
+
+        self.request(
+            "get", lambda: get_or_compute("books:test", compute, False)
+        )
+
+        self.assertEqual(databases, ["default"])
+
+    def test_reads_after_a_write_use_the_primary(self):
+        def write():
+            router.db_for_write(Book)
+
+        self.assertEqual(self.request("get", write), "default")
+
+    def test_writes_stick_the_user_to_the_primary(self):
+        other = User(pk=2, email="other@example.com")
+
+        self.request("post")
+
+        self.assertEqual(self.request("get"), "default")
+        self.assertEqual(self.request("get", user=other), "replica")
+
+    def test_instances_read_from_a_replica_are_saved_on_the_primary(self):
+        book = Book(pk=1)
+        book._state.db = "replica"
+
+        self.assertEqual(router.db_for_write(Book, instance=book), "default")
+
+
+@skipUnless(settings.DATABASE_REPLICAS, "No replica is configured.")
+@override_settings(CACHES=LOCMEM_CACHE)
+class StickyReadTests(APITransactionTestCase):
+    databases = {"default", *settings.DATABASE_REPLICAS}
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            email="reader@example.com",
+            password="password123",
+            first_name="Test",
+            last_name="Reader",
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_own_changes_are_read_right_away(self):
+        url = reverse("user:user-manage")
+        self.client.patch(url, {"first_name": "Changed"})
+
+        with self.assertNumQueries(0, using=settings.DATABASE_REPLICAS[0]):
+            response = self.client.get(url)
+
+        self.assertEqual(response.data["first_name"], "Changed")
+
+    def test_other_reads_use_the_replica(self):
+        replica = connections[settings.DATABASE_REPLICAS[0]]
+
+        with CaptureQueriesContext(replica) as queries:
+            response = self.client.get(reverse("user:user-manage"))
+
+        self.assertEqual(response.data["email"], "reader@example.com")
+        self.assertTrue(queries)
@@ -0,0 +1,108 @@
+import os
+from unittest import skipUnless
+from unittest.mock import patch
+
+import redis
+from django.contrib.auth.models import AnonymousUser
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIRequestFactory, APITestCase
+from rest_framework.views import APIView
+
+from library_service.throttling import (
+    ScopedRateThrottle,
+    UserRateThrottle,
+    get_sliding_window,
+)
+from user.revocation import get_revocation_list
+
+
+TEST_REDIS_URL = os.getenv("TEST_REDIS_URL", "redis://localhost:6379/15")
+
+
+def redis_available():
+    try:
+        return redis.Redis.from_url(TEST_REDIS_URL).ping()
+    except redis.RedisError:
+        return False
+
+
+class BooksView(APIView):
+    throttle_scope = "books"
+
+
+class UnreachableStoreTests(APITestCase):
+    @override_settings(REDIS_URL="redis://127.0.0.1:1/0")
+    @patch.object(ScopedRateThrottle, "THROTTLE_RATES", {"books": "1/minute"})
+    def test_requests_are_let_through(self):
+        url = reverse("book:books-list")
+
+        with self.assertLogs("library_service.throttling", "WARNING"):
+            statuses = [self.client.get(url).status_code for _ in range(3)]
+
+        self.assertEqual(statuses, [200, 200, 200])
+
+
+class ScopeTests(SimpleTestCase):
+    def test_scoped_views_skip_the_user_budget(self):
+        request = APIRequestFactory().get("/")
+        request.user = AnonymousUser()
+
+        with patch(
+            "library_service.throttling.get_sliding_window"
+        ) as get_script:
+            allowed = UserRateThrottle().allow_request(request, BooksView())
+
+        self.assertTrue(allowed)
+        get_script.assert_not_called()
+
+
+class SharedClientTests(SimpleTestCase):
+    @override_settings(REDIS_URL="redis://127.0.0.1:1/0")
+    def test_throttle_and_revocations_share_one_client(self):
+        self.assertIs(
+            get_sliding_window().registered_client,
+            get_revocation_list().client,
+        )
+
+
+@skipUnless(redis_available(), "Redis is not available.")
+@override_settings(REDIS_URL=TEST_REDIS_URL)
+@patch.object(ScopedRateThrottle, "THROTTLE_RATES", {"books": "3/minute"})
+class SlidingWindowTests(SimpleTestCase):
+    def setUp(self):
+        redis.Redis.from_url(TEST_REDIS_URL).flushdb()
+        self.request = APIRequestFactory().get("/", REMOTE_ADDR="203.0.113.7")
+        self.request.user = AnonymousUser()
+
+    def check(self):
+        throttle = ScopedRateThrottle()
+        return throttle.allow_request(self.request, BooksView()), throttle
+
+    def test_limit_is_shared_between_workers(self):
+        results = [self.check()[0] for _ in range(4)]
+
+        self.assertEqual(results, [True, True, True, False])
+
+    def test_wait_until_the_oldest_request_leaves_the_window(self):
+        for _ in range(3):
+            self.check()
+
+        allowed, throttle = self.check()
+
+        self.assertFalse(allowed)
+        self.assertGreater(throttle.wait(), 59)
+        self.assertLessEqual(throttle.wait(), 60)
+
+    def test_single_round_trip_per_check(self):
+        self.check()
+
+        with patch.object(
+            redis.Redis,
+            "execute_command",
+            autospec=True,
+            side_effect=redis.Redis.execute_command,
+        ) as execute_command:
+            self.check()
+
+        self.assertEqual(execute_command.call_count, 1)
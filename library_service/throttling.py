@@ -0,0 +1,131 @@
+import logging
+import threading
+import uuid
+from typing import TYPE_CHECKING
+
+import redis
+from redis.commands.core import Script
+from rest_framework import throttling
+from rest_framework.request import Request
+
+from library_service.redis_client import get_redis
+
+if TYPE_CHECKING:
+    # rest_framework.views imports the throttle classes.
+    from rest_framework.views import APIView
+
+
+logger = logging.getLogger(__name__)
+
+# Sliding window log: one sorted set per client and scope, scored by the
+# request time in ms, trimmed to the window on every check. The clock is
+# the Redis one, so every worker and node agrees on the window.
+# Returns {1, 0} when the request is allowed, {0, wait in ms} otherwise.
+SLIDING_WINDOW = """
+local time = redis.call("TIME")
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+redis.call("ZREMRANGEBYSCORE", KEYS[1], 0, now - window)
+if redis.call("ZCARD", KEYS[1]) < limit then
+    redis.call("ZADD", KEYS[1], now, ARGV[3])
+    redis.call("PEXPIRE", KEYS[1], window)
+    return {1, 0}
+end
+local oldest = redis.call("ZRANGE", KEYS[1], 0, 0, "WITHSCORES")
+return {0, tonumber(oldest[2]) + window - now}
+"""
+
+_scripts = {}
+_lock = threading.Lock()
+
+
+def get_sliding_window() -> Script | None:
+    """
+    Return the sliding window script bound to the Redis client shared by
+    the whole process, or None when REDIS_URL is not configured.
+    """
+    client = get_redis()
+    if client is None:
+        return None
+    with _lock:
+        if client not in _scripts:
+            _scripts[client] = client.register_script(SLIDING_WINDOW)
+        return _scripts[client]
+
+
+class SlidingWindowMixin:
+    """
+    Throttle mixin keeping the request history in Redis, shared by all
+    workers and nodes, with one atomic script call per check.
+
+    Without REDIS_URL the default cache based history is used. When Redis
+    is unreachable requests are let through (fail open): an outage of the
+    rate limiter must not take the API down with it.
+    """
+
+    def allow_request(self, request: Request, view: "APIView") -> bool:
+        script = get_sliding_window()
+        if script is None:
+            return super().allow_request(request, view)
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.wait_ms = 0
+        try:
+            allowed, self.wait_ms = script(
+                keys=[self.key],
+                args=[
+                    self.num_requests,
+                    self.duration * 1000,
+                    uuid.uuid4().hex,
+                ],
+            )
+        except redis.RedisError:
+            logger.warning(
+                "Throttle store unavailable, request let through.",
+                exc_info=True,
+            )
+            return True
+        return bool(allowed)
+
+    def wait(self) -> float | None:
+        if get_sliding_window() is None:
+            return super().wait()
+        return self.wait_ms / 1000
+
+
+class AnonRateThrottle(SlidingWindowMixin, throttling.AnonRateThrottle):
+    """Anonymous requests of views without their own "throttle_scope"."""
+
+    def allow_request(self, request: Request, view: "APIView") -> bool:
+        if getattr(view, "throttle_scope", None):
+            return True
+        return super().allow_request(request, view)
+
+
+class UserRateThrottle(SlidingWindowMixin, throttling.UserRateThrottle):
+    """Requests of views without their own "throttle_scope", per user."""
+
+    def allow_request(self, request: Request, view: "APIView") -> bool:
+        if getattr(view, "throttle_scope", None):
+            return True
+        return super().allow_request(request, view)
+
+
+class ScopedRateThrottle(SlidingWindowMixin, throttling.ScopedRateThrottle):
+    """
+    Requests of views with a "throttle_scope", per user (or IP address)
+    and scope. The scope budget replaces the anon / user one.
+    """
+
+    def allow_request(self, request: Request, view: "APIView") -> bool:
+        self.scope = getattr(view, self.scope_attr, None)
+        if not self.scope:
+            return True
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        return super().allow_request(request, view)
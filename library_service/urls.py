@@ -25,6 +25,8 @@ from drf_spectacular.views import (
     SpectacularRedocView,
 )
 
+from library_service.views import PoolStatsView
+
 
 urlpatterns = [
     path("admin/", admin.site.urls),
@@ -32,6 +34,7 @@ urlpatterns = [
     path("api/borrowings/", include("borrowing.urls", namespace="borrowings")),
     path("api/payment/", include("payment.urls", namespace="payment")),
     path("api/user/", include("user.urls", namespace="user")),
+    path("api/db/pool-stats/", PoolStatsView.as_view(), name="db-pool-stats"),
     path("api/doc/", SpectacularAPIView.as_view(), name="schema"),
     path(
         "api/doc/swagger/",
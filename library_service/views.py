@@ -0,0 +1,18 @@
+from rest_framework.permissions import IsAdminUser
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from library_service.db import pool_stats
+
+
+class PoolStatsView(APIView):
+    """
+    Connection pool statistics of the web worker serving the request:
+    each process has its own pool.
+    """
+
+    permission_classes = (IsAdminUser,)
+
+    def get(self, request: Request) -> Response:
+        return Response(pool_stats())
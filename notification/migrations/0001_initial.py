@@ -0,0 +1,58 @@
+# Generated by Django 5.0 on 2026-10-18 04:51
+
+import django.utils.timezone
+import django_enum.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="OutboxMessage",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("chat_id", models.CharField(max_length=64)),
+                ("text", models.TextField()),
+                (
+                    "status",
+                    django_enum.fields.EnumCharField(
+                        choices=[
+                            ("1", "Pending"),
+                            ("2", "Sent"),
+                            ("3", "Failed"),
+                        ],
+                        default="1",
+                        max_length=1,
+                    ),
+                ),
+                ("attempts", models.PositiveSmallIntegerField(default=0)),
+                (
+                    "available_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("sent_at", models.DateTimeField(blank=True, null=True)),
+                ("last_error", models.TextField(blank=True)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["status", "available_at", "id"],
+                        name="outbox_status_available_idx",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,36 @@
+from django.db import models
+from django.utils import timezone
+from django_enum import EnumField
+
+
+class OutboxMessage(models.Model):
+    """
+    A Telegram message waiting to be delivered.
+    Rows are written in the transaction of the change they report on,
+    and sent later by "notification.tasks.drain_outbox".
+    """
+
+    class StatusEnum(models.TextChoices):
+        pending = "1", "Pending"
+        sent = "2", "Sent"
+        failed = "3", "Failed"
+
+    chat_id = models.CharField(max_length=64)
+    text = models.TextField()
+    status = EnumField(StatusEnum, default=StatusEnum.pending)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    available_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(blank=True, null=True)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["status", "available_at", "id"],
+                name="outbox_status_available_idx",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.get_status_display()} message to {self.chat_id}"
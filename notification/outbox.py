@@ -0,0 +1,20 @@
+from django.db import transaction
+
+from borrowing.telegram_helper import CHAT_ID
+from notification.models import OutboxMessage
+from notification.tasks import drain_outbox
+
+
+def enqueue_message(text: str, chat_id: str | None = None) -> OutboxMessage:
+    """
+    Queue a Telegram message in the current transaction.
+
+    The outbox is drained once the transaction commits, so the caller
+    never waits on Telegram and rolled back changes are never reported.
+    If the drain cannot be scheduled, the periodic drain sends it.
+    """
+    message = OutboxMessage.objects.create(
+        chat_id=chat_id or CHAT_ID, text=text
+    )
+    transaction.on_commit(drain_outbox.delay, robust=True)
+    return message
@@ -0,0 +1,138 @@
+import random
+from datetime import datetime, timedelta
+from itertools import groupby
+
+from celery import shared_task
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from borrowing.telegram_helper import send_chat_message
+from notification.models import OutboxMessage
+
+
+BATCH_SIZE = 100
+MESSAGE_LIMIT = 4096
+SEPARATOR = "\n\n"
+MAX_ATTEMPTS = 8
+BACKOFF_BASE = 30
+BACKOFF_CAP = 3600
+# Telegram allows about 20 messages per minute in a group chat.
+CHAT_INTERVAL = 3
+RETENTION = timedelta(days=7)
+# Claimed messages are skipped by other drains for this long. Messages of
+# a worker that dies while sending are sent again afterwards.
+CLAIM_TIMEOUT = 60
+
+
+@shared_task(ignore_result=True)
+def drain_outbox() -> int:
+    """
+    Send one batch of pending outbox messages, return how many were sent.
+
+    Rows are selected with "SKIP LOCKED" and claimed for CLAIM_TIMEOUT
+    seconds in a short transaction, then sent after it committed: a slow
+    Telegram API never keeps rows locked, and concurrent drains never
+    send the same message twice. Pending messages of a chat are coalesced
+    into one Telegram message, and a chat gets at most one message every
+    CHAT_INTERVAL seconds. That limit is kept in the default cache, so it
+    only holds across workers with a shared cache (REDIS_URL). Failed
+    sends are retried with exponential backoff, up to MAX_ATTEMPTS times.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        batch = list(
+            OutboxMessage.objects.select_for_update(skip_locked=True)
+            .filter(
+                status=OutboxMessage.StatusEnum.pending,
+                available_at__lte=now,
+            )
+            .order_by("chat_id", "id")[:BATCH_SIZE]
+        )
+        _defer(batch, now + timedelta(seconds=CLAIM_TIMEOUT))
+
+    sent = 0
+    for chat_id, messages in groupby(batch, key=lambda row: row.chat_id):
+        sent += _send_to_chat(chat_id, list(messages), now)
+
+    OutboxMessage.objects.filter(
+        status=OutboxMessage.StatusEnum.sent, sent_at__lt=now - RETENTION
+    ).delete()
+    if batch:
+        drain_outbox.apply_async(
+            countdown=0 if len(batch) == BATCH_SIZE else CHAT_INTERVAL
+        )
+    return sent
+
+
+def _send_to_chat(
+    chat_id: str, messages: list[OutboxMessage], now: datetime
+) -> int:
+    if not cache.add(f"outbox:chat:{chat_id}", 1, timeout=CHAT_INTERVAL):
+        _defer(messages, now + timedelta(seconds=CHAT_INTERVAL))
+        return 0
+
+    included = coalesce(messages)
+    _defer(messages[len(included) :], now + timedelta(seconds=CHAT_INTERVAL))
+    text = SEPARATOR.join(message.text for message in included)
+    try:
+        send_chat_message(chat_id, text[:MESSAGE_LIMIT])
+    except Exception as error:
+        _record_failure(included, error, now)
+        return 0
+
+    OutboxMessage.objects.filter(
+        id__in=[message.id for message in included]
+    ).update(status=OutboxMessage.StatusEnum.sent, sent_at=now)
+    return len(included)
+
+
+def coalesce(messages: list[OutboxMessage]) -> list[OutboxMessage]:
+    """
+    Return the leading messages whose texts fit into one Telegram message.
+    The first message is always included, a longer one gets truncated.
+    """
+    length = len(messages[0].text)
+    for count, message in enumerate(messages[1:], start=1):
+        length += len(SEPARATOR) + len(message.text)
+        if length > MESSAGE_LIMIT:
+            return messages[:count]
+    return messages
+
+
+def retry_after(error: Exception) -> int | None:
+    """Return the delay Telegram asked for in a "429" response."""
+    if getattr(error, "error_code", None) != 429:
+        return None
+    parameters = getattr(error, "result_json", {}).get("parameters", {})
+    return parameters.get("retry_after")
+
+
+def _defer(messages: list[OutboxMessage], until: datetime) -> None:
+    if messages:
+        OutboxMessage.objects.filter(
+            id__in=[message.id for message in messages]
+        ).update(available_at=until)
+
+
+def _record_failure(
+    messages: list[OutboxMessage], error: Exception, now: datetime
+) -> None:
+    delay = retry_after(error)
+    for message in messages:
+        if delay is None:
+            message.attempts += 1
+            backoff = min(
+                BACKOFF_BASE * 2 ** (message.attempts - 1), BACKOFF_CAP
+            )
+            message.available_at = now + timedelta(
+                seconds=backoff * random.uniform(0.5, 1)
+            )
+        else:
+            message.available_at = now + timedelta(seconds=delay)
+        if message.attempts >= MAX_ATTEMPTS:
+            message.status = OutboxMessage.StatusEnum.failed
+        message.last_error = str(error)
+    OutboxMessage.objects.bulk_update(
+        messages, ["attempts", "available_at", "status", "last_error"]
+    )
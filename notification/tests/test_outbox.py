@@ -0,0 +1,121 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from telebot.apihelper import ApiTelegramException
+
+from notification import tasks
+from notification.models import OutboxMessage
+from notification.outbox import enqueue_message
+
+
+LOCMEM_CACHE = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+}
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+@patch("notification.tasks.drain_outbox.apply_async")
+@patch("notification.tasks.send_chat_message")
+class DrainOutboxTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_enqueue_schedules_drain_after_commit(self, send, _):
+        with patch("notification.outbox.drain_outbox.delay") as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                with transaction.atomic():
+                    enqueue_message("Hello", chat_id="1")
+                    delay.assert_not_called()
+
+        delay.assert_called_once()
+        send.assert_not_called()
+
+    def test_messages_are_coalesced_per_chat(self, send, _):
+        for text in ("First", "Second"):
+            enqueue_message(text, chat_id="1")
+        enqueue_message("Other chat", chat_id="2")
+
+        self.assertEqual(tasks.drain_outbox(), 3)
+
+        send.assert_any_call("1", "First\n\nSecond")
+        send.assert_any_call("2", "Other chat")
+        self.assertEqual(send.call_count, 2)
+        self.assertFalse(
+            OutboxMessage.objects.exclude(
+                status=OutboxMessage.StatusEnum.sent
+            ).exists()
+        )
+
+    def test_messages_being_sent_are_not_drained_again(self, send, _):
+        enqueue_message("First", chat_id="1")
+        concurrent_drains = []
+
+        def drain_while_sending(*args):
+            if not concurrent_drains:
+                cache.clear()  # Not held back by the chat rate limit.
+                concurrent_drains.append(tasks.drain_outbox())
+
+        send.side_effect = drain_while_sending
+
+        self.assertEqual(tasks.drain_outbox(), 1)
+
+        self.assertEqual(concurrent_drains, [0])
+        send.assert_called_once_with("1", "First")
+
+    def test_chat_rate_limit_defers_messages(self, send, _):
+        enqueue_message("First", chat_id="1")
+        tasks.drain_outbox()
+        enqueue_message("Second", chat_id="1")
+
+        self.assertEqual(tasks.drain_outbox(), 0)
+
+        send.assert_called_once_with("1", "First")
+        message = OutboxMessage.objects.get(text="Second")
+        self.assertEqual(message.status, OutboxMessage.StatusEnum.pending)
+        self.assertGreater(message.available_at, timezone.now())
+
+    def test_failed_send_backs_off_then_gives_up(self, send, _):
+        send.side_effect = ConnectionError("Telegram is down")
+        message = enqueue_message("Hello", chat_id="1")
+
+        tasks.drain_outbox()
+
+        message.refresh_from_db()
+        self.assertEqual(message.attempts, 1)
+        self.assertEqual(message.status, OutboxMessage.StatusEnum.pending)
+        self.assertGreater(message.available_at, timezone.now())
+        self.assertEqual(message.last_error, "Telegram is down")
+
+        OutboxMessage.objects.filter(id=message.id).update(
+            attempts=tasks.MAX_ATTEMPTS - 1,
+            available_at=timezone.now() - timedelta(seconds=1),
+        )
+        cache.clear()
+        tasks.drain_outbox()
+
+        message.refresh_from_db()
+        self.assertEqual(message.status, OutboxMessage.StatusEnum.failed)
+
+    def test_telegram_retry_after_is_respected(self, send, _):
+        send.side_effect = ApiTelegramException(
+            "sendMessage",
+            None,
+            {
+                "error_code": 429,
+                "description": "Too Many Requests",
+                "parameters": {"retry_after": 120},
+            },
+        )
+        message = enqueue_message("Hello", chat_id="1")
+
+        tasks.drain_outbox()
+
+        message.refresh_from_db()
+        self.assertEqual(message.attempts, 0)
+        self.assertGreater(
+            message.available_at, timezone.now() + timedelta(seconds=100)
+        )
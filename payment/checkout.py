@@ -0,0 +1,199 @@
+import time
+from datetime import timedelta
+
+import stripe
+from django.db.models import F
+from django.utils import timezone
+
+from book.models import Book
+from library_service.db import release_pooled_connections
+from payment.gateway import get_gateway
+from payment.models import Payment
+from payment.pricing import to_cents
+
+
+# Stripe accepts checkout sessions living between 30 minutes and 24 hours.
+SESSION_LIFETIME = timedelta(hours=23)
+# Sessions this close to expiring are not handed out again.
+SESSION_REUSE_MARGIN = timedelta(minutes=10)
+# How long a request waits for a session another worker is creating.
+SESSION_WAIT = 2
+SESSION_POLL_INTERVAL = 0.1
+
+
+def needs_new_session(payment: Payment) -> bool:
+    """Whether the stored checkout session can no longer be handed out."""
+    if payment.session_expires_at is None or payment.status in (
+        Payment.StatusEnum.expired,
+        Payment.StatusEnum.canceled,
+    ):
+        return True
+    return (
+        payment.status == Payment.StatusEnum.pending
+        and payment.session_expires_at <= timezone.now() + SESSION_REUSE_MARGIN
+    )
+
+
+def session_status(session: dict) -> Payment.StatusEnum | None:
+    """Payment status matching a Stripe checkout session, None if open."""
+    if session["status"] == "complete" and session["payment_status"] in (
+        "paid",
+        "no_payment_required",
+    ):
+        return Payment.StatusEnum.paid
+    if session["status"] == "expired":
+        return Payment.StatusEnum.expired
+    return None
+
+
+def reported_statuses(new_status: str) -> tuple[str, ...]:
+    """
+    Statuses a payment leaves when Stripe reports "new_status" for its
+    session: a session paid while being replaced still pays the payment,
+    but the expiry of that session must not expire the payment.
+    """
+    if new_status == Payment.StatusEnum.paid:
+        return Payment.StatusEnum.pending, Payment.StatusEnum.initializing
+    return (Payment.StatusEnum.pending,)
+
+
+def claim_session_refresh(payment: Payment) -> tuple[Payment, bool]:
+    """
+    Moves a payment with an expired session back to "Initializing",
+    returns the payment and whether this caller claimed the refresh.
+
+    The claim is one conditional UPDATE on the status and the session
+    attempt the caller saw, so when several requests race only one of
+    them claims it and creates the new session; the others get the
+    claimed payment and wait for that session (see "wait_for_session").
+    The previous session id is kept until the new session replaces it,
+    so a payment made on it in the meantime is still matched.
+    """
+    claimed = Payment.objects.filter(
+        id=payment.id,
+        status=payment.status,
+        session_attempt=payment.session_attempt,
+    ).update(
+        status=Payment.StatusEnum.initializing,
+        session_attempt=F("session_attempt") + 1,
+        session_expires_at=timezone.now() + SESSION_LIFETIME,
+        session_url="",
+        updated_at=timezone.now(),
+    )
+    payment.refresh_from_db()
+    return payment, bool(claimed)
+
+
+def wait_for_session(
+    payment: Payment, timeout: float = SESSION_WAIT
+) -> Payment:
+    """
+    Re-read a payment whose checkout session is being created by another
+    worker until it leaves "Initializing" or "timeout" seconds pass.
+    """
+    deadline = time.monotonic() + timeout
+    while (
+        payment.status == Payment.StatusEnum.initializing
+        and time.monotonic() < deadline
+    ):
+        time.sleep(SESSION_POLL_INTERVAL)
+        payment.refresh_from_db()
+    return payment
+
+
+def retire_session(payment: Payment) -> bool:
+    """
+    Expires the previous checkout session of a payment being refreshed,
+    so the customer can no longer pay on it.
+
+    Returns False when Stripe reports that session complete: the payment
+    is then marked paid, or put back to "Pending" on it while a delayed
+    payment method settles, and must not get a new session.
+    """
+    if not payment.session_id:
+        return True
+    gateway = get_gateway()
+    try:
+        gateway.expire_checkout_session(payment.session_id)
+        return True
+    except stripe.InvalidRequestError:
+        # Only open sessions can be expired.
+        session = gateway.retrieve_checkout_session(payment.session_id)
+    if session["status"] != "complete":
+        return True
+
+    new_status = session_status(session) or Payment.StatusEnum.pending
+    updated = Payment.objects.filter(
+        id=payment.id, status=Payment.StatusEnum.initializing
+    ).update(
+        status=new_status,
+        session_url=session["url"] or "",
+        updated_at=timezone.now(),
+    )
+    if updated and new_status == Payment.StatusEnum.paid:
+        # Imported here: the tasks module creates checkout sessions.
+        from payment.tasks import notify_payment_status
+
+        notify_payment_status.delay(payment.session_id)
+    return False
+
+
+def create_checkout_session(payment: Payment) -> Payment:
+    """
+    Creates the Stripe checkout session of an initializing payment
+    and moves the payment to "Pending".
+
+    The pooled database connection goes back to its pool while Stripe
+    is called. A session the payment had before is expired first, see
+    "retire_session". The request carries an idempotency key derived
+    from the payment and its session attempt, so retries after a timeout
+    get the session Stripe already created.
+    """
+    domain = "http://127.0.0.1:8000"
+    borrowing_id = payment.borrowing_id
+    payment_type = payment.payment_type
+    titles = list(
+        Book.objects.filter(borrowings__id=borrowing_id).values_list(
+            "title", flat=True
+        )
+    )
+    release_pooled_connections()
+
+    if not retire_session(payment):
+        payment.refresh_from_db()
+        return payment
+
+    checkout_session = get_gateway().create_checkout_session(
+        payment_method_types=["card"],
+        line_items=[
+            {
+                "price_data": {
+                    "currency": "usd",
+                    "product_data": {
+                        "name": ", ".join(titles),
+                    },
+                    "unit_amount": to_cents(payment.money_to_pay),
+                },
+                "quantity": 1,
+            },
+        ],
+        mode="payment",
+        expires_at=int(payment.session_expires_at.timestamp()),
+        success_url=f"{domain}/api/payment/success/"
+        f"{borrowing_id}/?payment_type={payment_type}",
+        cancel_url=f"{domain}/api/payment/cancel/"
+        f"{borrowing_id}/?payment_type={payment_type}",
+        idempotency_key=(
+            f"checkout-session-{payment.id}-{payment.session_attempt}"
+        ),
+    )
+    Payment.objects.filter(
+        id=payment.id, status=Payment.StatusEnum.initializing
+    ).update(
+        status=Payment.StatusEnum.pending,
+        session_url=checkout_session.url,
+        session_id=checkout_session.id,
+        updated_at=timezone.now(),
+    )
+    payment.refresh_from_db()
+    return payment
@@ -0,0 +1,70 @@
+from datetime import date
+from typing import Callable
+
+from django.utils import timezone
+
+from borrowing.models import Borrowing
+from payment.models import Fine
+from payment.pricing import daily_fees, fine_price, to_money
+
+
+FINE_CHUNK_SIZE = 5000
+
+
+def assess_fines(
+    today: date | None = None,
+    chunk_size: int = FINE_CHUNK_SIZE,
+    on_progress: Callable[[int], None] | None = None,
+) -> int:
+    """
+    Upsert the accrued fine of every overdue active borrowing into the
+    fines ledger, return the number of borrowings assessed.
+
+    Borrowings are walked in keyset chunks of "chunk_size" ids: each chunk
+    is one query for the borrowings, one grouped "SUM(daily_fee)" query
+    (see "payment.pricing.daily_fees") and one bulk
+    "INSERT ... ON CONFLICT DO UPDATE", so memory stays bounded and no
+    transaction lasts longer than a chunk.
+    """
+    today = today or timezone.now().date()
+    overdue = (
+        Borrowing.objects.filter(
+            actual_return_date__isnull=True, expected_return_date__lt=today
+        )
+        .order_by("id")
+        .values("id", "expected_return_date")
+    )
+    assessed = 0
+    last_id = 0
+    while rows := list(overdue.filter(id__gt=last_id)[:chunk_size]):
+        fees = daily_fees(row["id"] for row in rows)
+        fines = []
+        for row in rows:
+            fee = fees.get(row["id"], to_money(0))
+            fines.append(
+                Fine(
+                    borrowing_id=row["id"],
+                    overdue_days=(today - row["expected_return_date"]).days,
+                    daily_fee=fee,
+                    amount=fine_price(fee, row["expected_return_date"], today),
+                    assessed_on=today,
+                    updated_at=timezone.now(),
+                )
+            )
+        Fine.objects.bulk_create(
+            fines,
+            update_conflicts=True,
+            unique_fields=["borrowing"],
+            update_fields=[
+                "overdue_days",
+                "daily_fee",
+                "amount",
+                "assessed_on",
+                "updated_at",
+            ],
+        )
+        assessed += len(rows)
+        last_id = rows[-1]["id"]
+        if on_progress:
+            on_progress(assessed)
+    return assessed
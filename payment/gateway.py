@@ -0,0 +1,276 @@
+import random
+import threading
+import time
+from collections import deque
+from functools import partial
+from typing import Any, Callable, Iterator
+
+import requests
+import stripe
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+
+CONNECT_TIMEOUT = 3
+READ_TIMEOUT = 10
+MAX_RETRIES = 2
+RETRY_BACKOFF = 0.25
+RETRY_BUDGET_RATIO = 0.2
+RETRY_BUDGET_MINIMUM = 5
+RETRY_BUDGET_WINDOW = 10
+MAX_CONCURRENCY = 4
+ACQUIRE_TIMEOUT = 0.5
+FAILURE_THRESHOLD = 5
+RESET_TIMEOUT = 30
+
+TRANSIENT_STRIPE_ERRORS = (
+    stripe.APIConnectionError,
+    stripe.RateLimitError,
+    stripe.APIError,
+)
+
+
+class CircuitOpenError(stripe.APIConnectionError):
+    """Stripe is failing, the call was not attempted."""
+
+
+class BulkheadFullError(stripe.APIConnectionError):
+    """Too many Stripe calls are in flight in this process."""
+
+
+class CircuitBreaker:
+    """
+    Opens after "failure_threshold" consecutive failures and fails fast
+    for "reset_timeout" seconds. Then a single trial call is let through:
+    its success closes the circuit, its failure opens it again.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = FAILURE_THRESHOLD,
+        reset_timeout: float = RESET_TIMEOUT,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.trial_running = False
+        self.lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at < self.reset_timeout:
+            return "open"
+        return "half-open"
+
+    def allow(self) -> bool:
+        with self.lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half-open" and not self.trial_running:
+                self.trial_running = True
+                return True
+            return False
+
+    def end_trial(self) -> None:
+        """End a trial call without outcome, the next call runs another."""
+        with self.lock:
+            self.trial_running = False
+
+    def record_success(self) -> None:
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_running = False
+
+    def record_failure(self) -> None:
+        with self.lock:
+            self.failures += 1
+            if self.trial_running or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self.trial_running = False
+
+
+class RetryBudget:
+    """
+    Caps retries to "ratio" of the calls made in the last "window"
+    seconds (plus "minimum"), so retries cannot multiply the load
+    on Stripe while it is degraded.
+    """
+
+    def __init__(
+        self,
+        ratio: float = RETRY_BUDGET_RATIO,
+        minimum: int = RETRY_BUDGET_MINIMUM,
+        window: float = RETRY_BUDGET_WINDOW,
+    ) -> None:
+        self.ratio = ratio
+        self.minimum = minimum
+        self.window = window
+        self.calls = deque()
+        self.retries = deque()
+        self.lock = threading.Lock()
+
+    def record_call(self) -> None:
+        with self.lock:
+            self.calls.append(time.monotonic())
+
+    def try_retry(self) -> bool:
+        with self.lock:
+            now = time.monotonic()
+            for events in (self.calls, self.retries):
+                while events and now - events[0] > self.window:
+                    events.popleft()
+            if len(self.retries) >= self.minimum + self.ratio * len(
+                self.calls
+            ):
+                return False
+            self.retries.append(now)
+            return True
+
+
+class StripeGateway:
+    """
+    The only way out to the Stripe API.
+
+    Calls share one pooled HTTP session and have connect / read timeouts.
+    Transient errors are retried with jittered exponential backoff within
+    a retry budget. A circuit breaker fails fast while Stripe is down, and
+    at most "max_concurrency" calls are in flight per process, so a slow
+    Stripe can only tie up that many workers.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        api_base: str | None = None,
+        connect_timeout: float = CONNECT_TIMEOUT,
+        read_timeout: float = READ_TIMEOUT,
+        max_retries: int = MAX_RETRIES,
+        max_concurrency: int = MAX_CONCURRENCY,
+        acquire_timeout: float = ACQUIRE_TIMEOUT,
+        breaker: CircuitBreaker | None = None,
+        budget: RetryBudget | None = None,
+    ) -> None:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=max_concurrency)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        self.client = stripe.StripeClient(
+            api_key,
+            base_addresses={"api": api_base} if api_base else {},
+            max_network_retries=0,
+            http_client=stripe.RequestsClient(
+                timeout=(connect_timeout, read_timeout), session=session
+            ),
+        )
+        self.max_retries = max_retries
+        self.acquire_timeout = acquire_timeout
+        self.slots = threading.BoundedSemaphore(max_concurrency)
+        self.breaker = breaker or CircuitBreaker()
+        self.budget = budget or RetryBudget()
+
+    def create_checkout_session(
+        self, idempotency_key: str, **params
+    ) -> stripe.checkout.Session:
+        return self.call(
+            self.client.checkout.sessions.create,
+            params,
+            {"idempotency_key": idempotency_key},
+        )
+
+    def expire_checkout_session(
+        self, session_id: str
+    ) -> stripe.checkout.Session:
+        return self.call(
+            partial(self.client.checkout.sessions.expire, session_id), {}
+        )
+
+    def retrieve_checkout_session(
+        self, session_id: str
+    ) -> stripe.checkout.Session:
+        return self.call(
+            partial(self.client.checkout.sessions.retrieve, session_id), {}
+        )
+
+    def list_checkout_sessions(
+        self, created_gte: int, page_size: int = 100
+    ) -> Iterator[list[stripe.checkout.Session]]:
+        """
+        Yield pages of the checkout sessions created since "created_gte"
+        (a unix timestamp), newest first.
+        """
+        params = {"created": {"gte": created_gte}, "limit": page_size}
+        while True:
+            page = self.call(self.client.checkout.sessions.list, params)
+            if page.data:
+                yield page.data
+            if not page.has_more or not page.data:
+                return
+            params = {**params, "starting_after": page.data[-1].id}
+
+    def call(
+        self, method: Callable, params: dict, options: dict | None = None
+    ) -> Any:
+        """
+        Run one Stripe API call under the timeouts, retries, breaker
+        and concurrency limit of the gateway.
+        """
+        attempt = 0
+        while True:
+            try:
+                return self._call_once(method, params, options or {})
+            except (BulkheadFullError, CircuitOpenError):
+                raise
+            except TRANSIENT_STRIPE_ERRORS:
+                if attempt >= self.max_retries or not self.budget.try_retry():
+                    raise
+            attempt += 1
+            time.sleep(
+                RETRY_BACKOFF * 2 ** (attempt - 1) * random.uniform(0.5, 1)
+            )
+
+    def _call_once(self, method: Callable, params: dict, options: dict) -> Any:
+        # The slot is taken first: a half-open trial, once allowed, must
+        # reach Stripe and record its outcome.
+        if not self.slots.acquire(timeout=self.acquire_timeout):
+            raise BulkheadFullError("Too many Stripe calls in flight.")
+        try:
+            if not self.breaker.allow():
+                raise CircuitOpenError("Stripe circuit is open.")
+            try:
+                self.budget.record_call()
+                result = method(params=params, options=options)
+            except TRANSIENT_STRIPE_ERRORS:
+                self.breaker.record_failure()
+                raise
+            except stripe.StripeError:
+                # Stripe answered, so it is up even if it rejected the call.
+                self.breaker.record_success()
+                raise
+            except BaseException:
+                self.breaker.end_trial()
+                raise
+        finally:
+            self.slots.release()
+        self.breaker.record_success()
+        return result
+
+
+_gateway = None
+_gateway_lock = threading.Lock()
+
+
+def get_gateway() -> StripeGateway:
+    """Return the gateway shared by every thread of the process."""
+    global _gateway
+    with _gateway_lock:
+        if _gateway is None:
+            _gateway = StripeGateway(
+                api_key=settings.STRIPE_SECRET_KEY,
+                api_base=settings.STRIPE_API_BASE,
+            )
+        return _gateway
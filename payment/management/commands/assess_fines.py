@@ -0,0 +1,28 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from payment.fines import FINE_CHUNK_SIZE, assess_fines
+
+
+class Command(BaseCommand):
+    help = "Upsert the fines ledger for every overdue active borrowing."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--chunk-size", type=int, default=FINE_CHUNK_SIZE)
+
+    def handle(self, *args, **options) -> None:
+        start = time.perf_counter()
+        assessed = assess_fines(
+            chunk_size=options["chunk_size"],
+            on_progress=lambda count: self.stdout.write(
+                f"{count} borrowings assessed..."
+            ),
+        )
+        elapsed = time.perf_counter() - start
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Assessed {assessed} borrowings in {elapsed:.1f} s "
+                f"({assessed / elapsed if elapsed else 0:.0f} rows/s)."
+            )
+        )
@@ -0,0 +1,146 @@
+import statistics
+import time
+from datetime import date, timedelta
+from typing import Callable
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import transaction
+from django.db.models import QuerySet
+from rest_framework.renderers import JSONRenderer
+from rest_framework.serializers import SerializerMetaclass
+
+from book.models import Book
+from book.serializers import BOOK_READER, BookSerializer
+from borrowing.models import Borrowing
+from borrowing.serializers import BORROWING_READER, BorrowingSerializer
+from library_service.fastpath import FastReader
+from payment.models import Payment
+from payment.serializers import PAYMENT_LIST_READER, PaymentListSerializer
+
+
+User = get_user_model()
+
+TARGETS = (
+    ("books", Book.objects.all(), BookSerializer, BOOK_READER),
+    (
+        "borrowings",
+        Borrowing.objects.select_related("user").prefetch_related("book"),
+        BorrowingSerializer,
+        BORROWING_READER,
+    ),
+    (
+        "payments",
+        Payment.objects.select_related("borrowing__user").prefetch_related(
+            "borrowing__book"
+        ),
+        PaymentListSerializer,
+        PAYMENT_LIST_READER,
+    ),
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the time to render a page of books, borrowings and "
+        "payments to JSON with the serializers and with the fast read "
+        "path. Seeded rows are rolled back."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--sizes", type=int, nargs="+", default=[100, 1_000, 10_000]
+        )
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options) -> None:
+        sizes = sorted(options["sizes"])
+        with transaction.atomic():
+            self.seed(sizes[-1])
+            for size in sizes:
+                for name, queryset, serializer_class, reader in TARGETS:
+                    queryset = queryset.order_by("-id")[:size]
+                    serialized = self.measure(
+                        lambda: self.render_serializer(
+                            queryset, serializer_class
+                        ),
+                        options["repeat"],
+                    )
+                    fast = self.measure(
+                        lambda: self.render_fast(queryset, reader),
+                        options["repeat"],
+                    )
+                    self.stdout.write(
+                        f"{size:>6,} {name:<10}: serializer "
+                        f"{serialized:8.1f} ms, fast {fast:8.1f} ms "
+                        f"({serialized / fast:4.1f}x)"
+                    )
+            transaction.set_rollback(True)
+
+    @staticmethod
+    def render_serializer(
+        queryset: QuerySet, serializer_class: SerializerMetaclass
+    ) -> bytes:
+        return JSONRenderer().render(
+            serializer_class(queryset.all(), many=True).data
+        )
+
+    @staticmethod
+    def render_fast(queryset: QuerySet, reader: FastReader) -> bytes:
+        rows = (
+            queryset.select_related(None)
+            .prefetch_related(None)
+            .values(*reader.columns)
+        )
+        return JSONRenderer().render(reader.build(list(rows)))
+
+    @staticmethod
+    def measure(render: Callable[[], bytes], repeat: int) -> float:
+        """Median time in ms of rendering one page, queries included."""
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            render()
+            timings.append((time.perf_counter() - start) * 1000)
+        return statistics.median(timings)
+
+    def seed(self, rows: int) -> None:
+        self.stdout.write(f"Seeding {rows} rows of each model...")
+        user = User.objects.create_user(
+            email="bench-read@example.com",
+            password="password",
+            first_name="Bench",
+            last_name="Read",
+        )
+        books = Book.objects.bulk_create(
+            Book(
+                title=f"Bench book {number}",
+                author="Bench",
+                cover="SOFT",
+                inventory=number,
+                daily_fee="1.50",
+            )
+            for number in range(rows)
+        )
+        today = date.today()
+        borrowings = Borrowing.objects.bulk_create(
+            Borrowing(
+                user=user,
+                expected_return_date=today + timedelta(days=7),
+            )
+            for _ in range(rows)
+        )
+        Borrowing.book.through.objects.bulk_create(
+            Borrowing.book.through(borrowing_id=borrowing.id, book_id=book.id)
+            for index, borrowing in enumerate(borrowings)
+            for book in (books[index], books[index - 1])
+        )
+        Payment.objects.bulk_create(
+            Payment(
+                status=Payment.StatusEnum.paid,
+                payment_type=Payment.TypeEnum.payment,
+                borrowing=borrowing,
+                money_to_pay="10.50",
+            )
+            for borrowing in borrowings
+        )
@@ -0,0 +1,19 @@
+# Generated by Django 5.0 on 2026-10-18 04:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("borrowing", "0004_borrowing_user_active_id_idx"),
+        ("payment", "0002_payment_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="payment",
+            index=models.Index(
+                fields=["status", "id"], name="payment_status_id_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.0 on 2026-10-18 04:53
+
+import django_enum.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("payment", "0003_payment_status_id_idx"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="payment",
+            name="session_id",
+            field=models.CharField(blank=True, max_length=100),
+        ),
+        migrations.AlterField(
+            model_name="payment",
+            name="session_url",
+            field=models.URLField(blank=True, max_length=500),
+        ),
+        migrations.AlterField(
+            model_name="payment",
+            name="status",
+            field=django_enum.fields.EnumCharField(
+                choices=[
+                    ("1", "Pending"),
+                    ("2", "Paid"),
+                    ("3", "Canceled"),
+                    ("4", "Initializing"),
+                ],
+                max_length=1,
+            ),
+        ),
+    ]
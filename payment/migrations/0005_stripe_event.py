@@ -0,0 +1,45 @@
+# Generated by Django 5.0 on 2026-10-18 04:55
+
+import django_enum.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("payment", "0004_payment_initializing_status"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StripeEvent",
+            fields=[
+                (
+                    "event_id",
+                    models.CharField(
+                        max_length=255, primary_key=True, serialize=False
+                    ),
+                ),
+                ("type", models.CharField(max_length=100)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name="payment",
+            name="session_id",
+            field=models.CharField(blank=True, db_index=True, max_length=100),
+        ),
+        migrations.AlterField(
+            model_name="payment",
+            name="status",
+            field=django_enum.fields.EnumCharField(
+                choices=[
+                    ("1", "Pending"),
+                    ("2", "Paid"),
+                    ("3", "Canceled"),
+                    ("4", "Initializing"),
+                    ("5", "Expired"),
+                ],
+                max_length=1,
+            ),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.0 on 2026-10-18 04:58
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("borrowing", "0005_borrowing_active_id_idx"),
+        ("payment", "0006_payment_session_expiry"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Fine",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("overdue_days", models.PositiveIntegerField()),
+                (
+                    "daily_fee",
+                    models.DecimalField(decimal_places=2, max_digits=10),
+                ),
+                (
+                    "amount",
+                    models.DecimalField(decimal_places=2, max_digits=10),
+                ),
+                ("assessed_on", models.DateField()),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "borrowing",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="fine",
+                        to="borrowing.borrowing",
+                    ),
+                ),
+            ],
+        ),
+    ]
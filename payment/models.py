@@ -9,6 +9,8 @@ class Payment(models.Model):
         pending = "1", "Pending"
         paid = "2", "Paid"
         canceled = "3", "Canceled"
+        initializing = "4", "Initializing"
+        expired = "5", "Expired"
 
     class TypeEnum(models.TextChoices):
         payment = "1", "Payment"
@@ -17,9 +19,65 @@ class Payment(models.Model):
     status = EnumField(StatusEnum)
     payment_type = EnumField(TypeEnum)
     borrowing = models.ForeignKey(Borrowing, on_delete=models.CASCADE)
-    session_url = models.URLField(max_length=500)
-    session_id = models.CharField(max_length=100)
+    session_url = models.URLField(max_length=500, blank=True)
+    session_id = models.CharField(max_length=100, blank=True, db_index=True)
+    session_expires_at = models.DateTimeField(blank=True, null=True)
+    session_attempt = models.PositiveSmallIntegerField(default=0)
     money_to_pay = models.DecimalField(decimal_places=2, max_digits=10)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         unique_together = ("borrowing", "payment_type")
+        indexes = [
+            models.Index(
+                fields=["status", "id"], name="payment_status_id_idx"
+            ),
+        ]
+
+
+class StripeEvent(models.Model):
+    """
+    A Stripe webhook event that was already processed.
+    Stripe delivers events at least once, so replays are dropped
+    by inserting the event id first.
+    """
+
+    event_id = models.CharField(max_length=255, primary_key=True)
+    type = models.CharField(max_length=100)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self) -> str:
+        return f"{self.type} ({self.event_id})"
+
+
+class Fine(models.Model):
+    """
+    Fine accrued by an overdue borrowing, as of "assessed_on".
+    Rows are upserted in bulk by "payment.fines.assess_fines".
+    """
+
+    borrowing = models.OneToOneField(
+        Borrowing, on_delete=models.CASCADE, related_name="fine"
+    )
+    overdue_days = models.PositiveIntegerField()
+    daily_fee = models.DecimalField(decimal_places=2, max_digits=10)
+    amount = models.DecimalField(decimal_places=2, max_digits=10)
+    assessed_on = models.DateField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return f"Fine of {self.amount}$ for borrowing {self.borrowing_id}"
+
+
+class StripeSyncState(models.Model):
+    """
+    Watermark of an incremental sync with a Stripe list API:
+    objects created before it no longer need to be listed.
+    """
+
+    name = models.CharField(max_length=100, primary_key=True)
+    watermark = models.DateTimeField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return f"{self.name} synced from {self.watermark}"
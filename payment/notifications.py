@@ -0,0 +1,28 @@
+from borrowing.models import Borrowing
+from notification.outbox import enqueue_message
+from payment.models import Payment
+
+
+def telegram_payment_notification(
+    payment: Payment,
+    borrowing: Borrowing,
+    payment_status: str,
+    payment_type: str,
+) -> None:
+    """
+    Sends a notification about the payment status via Telegram.
+
+    Formats and queues a message for a predefined Telegram chat,
+    providing detailed information about the payment status,
+    the user who made the payment, the books involved,
+    and the payment amount.
+    """
+    book_titles = ", ".join([book.title for book in borrowing.book.all()])
+    message = (
+        f"{payment_status}:\n"
+        f"User: {borrowing.user.email}\n"
+        f"Books: {book_titles}\n"
+        f"Payment type: {payment_type}\n"
+        f"Amount: {payment.money_to_pay}$"
+    )
+    enqueue_message(message)
@@ -0,0 +1,13 @@
+from rest_framework.pagination import CursorPagination
+
+
+class PaymentCursorPagination(CursorPagination):
+    """
+    Keyset pagination, newest payments first.
+    Backed by "payment_status_id_idx" for the status filter.
+    """
+
+    page_size = 10
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = "-id"
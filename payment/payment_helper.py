@@ -1,39 +1,38 @@
+from decimal import Decimal
+
 import stripe
-from django.conf import settings
-from django.db import transaction
-from django.db.models import QuerySet
 from django.http import JsonResponse
+from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
 
 from borrowing.models import Borrowing
-from borrowing.telegram_helper import send_message
+from payment.checkout import (
+    SESSION_LIFETIME,
+    claim_session_refresh,
+    create_checkout_session,
+    needs_new_session,
+    wait_for_session,
+)
+from payment.gateway import TRANSIENT_STRIPE_ERRORS
 from payment.models import Payment
-
-
-stripe.api_key = settings.STRIPE_SECRET_KEY
-
-FINE_MULTIPLIER = 2
+from payment.pricing import fine_amount, rental_amount
+from payment.tasks import retry_checkout_session
 
 
 def payment_create_borrowing(borrowing_id: int) -> JsonResponse:
     """
     Initiates a payment process for a borrowing transaction.
 
-    Calculates the total amount to be paid based on the borrowing duration and
-    the daily fees of all borrowed books. Creates a Stripe checkout session
+    The amount is the borrowing duration times the daily fees of all
+    borrowed books, see "payment.pricing". Creates a Stripe checkout session
     where the user can complete the payment.
     Returns a JSON response with the session URL and ID.
     """
     borrowing = Borrowing.objects.get(id=borrowing_id)
-    books = borrowing.book.all()
-    borrowing_days = borrowing.expected_return_date - borrowing.borrow_date
-    money_to_pay = (
-        borrowing_days.days * int(sum(book.daily_fee for book in books)) * 100
-    )
     return payment_helper(
         borrowing=borrowing,
-        money_to_pay=money_to_pay,
-        books=books,
+        money_to_pay=rental_amount(borrowing),
         payment_type="1",
     )
 
@@ -42,103 +41,80 @@ def fine_payment(borrowing: Borrowing) -> JsonResponse:
     """
     Initiates a payment process for a late fee.
 
-    Calculates the fine for overdue books based on the number of overdue days
-    and the daily fees of the books, applying a multiplier for the fine.
+    The fine is the number of overdue days times the daily fees
+    of the books, with a multiplier, see "payment.pricing".
     Creates a Stripe checkout session
     where the user can complete the fine payment.
     Returns a JSON response with the session URL and ID.
     """
-    books = borrowing.book.all()
-    overdue_days = (
-        borrowing.actual_return_date - borrowing.expected_return_date
-    )
-    money_to_pay = (
-        overdue_days.days
-        * int(sum(book.daily_fee for book in books))
-        * 100
-        * FINE_MULTIPLIER
-    )
     return payment_helper(
         borrowing=borrowing,
-        money_to_pay=money_to_pay,
-        books=books,
+        money_to_pay=fine_amount(borrowing),
         payment_type="2",
     )
 
 
 def payment_helper(
-    borrowing: Borrowing, money_to_pay: int, books: QuerySet, payment_type: str
+    borrowing: Borrowing, money_to_pay: Decimal, payment_type: str
 ) -> JsonResponse:
     """
-    Creates a Stripe checkout session and records payment details.
-
-    Handles the interaction with Stripe to create a checkout session based on
-    the borrowing details.
-    Records the payment session information in the database
-    for future reference and provides the checkout URL to the user.
-    Returns a JSON response with the session URL and ID.
-    """
-    domain = "http://127.0.0.1:8000"
-    with transaction.atomic():
-        try:
-            checkout_session = stripe.checkout.Session.create(
-                payment_method_types=["card"],
-                line_items=[
-                    {
-                        "price_data": {
-                            "currency": "usd",
-                            "product_data": {
-                                "name": ", ".join(
-                                    [book.title for book in books]
-                                ),
-                            },
-                            "unit_amount": money_to_pay,
-                        },
-                        "quantity": 1,
-                    },
-                ],
-                mode="payment",
-                success_url=f"{domain}/api/payment/success/"
-                f"{borrowing.id}/?payment_type={payment_type}",
-                cancel_url=f"{domain}/api/payment/cancel/"
-                f"{borrowing.id}/?payment_type={payment_type}",
-            )
-            Payment.objects.create(
-                status="1",
-                payment_type=payment_type,
-                borrowing=borrowing,
-                session_url=checkout_session.url,
-                session_id=checkout_session.id,
-                money_to_pay=round(money_to_pay / 100, 2),
-            )
-            return JsonResponse(
-                {"checkout_url": checkout_session.url},
-                status=status.HTTP_201_CREATED,
-            )
-        except Exception as e:
-            return JsonResponse({"error": str(e)}, status=400)
-
-
-def telegram_payment_notification(
-    payment: Payment,
-    borrowing: Borrowing,
-    payment_status: str,
-    payment_type: str,
-) -> None:
-    """
-    Sends a notification about the payment status via Telegram.
-
-    Formats and sends a message to a predefined Telegram chat,
-    providing detailed information about the payment status,
-    the user who made the payment, the books involved,
-    and the payment amount.
+    Starts a two-phase Stripe checkout for a borrowing.
+
+    The payment is committed first in the "Initializing" state, then the
+    checkout session is created outside of any database transaction, so
+    a slow Stripe never holds a transaction open, nor a pooled connection.
+    A retried request gets the stored session of its payment without
+    calling Stripe again, unless that session expired (it is then expired
+    at Stripe too, or found paid, see "retire_session"). Only the request
+    that created the payment, or claimed the refresh of its session,
+    calls Stripe: concurrent requests wait for that session instead.
+    Returns the checkout URL when the session is ready in time.
+    Otherwise (a transient Stripe failure hands the session over to a
+    Celery task) the response points to the payment status endpoint
+    to poll.
     """
-    book_titles = ", ".join([book.title for book in borrowing.book.all()])
-    message = (
-        f"{payment_status}:\n"
-        f"User: {borrowing.user.email}\n"
-        f"Books: {book_titles}\n"
-        f"Payment type: {payment_type}\n"
-        f"Amount: {payment.money_to_pay}$"
+    payment, created = Payment.objects.get_or_create(
+        borrowing=borrowing,
+        payment_type=payment_type,
+        defaults={
+            "status": Payment.StatusEnum.initializing,
+            "money_to_pay": money_to_pay,
+            "session_expires_at": timezone.now() + SESSION_LIFETIME,
+        },
+    )
+    owner = created
+    if not created and payment.status != Payment.StatusEnum.paid:
+        if needs_new_session(payment):
+            payment, owner = claim_session_refresh(payment)
+
+    if payment.status == Payment.StatusEnum.initializing:
+        if not owner:
+            payment = wait_for_session(payment)
+        else:
+            try:
+                payment = create_checkout_session(payment)
+            except TRANSIENT_STRIPE_ERRORS:
+                retry_checkout_session.delay(payment.id)
+            except stripe.StripeError as e:
+                payment.delete()
+                return JsonResponse({"error": str(e)}, status=400)
+
+    if payment.status == Payment.StatusEnum.paid:
+        return JsonResponse(
+            {"message": "Payment was already paid."},
+            status=status.HTTP_200_OK,
+        )
+    if payment.status != Payment.StatusEnum.pending:
+        return JsonResponse(
+            {
+                "payment_id": payment.id,
+                "status_url": reverse(
+                    "payment:payment-checkout-status", args=[payment.id]
+                ),
+            },
+            status=status.HTTP_202_ACCEPTED,
+        )
+    return JsonResponse(
+        {"checkout_url": payment.session_url},
+        status=status.HTTP_201_CREATED,
     )
-    send_message(message)
@@ -0,0 +1,98 @@
+from datetime import date
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Iterable
+
+from django.db.models import Count, Sum
+
+from book.models import Book
+from borrowing.models import Borrowing
+from payment.models import Fine
+
+
+FINE_MULTIPLIER = 2
+CENT = Decimal("0.01")
+
+
+def to_money(amount: Decimal) -> Decimal:
+    return Decimal(amount).quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+def to_cents(amount: Decimal) -> int:
+    """Convert an amount in dollars to the integer cents Stripe expects."""
+    return int(to_money(amount) * 100)
+
+
+def daily_fee(borrowing_id: int) -> Decimal:
+    """Sum of the daily fees of a borrowing, in one aggregate query."""
+    total = Book.objects.filter(borrowings__id=borrowing_id).aggregate(
+        total=Sum("daily_fee")
+    )["total"]
+    return to_money(total or 0)
+
+
+def daily_fees(borrowing_ids: Iterable[int]) -> dict[int, Decimal]:
+    """Daily fees of many borrowings, in one grouped query."""
+    rows = (
+        Borrowing.book.through.objects.filter(borrowing_id__in=borrowing_ids)
+        .values("borrowing_id")
+        .annotate(total=Sum("book__daily_fee"))
+        .order_by()
+    )
+    return {row["borrowing_id"]: to_money(row["total"]) for row in rows}
+
+
+def rental_price(
+    fee: Decimal, borrow_date: date, return_date: date
+) -> Decimal:
+    return to_money(fee * (return_date - borrow_date).days)
+
+
+def fine_price(
+    fee: Decimal, expected_return_date: date, actual_return_date: date
+) -> Decimal:
+    overdue_days = max((actual_return_date - expected_return_date).days, 0)
+    return to_money(fee * overdue_days * FINE_MULTIPLIER)
+
+
+def rental_amount(borrowing: Borrowing) -> Decimal:
+    return rental_price(
+        daily_fee(borrowing.id),
+        borrowing.borrow_date,
+        borrowing.expected_return_date,
+    )
+
+
+def fine_amount(borrowing: Borrowing) -> Decimal:
+    """
+    Fine of a returned borrowing. The amount precomputed by the nightly
+    assessment is used when it was assessed for the return date.
+    """
+    assessed = (
+        Fine.objects.filter(
+            borrowing_id=borrowing.id,
+            assessed_on=borrowing.actual_return_date,
+        )
+        .values_list("amount", flat=True)
+        .first()
+    )
+    if assessed is not None:
+        return assessed
+    return fine_price(
+        daily_fee(borrowing.id),
+        borrowing.expected_return_date,
+        borrowing.actual_return_date,
+    )
+
+
+def basket_daily_fee(book_ids: Iterable[int]) -> Decimal | None:
+    """
+    Sum of the daily fees of a basket of books, each book counted once.
+    Returns None when some of the books do not exist.
+    """
+    book_ids = set(book_ids)
+    totals = Book.objects.filter(id__in=book_ids).aggregate(
+        total=Sum("daily_fee"), books=Count("id")
+    )
+    if totals["books"] != len(book_ids):
+        return None
+    return to_money(totals["total"] or 0)
@@ -0,0 +1,82 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from functools import partial
+
+from django.db import transaction
+from django.utils import timezone
+
+from payment.checkout import reported_statuses, session_status
+from payment.gateway import get_gateway
+from payment.models import Payment, StripeSyncState
+from payment.tasks import notify_payment_status
+
+
+SYNC_NAME = "checkout.sessions"
+# Stripe checkout sessions expire after 24 hours at most.
+FIRST_SYNC_WINDOW = timedelta(hours=24)
+# Pending payments are expired locally this long after their session,
+# when Stripe never reported on it.
+EXPIRY_GRACE = timedelta(hours=1)
+
+
+def reconcile_payments() -> dict:
+    """
+    Bring pending payments in line with their Stripe checkout sessions.
+
+    Sessions are listed in pages with "created[gte]" set to the stored
+    watermark, and each page updates its payments with one UPDATE per
+    status. The new watermark is the creation time of the oldest session
+    still open, so the next run lists only what can still change.
+    Pending payments whose session expired long ago are expired too.
+    """
+    started = timezone.now()
+    state = StripeSyncState.objects.filter(name=SYNC_NAME).first()
+    watermark = state.watermark if state else started - FIRST_SYNC_WINDOW
+    report = {"sessions": 0, "paid": 0, "expired": 0, "stale": 0}
+
+    oldest_open = None
+    for page in get_gateway().list_checkout_sessions(
+        int(watermark.timestamp())
+    ):
+        report["sessions"] += len(page)
+        updates = {}
+        for session in page:
+            status = session_status(session)
+            if status is None:
+                created = datetime.fromtimestamp(
+                    session["created"], tz=dt_timezone.utc
+                )
+                oldest_open = min(oldest_open or created, created)
+            else:
+                updates.setdefault(status, []).append(session["id"])
+        for status, session_ids in updates.items():
+            report[status.name] += _update_payments(session_ids, status)
+
+    report["stale"] = Payment.objects.filter(
+        status=Payment.StatusEnum.pending,
+        session_expires_at__lt=started - EXPIRY_GRACE,
+    ).update(status=Payment.StatusEnum.expired, updated_at=timezone.now())
+
+    StripeSyncState.objects.update_or_create(
+        name=SYNC_NAME, defaults={"watermark": oldest_open or started}
+    )
+    return report
+
+
+def _update_payments(session_ids: list[str], status: str) -> int:
+    with transaction.atomic():
+        changed = list(
+            Payment.objects.select_for_update()
+            .filter(
+                session_id__in=session_ids,
+                status__in=reported_statuses(status),
+            )
+            .values_list("session_id", flat=True)
+        )
+        Payment.objects.filter(session_id__in=changed).update(
+            status=status, updated_at=timezone.now()
+        )
+        for session_id in changed:
+            transaction.on_commit(
+                partial(notify_payment_status.delay, session_id), robust=True
+            )
+    return len(changed)
@@ -1,10 +1,18 @@
+from functools import partial
+
 from rest_framework import serializers
 
-from borrowing.serializers import BorrowingSerializer
+from borrowing.serializers import (
+    BORROWING_COLUMNS,
+    BorrowingSerializer,
+    borrowing_rows,
+)
+from library_service.fastpath import FastReader, decimal_string
+from library_service.fields import SelectableFieldsMixin
 from payment.models import Payment
 
 
-class PaymentSerializer(serializers.ModelSerializer):
+class PaymentSerializer(SelectableFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for the Payment model.
     Attributes:
@@ -41,3 +49,42 @@ class PaymentListSerializer(PaymentSerializer):
     class Meta:
         model = Payment
         fields = ("id", "status", "borrowing", "money_to_pay")
+
+
+def payment_rows(rows: list[dict], detail: bool = False) -> list[dict]:
+    """
+    Render ".values()" rows exactly like "PaymentListSerializer",
+    or "PaymentSerializer" when "detail" is set.
+    """
+    borrowings = borrowing_rows(rows, prefix="borrowing__")
+    payments = []
+    for row, borrowing in zip(rows, borrowings):
+        payment = {
+            "id": row["id"],
+            "status": Payment.StatusEnum(row["status"]).label,
+        }
+        if detail:
+            payment["payment_type"] = Payment.TypeEnum(
+                row["payment_type"]
+            ).label
+        payment["borrowing"] = borrowing
+        if detail:
+            payment["session_url"] = row["session_url"]
+            payment["session_id"] = row["session_id"]
+        payment["money_to_pay"] = decimal_string(row["money_to_pay"], 2)
+        payments.append(payment)
+    return payments
+
+
+PAYMENT_COLUMNS = (
+    "id",
+    "status",
+    "money_to_pay",
+    *(f"borrowing__{column}" for column in BORROWING_COLUMNS),
+)
+
+PAYMENT_LIST_READER = FastReader(columns=PAYMENT_COLUMNS, build=payment_rows)
+PAYMENT_READER = FastReader(
+    columns=(*PAYMENT_COLUMNS, "payment_type", "session_url", "session_id"),
+    build=partial(payment_rows, detail=True),
+)
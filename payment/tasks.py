@@ -0,0 +1,90 @@
+import stripe
+from celery import Task, shared_task
+from django.utils import timezone
+
+from payment.checkout import (
+    claim_session_refresh,
+    create_checkout_session,
+    needs_new_session,
+)
+from payment.fines import assess_fines
+from payment.gateway import TRANSIENT_STRIPE_ERRORS
+from payment.models import Payment
+from payment.notifications import telegram_payment_notification
+
+
+RETRY_BACKOFF = 5
+RETRY_BACKOFF_MAX = 300
+
+
+@shared_task(bind=True, max_retries=8, ignore_result=True)
+def retry_checkout_session(self: Task, payment_id: int) -> None:
+    """
+    Create the Stripe checkout session of a payment whose session
+    could not be created during the request.
+    Transient Stripe errors are retried with exponential backoff;
+    payments that still have no session afterwards are canceled.
+    """
+    payment = Payment.objects.filter(
+        id=payment_id, status=Payment.StatusEnum.initializing
+    ).first()
+    if payment is None:
+        return
+    if needs_new_session(payment):
+        payment, claimed = claim_session_refresh(payment)
+        if not claimed:
+            return
+
+    try:
+        create_checkout_session(payment)
+    except TRANSIENT_STRIPE_ERRORS as error:
+        if self.request.retries < self.max_retries:
+            raise self.retry(
+                exc=error,
+                countdown=min(
+                    RETRY_BACKOFF * 2**self.request.retries, RETRY_BACKOFF_MAX
+                ),
+            )
+        _cancel(payment_id)
+    except stripe.StripeError:
+        _cancel(payment_id)
+
+
+def _cancel(payment_id: int) -> None:
+    Payment.objects.filter(
+        id=payment_id, status=Payment.StatusEnum.initializing
+    ).update(status=Payment.StatusEnum.canceled, updated_at=timezone.now())
+
+
+@shared_task(ignore_result=True)
+def notify_payment_status(session_id: str) -> None:
+    """Report the new status of a payment changed by a Stripe event."""
+    payment = (
+        Payment.objects.select_related("borrowing__user")
+        .prefetch_related("borrowing__book")
+        .filter(session_id=session_id)
+        .first()
+    )
+    if payment is None:
+        return
+    telegram_payment_notification(
+        payment=payment,
+        borrowing=payment.borrowing,
+        payment_status=f"{payment.get_status_display()} payment",
+        payment_type=payment.get_payment_type_display(),
+    )
+
+
+@shared_task(ignore_result=True)
+def assess_overdue_fines() -> int:
+    """Nightly upsert of the fines ledger, see "payment.fines"."""
+    return assess_fines()
+
+
+@shared_task(ignore_result=True)
+def reconcile_stripe_payments() -> dict:
+    """Periodic sync of pending payments, see "payment.reconciliation"."""
+    # Imported here: the reconciliation queues tasks of this module.
+    from payment.reconciliation import reconcile_payments
+
+    return reconcile_payments()
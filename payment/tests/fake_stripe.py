@@ -0,0 +1,96 @@
+import itertools
+import json
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeStripeServer:
+    """
+    A local stand-in for the Stripe API, with injectable latency and
+    failures. Use as a context manager and point the gateway at "url".
+    """
+
+    def __init__(self, latency: float = 0) -> None:
+        self.latency = latency
+        self.failures = deque()
+        self.requests = []
+        self.sessions = []
+        self.ids = itertools.count(1)
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self.handler())
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+
+    def __enter__(self) -> "FakeStripeServer":
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def fail_next(self, *status_codes: int) -> None:
+        self.failures.extend(status_codes)
+
+    def handler(self) -> type:
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                self.respond(self.create_session)
+
+            def do_GET(self) -> None:
+                self.respond(
+                    lambda: {
+                        "object": "list",
+                        "url": "/v1/checkout/sessions",
+                        "has_more": False,
+                        "data": list(fake.sessions),
+                    }
+                )
+
+            def create_session(self) -> dict:
+                number = next(fake.ids)
+                session = {
+                    "id": f"cs_test_{number}",
+                    "object": "checkout.session",
+                    "status": "open",
+                    "payment_status": "unpaid",
+                    "created": int(time.time()),
+                    "url": f"https://checkout.stripe.com/c/pay/cs_{number}",
+                }
+                fake.sessions.append(session)
+                return session
+
+            def respond(self, build) -> None:
+                fake.requests.append(
+                    (self.command, self.path, self.headers["Idempotency-Key"])
+                )
+                time.sleep(fake.latency)
+                if fake.failures:
+                    status = fake.failures.popleft()
+                    body = {
+                        "error": {
+                            "type": "api_error",
+                            "message": "Injected failure",
+                        }
+                    }
+                else:
+                    status, body = 200, build()
+                payload = json.dumps(body).encode()
+                try:
+                    self.send_response(status)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(payload)))
+                    self.end_headers()
+                    self.wfile.write(payload)
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client gave up waiting (injected latency).
+                    pass
+
+            def log_message(self, *args) -> None:
+                pass
+
+        return Handler
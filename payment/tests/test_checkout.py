@@ -0,0 +1,253 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import stripe
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.utils import timezone
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from book.models import Book
+from borrowing.models import Borrowing
+from payment.checkout import claim_session_refresh
+from payment.models import Payment
+from payment.payment_helper import payment_helper
+from payment.tasks import retry_checkout_session
+
+
+User = get_user_model()
+
+SESSION = SimpleNamespace(
+    id="cs_test_123", url="https://checkout.stripe.com/c/pay/cs_test_123"
+)
+
+
+@patch("borrowing.serializers.enqueue_message")
+@override_settings(STRIPE_SECRET_KEY="sk_test_fake")
+@patch("payment.gateway.StripeGateway.create_checkout_session")
+class TwoPhaseCheckoutTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="user@example.com",
+            password="password123",
+            first_name="User",
+            last_name="Example",
+        )
+        self.book = Book.objects.create(
+            title="Test Book",
+            author="Author",
+            cover="SOFT",
+            inventory=5,
+            daily_fee=1.50,
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def borrow(self):
+        return self.client.post(
+            reverse("borrowings:borrowing-list"),
+            {
+                "expected_return_date": date.today() + timedelta(days=3),
+                "book": [self.book.id],
+            },
+            format="json",
+        )
+
+    def test_checkout_url_returned_when_stripe_answers(self, create, _):
+        create.return_value = SESSION
+
+        response = self.borrow()
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json()["checkout_url"], SESSION.url)
+        payment = Payment.objects.get()
+        self.assertEqual(payment.status, Payment.StatusEnum.pending)
+        self.assertEqual(payment.session_id, SESSION.id)
+        self.assertEqual(
+            create.call_args.kwargs["idempotency_key"],
+            f"checkout-session-{payment.id}-0",
+        )
+
+    @patch("payment.payment_helper.retry_checkout_session.delay")
+    def test_slow_stripe_hands_over_to_celery(self, delay, create, _):
+        create.side_effect = stripe.APIConnectionError("Timed out")
+
+        response = self.borrow()
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        payment = Payment.objects.get()
+        self.assertEqual(payment.status, Payment.StatusEnum.initializing)
+        delay.assert_called_once_with(payment.id)
+
+        response = self.client.get(response.json()["status_url"])
+        self.assertEqual(response.data["status"], "Initializing")
+        self.assertIsNone(response.data["checkout_url"])
+
+        create.side_effect = None
+        create.return_value = SESSION
+        retry_checkout_session.apply(args=[payment.id])
+
+        response = self.client.get(
+            reverse("payment:payment-checkout-status", args=[payment.id])
+        )
+        self.assertEqual(response.data["status"], "Pending")
+        self.assertEqual(response.data["checkout_url"], SESSION.url)
+
+    def test_rejected_checkout_drops_the_payment(self, create, _):
+        create.side_effect = stripe.InvalidRequestError("Bad amount", None)
+
+        response = self.borrow()
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Payment.objects.exists())
+
+    @patch("payment.payment_helper.retry_checkout_session.delay")
+    def test_retry_task_cancels_rejected_checkout(self, _, create, __):
+        create.side_effect = stripe.APIConnectionError("Timed out")
+        self.borrow()
+        payment = Payment.objects.get()
+        initialized_at = payment.updated_at
+
+        create.side_effect = stripe.InvalidRequestError("Bad amount", None)
+        retry_checkout_session.apply(args=[payment.id])
+
+        payment.refresh_from_db()
+        self.assertEqual(payment.status, Payment.StatusEnum.canceled)
+        self.assertGreater(payment.updated_at, initialized_at)
+
+
+@override_settings(STRIPE_SECRET_KEY="sk_test_fake")
+@patch("payment.gateway.StripeGateway.create_checkout_session")
+class CheckoutSessionReuseTests(APITestCase):
+    def setUp(self):
+        user = User.objects.create_user(
+            email="user@example.com",
+            password="password123",
+            first_name="User",
+            last_name="Example",
+        )
+        self.borrowing = Borrowing.objects.create(
+            user=user, expected_return_date=date.today() + timedelta(days=3)
+        )
+
+    def checkout(self):
+        return payment_helper(
+            borrowing=self.borrowing,
+            money_to_pay=Decimal("4.50"),
+            payment_type="1",
+        )
+
+    def test_retried_checkout_reuses_pending_session(self, create):
+        create.return_value = SESSION
+
+        first = self.checkout()
+        second = self.checkout()
+
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(second.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(first.content, second.content)
+        create.assert_called_once()
+
+    @patch("payment.checkout.release_pooled_connections")
+    def test_connection_is_released_while_stripe_is_called(
+        self, release, create
+    ):
+        def create_session(**params):
+            release.assert_called_once()
+            return SESSION
+
+        create.side_effect = create_session
+
+        response = self.checkout()
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    @patch("payment.gateway.StripeGateway.expire_checkout_session")
+    def test_expired_session_is_refreshed(self, expire, create):
+        create.return_value = SESSION
+        self.checkout()
+        Payment.objects.update(session_expires_at=timezone.now())
+        create.return_value = SimpleNamespace(
+            id="cs_test_456", url="https://checkout.stripe.com/c/pay/cs_456"
+        )
+
+        response = self.checkout()
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        payment = Payment.objects.get()
+        self.assertEqual(payment.session_id, "cs_test_456")
+        self.assertEqual(payment.session_attempt, 1)
+        self.assertEqual(
+            create.call_args.kwargs["idempotency_key"],
+            f"checkout-session-{payment.id}-1",
+        )
+        expire.assert_called_once_with(SESSION.id)
+
+    @patch("payment.gateway.StripeGateway.retrieve_checkout_session")
+    @patch("payment.gateway.StripeGateway.expire_checkout_session")
+    def test_session_paid_before_its_refresh_is_kept(
+        self, expire, retrieve, create
+    ):
+        create.return_value = SESSION
+        self.checkout()
+        Payment.objects.update(session_expires_at=timezone.now())
+        expire.side_effect = stripe.InvalidRequestError(
+            "Only open sessions can be expired.", None
+        )
+        retrieve.return_value = {
+            "id": SESSION.id,
+            "status": "complete",
+            "payment_status": "paid",
+            "url": None,
+        }
+
+        with patch("payment.tasks.notify_payment_status.delay") as notify:
+            response = self.checkout()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        payment = Payment.objects.get()
+        self.assertEqual(payment.status, Payment.StatusEnum.paid)
+        self.assertEqual(payment.session_id, SESSION.id)
+        create.assert_called_once()
+        notify.assert_called_once_with(SESSION.id)
+
+    def test_concurrent_checkout_waits_for_the_winners_session(self, create):
+        payment = Payment.objects.create(
+            borrowing=self.borrowing,
+            payment_type="1",
+            status=Payment.StatusEnum.initializing,
+            money_to_pay=Decimal("4.50"),
+            session_expires_at=timezone.now() + timedelta(hours=23),
+        )
+
+        def winner_creates_session(_):
+            Payment.objects.filter(id=payment.id).update(
+                status=Payment.StatusEnum.pending,
+                session_id=SESSION.id,
+                session_url=SESSION.url,
+            )
+
+        with patch(
+            "payment.checkout.time.sleep", side_effect=winner_creates_session
+        ):
+            response = self.checkout()
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertIn(SESSION.url.encode(), response.content)
+        create.assert_not_called()
+
+    def test_only_one_caller_claims_the_refresh(self, create):
+        create.return_value = SESSION
+        self.checkout()
+        Payment.objects.update(session_expires_at=timezone.now())
+        stale = Payment.objects.get()
+        claim_session_refresh(Payment.objects.get())
+
+        payment, claimed = claim_session_refresh(stale)
+
+        self.assertFalse(claimed)
+        self.assertEqual(payment.session_attempt, 1)
+        create.assert_called_once()
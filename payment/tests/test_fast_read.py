@@ -0,0 +1,103 @@
+from datetime import date, timedelta
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from book.models import Book
+from book.views import BookViewSet
+from borrowing.models import Borrowing
+from borrowing.views import BorrowingViewSet
+from payment.models import Payment
+from payment.views import PaymentViewSet
+
+
+User = get_user_model()
+
+
+class FastReadTests(APITestCase):
+    """The fast read path renders the same bytes as the serializers."""
+
+    def setUp(self):
+        self.user = User.objects.create_superuser(
+            email="admin@example.com",
+            password="password123",
+            first_name="Admin",
+            last_name="Example",
+        )
+        other = User.objects.create_user(
+            email="other@example.com",
+            password="password123",
+            first_name="Other",
+            last_name="Example",
+        )
+        books = [
+            Book.objects.create(
+                title=f"Book {number}",
+                author="Author é",
+                cover="HARD" if number % 2 else "SOFT",
+                inventory=number,
+                daily_fee=f"{number}.5",
+            )
+            for number in range(4)
+        ]
+        today = date.today()
+        for number in range(6):
+            borrowing = Borrowing.objects.create(
+                user=other if number % 2 else self.user,
+                expected_return_date=today + timedelta(days=number),
+                actual_return_date=today if number % 3 else None,
+            )
+            borrowing.book.set(books[number % 3 : number % 3 + 2])
+            Payment.objects.create(
+                status=Payment.StatusEnum.values[number % 5],
+                payment_type=Payment.TypeEnum.payment,
+                borrowing=borrowing,
+                session_url=f"https://checkout.stripe.com/c/pay/{number}",
+                session_id=f"cs_{number}",
+                money_to_pay=f"{number * 3}.1",
+            )
+        Borrowing.objects.create(user=self.user, expected_return_date=today)
+        self.client.force_authenticate(user=self.user)
+
+    def assertSameBytes(self, viewset, url, params=None):
+        fast = self.client.get(url, params)
+        with patch.object(viewset, "fast_readers", {}):
+            slow = self.client.get(url, params)
+        self.assertEqual(fast.status_code, 200)
+        self.assertEqual(fast.content, slow.content)
+
+    def test_book_list_and_detail(self):
+        book = Book.objects.first()
+        self.assertSameBytes(BookViewSet, reverse("book:books-list"))
+        self.assertSameBytes(
+            BookViewSet,
+            reverse("book:books-list"),
+            {"pagination": "cursor", "page_size": 3},
+        )
+        self.assertSameBytes(
+            BookViewSet, reverse("book:books-detail", args=[book.id])
+        )
+
+    def test_borrowing_list_and_detail(self):
+        borrowing = Borrowing.objects.first()
+        url = reverse("borrowings:borrowing-list")
+        self.assertSameBytes(BorrowingViewSet, url)
+        self.assertSameBytes(BorrowingViewSet, url, {"is_active": "true"})
+        self.assertSameBytes(
+            BorrowingViewSet,
+            reverse("borrowings:borrowing-detail", args=[borrowing.id]),
+        )
+
+    def test_payment_list_and_detail(self):
+        payment = Payment.objects.first()
+        self.assertSameBytes(PaymentViewSet, reverse("payment:payment-list"))
+        self.assertSameBytes(
+            PaymentViewSet,
+            reverse("payment:payment-detail", args=[payment.id]),
+        )
+
+    def test_missing_object_is_not_found(self):
+        url = reverse("payment:payment-detail", args=[0])
+        self.assertEqual(self.client.get(url).status_code, 404)
@@ -0,0 +1,126 @@
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from book.models import Book
+from borrowing.models import Borrowing
+from payment.models import Payment
+
+
+User = get_user_model()
+
+
+class FieldSelectionTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="user@example.com",
+            password="password123",
+            first_name="User",
+            last_name="Example",
+        )
+        self.book = Book.objects.create(
+            title="Test Book",
+            author="Author",
+            cover="SOFT",
+            inventory=5,
+            daily_fee=1.50,
+        )
+        self.borrowing = Borrowing.objects.create(
+            user=self.user,
+            expected_return_date=date.today() + timedelta(days=3),
+        )
+        self.borrowing.book.add(self.book)
+        self.payment = Payment.objects.create(
+            status=Payment.StatusEnum.pending,
+            payment_type=Payment.TypeEnum.payment,
+            borrowing=self.borrowing,
+            session_url="https://checkout.stripe.com/c/pay/cs_test",
+            session_id="cs_test",
+            money_to_pay=4.50,
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def get(self, url, **params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, [query["sql"] for query in queries]
+
+    def test_default_response_is_unchanged(self):
+        response, _ = self.get(reverse("payment:payment-list"))
+
+        payment = response.data["results"][0]
+        self.assertEqual(
+            set(payment), {"id", "status", "borrowing", "money_to_pay"}
+        )
+        self.assertEqual(payment["borrowing"]["user"], self.user.email)
+        self.assertEqual(payment["borrowing"]["book"][0]["title"], "Test Book")
+
+    def test_fields_skip_unrequested_relations(self):
+        response, queries = self.get(
+            reverse("payment:payment-list"), fields="id,status,money_to_pay"
+        )
+
+        self.assertEqual(
+            response.data["results"],
+            [
+                {
+                    "id": self.payment.id,
+                    "status": "Pending",
+                    "money_to_pay": "4.50",
+                }
+            ],
+        )
+        self.assertFalse(any('FROM "book_book"' in sql for sql in queries))
+        self.assertFalse(any('JOIN "user_user"' in sql for sql in queries))
+
+    def test_unexpanded_relation_is_collapsed_to_its_key(self):
+        response, queries = self.get(
+            reverse("payment:payment-detail", args=[self.payment.id]),
+            expand="",
+        )
+
+        self.assertEqual(response.data["borrowing"], self.borrowing.id)
+        self.assertEqual(len(queries), 2)
+
+    def test_nested_fields_expand_their_relation(self):
+        response, queries = self.get(
+            reverse("payment:payment-list"),
+            fields="id,borrowing.id,borrowing.book.title",
+            expand="",
+        )
+
+        self.assertEqual(
+            response.data["results"][0],
+            {
+                "id": self.payment.id,
+                "borrowing": {
+                    "id": self.borrowing.id,
+                    "book": [{"title": "Test Book"}],
+                },
+            },
+        )
+        self.assertFalse(any('JOIN "user_user"' in sql for sql in queries))
+
+    def test_borrowing_books_collapsed_to_ids(self):
+        response, _ = self.get(
+            reverse("borrowings:borrowing-list"), fields="id,book", expand=""
+        )
+
+        self.assertEqual(
+            response.data["results"],
+            [{"id": self.borrowing.id, "book": [self.book.id]}],
+        )
+
+    def test_book_fields(self):
+        response, _ = self.get(
+            reverse("book:books-detail", args=[self.book.id]),
+            fields="title,inventory",
+        )
+
+        self.assertEqual(response.data, {"title": "Test Book", "inventory": 5})
@@ -0,0 +1,82 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from book.models import Book
+from borrowing.models import Borrowing
+from payment.fines import assess_fines
+from payment.models import Fine
+from payment.pricing import fine_amount
+
+
+User = get_user_model()
+
+
+class AssessFinesTests(TestCase):
+    def setUp(self):
+        self.today = date.today()
+        self.user = User.objects.create_user(
+            email="user@example.com",
+            password="password123",
+            first_name="User",
+            last_name="Example",
+        )
+        self.books = [
+            Book.objects.create(
+                title=f"Book {fee}",
+                author="Author",
+                cover="SOFT",
+                inventory=5,
+                daily_fee=fee,
+            )
+            for fee in (Decimal("1.50"), Decimal("0.25"))
+        ]
+
+    def borrowing(self, days, **params):
+        borrowing = Borrowing.objects.create(
+            user=self.user,
+            expected_return_date=self.today + timedelta(days=days),
+            **params,
+        )
+        borrowing.book.set(self.books)
+        return borrowing
+
+    def test_only_overdue_active_borrowings_are_assessed(self):
+        overdue = [self.borrowing(-days) for days in range(1, 6)]
+        self.borrowing(0)
+        self.borrowing(-3, actual_return_date=self.today)
+
+        self.assertEqual(assess_fines(self.today, chunk_size=2), 5)
+
+        fines = Fine.objects.order_by("borrowing_id")
+        self.assertEqual(
+            [fine.borrowing_id for fine in fines],
+            [borrowing.id for borrowing in overdue],
+        )
+        self.assertEqual(
+            [fine.amount for fine in fines],
+            [Decimal("3.50") * days for days in range(1, 6)],
+        )
+
+    def test_ledger_is_updated_in_place(self):
+        borrowing = self.borrowing(-1)
+        assess_fines(self.today)
+        assess_fines(self.today + timedelta(days=1))
+
+        fine = Fine.objects.get()
+        self.assertEqual(fine.borrowing_id, borrowing.id)
+        self.assertEqual(fine.overdue_days, 2)
+        self.assertEqual(fine.amount, Decimal("7.00"))
+
+    def test_return_uses_assessed_amount(self):
+        borrowing = self.borrowing(-2)
+        assess_fines(self.today)
+        Fine.objects.update(amount=Decimal("99.99"))
+        borrowing.actual_return_date = self.today
+
+        self.assertEqual(fine_amount(borrowing), Decimal("99.99"))
+
+        borrowing.actual_return_date = self.today + timedelta(days=1)
+        self.assertEqual(fine_amount(borrowing), Decimal("10.50"))
@@ -0,0 +1,143 @@
+import threading
+import time
+from unittest.mock import patch
+
+import stripe
+from django.test import SimpleTestCase
+
+from payment.gateway import (
+    BulkheadFullError,
+    CircuitBreaker,
+    CircuitOpenError,
+    StripeGateway,
+)
+from payment.tests.fake_stripe import FakeStripeServer
+
+
+@patch("payment.gateway.RETRY_BACKOFF", 0)
+class StripeGatewayTests(SimpleTestCase):
+    def setUp(self):
+        self.stripe = FakeStripeServer()
+        self.stripe.__enter__()
+        self.addCleanup(self.stripe.__exit__)
+
+    def gateway(self, **options):
+        options.setdefault("read_timeout", 0.5)
+        return StripeGateway(
+            api_key="sk_test_fake", api_base=self.stripe.url, **options
+        )
+
+    def create(self, gateway, key="checkout-session-1-0"):
+        return gateway.create_checkout_session(
+            idempotency_key=key, mode="payment"
+        )
+
+    def test_creates_session(self):
+        session = self.create(self.gateway())
+
+        self.assertEqual(session.id, "cs_test_1")
+        self.assertEqual(
+            self.stripe.requests,
+            [("POST", "/v1/checkout/sessions", "checkout-session-1-0")],
+        )
+
+    def test_transient_failure_is_retried_with_same_key(self):
+        self.stripe.fail_next(500)
+
+        session = self.create(self.gateway())
+
+        self.assertEqual(session.id, "cs_test_1")
+        self.assertEqual(len(self.stripe.requests), 2)
+        self.assertEqual(
+            {key for _, _, key in self.stripe.requests},
+            {"checkout-session-1-0"},
+        )
+
+    def test_slow_stripe_times_out_within_retry_limit(self):
+        self.stripe.latency = 0.3
+
+        with self.assertRaises(stripe.APIConnectionError):
+            self.create(self.gateway(read_timeout=0.1, max_retries=1))
+
+        self.assertEqual(len(self.stripe.requests), 2)
+
+    def test_rejected_call_is_not_retried(self):
+        self.stripe.fail_next(400)
+
+        with self.assertRaises(stripe.InvalidRequestError):
+            self.create(self.gateway())
+
+        self.assertEqual(len(self.stripe.requests), 1)
+
+    def test_open_circuit_fails_fast(self):
+        gateway = self.gateway(
+            max_retries=0,
+            breaker=CircuitBreaker(failure_threshold=2, reset_timeout=60),
+        )
+        self.stripe.fail_next(500, 500)
+        for _ in range(2):
+            with self.assertRaises(stripe.APIError):
+                self.create(gateway)
+
+        with self.assertRaises(CircuitOpenError):
+            self.create(gateway)
+
+        self.assertEqual(len(self.stripe.requests), 2)
+
+    def test_half_open_circuit_closes_after_successful_trial(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+        gateway = self.gateway(max_retries=0, breaker=breaker)
+        self.stripe.fail_next(500)
+        with self.assertRaises(stripe.APIError):
+            self.create(gateway)
+        self.assertEqual(breaker.state, "open")
+
+        time.sleep(0.06)
+        self.create(gateway)
+
+        self.assertEqual(breaker.state, "closed")
+
+    def test_full_bulkhead_does_not_hold_the_half_open_trial(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+        gateway = self.gateway(
+            max_retries=0, max_concurrency=1, acquire_timeout=0.01
+        )
+        gateway.breaker = breaker
+        self.stripe.fail_next(500)
+        with self.assertRaises(stripe.APIError):
+            self.create(gateway)
+        time.sleep(0.06)
+
+        gateway.slots.acquire()
+        with self.assertRaises(BulkheadFullError):
+            self.create(gateway)
+        gateway.slots.release()
+        self.create(gateway)
+
+        self.assertEqual(breaker.state, "closed")
+
+    def test_unexpected_error_ends_the_half_open_trial(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        breaker.record_failure()
+        gateway = self.gateway(breaker=breaker)
+
+        with self.assertRaises(ValueError):
+            gateway.call(lambda **kwargs: int("x"), {})
+        self.create(gateway)
+
+        self.assertEqual(breaker.state, "closed")
+
+    def test_concurrent_calls_are_capped(self):
+        self.stripe.latency = 0.3
+        gateway = self.gateway(max_concurrency=1, acquire_timeout=0.05)
+        slow_call = threading.Thread(target=self.create, args=[gateway])
+        slow_call.start()
+        time.sleep(0.1)
+
+        start = time.monotonic()
+        with self.assertRaises(BulkheadFullError):
+            self.create(gateway, key="checkout-session-2-0")
+
+        self.assertLess(time.monotonic() - start, 0.2)
+        slow_call.join()
+        self.assertEqual(len(self.stripe.requests), 1)
@@ -0,0 +1,110 @@
+from datetime import date, timedelta
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+
+from borrowing.models import Borrowing
+from payment.gateway import StripeGateway
+from payment.models import Payment, StripeSyncState
+from payment.reconciliation import SYNC_NAME, reconcile_payments
+from payment.tests.fake_stripe import FakeStripeServer
+
+
+User = get_user_model()
+
+
+@patch("payment.reconciliation.notify_payment_status.delay")
+class ReconcilePaymentsTests(TestCase):
+    def setUp(self):
+        self.stripe = FakeStripeServer()
+        self.stripe.__enter__()
+        self.addCleanup(self.stripe.__exit__)
+        gateway = StripeGateway(
+            api_key="sk_test_fake", api_base=self.stripe.url
+        )
+        patcher = patch(
+            "payment.reconciliation.get_gateway", return_value=gateway
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.user = User.objects.create_user(
+            email="user@example.com",
+            password="password123",
+            first_name="User",
+            last_name="Example",
+        )
+
+    def payment(self, session_id, expires_in=timedelta(hours=20)):
+        borrowing = Borrowing.objects.create(
+            user=self.user,
+            expected_return_date=date.today() + timedelta(days=3),
+        )
+        return Payment.objects.create(
+            status=Payment.StatusEnum.pending,
+            payment_type=Payment.TypeEnum.payment,
+            borrowing=borrowing,
+            session_id=session_id,
+            session_url=f"https://checkout.stripe.com/c/pay/{session_id}",
+            session_expires_at=timezone.now() + expires_in,
+            money_to_pay=4.50,
+        )
+
+    def session(self, session_id, status, payment_status="unpaid", age=60):
+        self.stripe.sessions.append(
+            {
+                "id": session_id,
+                "object": "checkout.session",
+                "status": status,
+                "payment_status": payment_status,
+                "created": int(timezone.now().timestamp()) - age,
+            }
+        )
+
+    def test_payments_follow_their_sessions(self, notify):
+        paid = self.payment("cs_paid")
+        expired = self.payment("cs_expired")
+        still_open = self.payment("cs_open")
+        self.session("cs_paid", "complete", "paid")
+        self.session("cs_expired", "expired")
+        self.session("cs_open", "open", age=600)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            report = reconcile_payments()
+
+        self.assertEqual(report["sessions"], 3)
+        statuses = dict(
+            Payment.objects.values_list("session_id", "status").order_by()
+        )
+        self.assertEqual(statuses[paid.session_id], "2")
+        self.assertEqual(statuses[expired.session_id], "5")
+        self.assertEqual(statuses[still_open.session_id], "1")
+        notify.assert_any_call("cs_paid")
+        self.assertEqual(notify.call_count, 2)
+
+        watermark = StripeSyncState.objects.get(name=SYNC_NAME).watermark
+        self.assertEqual(
+            int(watermark.timestamp()), self.stripe.sessions[2]["created"]
+        )
+        method, path, _ = self.stripe.requests[0]
+        self.assertEqual(method, "GET")
+        self.assertIn(
+            "created[gte]", path.replace("%5B", "[").replace("%5D", "]")
+        )
+
+    def test_stale_pending_payments_are_expired(self, notify):
+        stale = self.payment("cs_lost", expires_in=-timedelta(hours=2))
+        fresh = self.payment("cs_fresh")
+
+        report = reconcile_payments()
+
+        self.assertEqual(report["stale"], 1)
+        stale.refresh_from_db()
+        fresh.refresh_from_db()
+        self.assertEqual(stale.status, Payment.StatusEnum.expired)
+        self.assertEqual(fresh.status, Payment.StatusEnum.pending)
+        self.assertEqual(
+            StripeSyncState.objects.get(name=SYNC_NAME).watermark.date(),
+            timezone.now().date(),
+        )
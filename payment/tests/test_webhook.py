@@ -0,0 +1,180 @@
+import hashlib
+import hmac
+import json
+import time
+from datetime import date, timedelta
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from book.models import Book
+from borrowing.models import Borrowing
+from payment.checkout import claim_session_refresh
+from payment.models import Payment, StripeEvent
+
+
+User = get_user_model()
+
+WEBHOOK_SECRET = "whsec_test"
+
+
+def sign(payload, secret=WEBHOOK_SECRET, timestamp=None):
+    """Build a "Stripe-Signature" header the way Stripe does."""
+    timestamp = timestamp or int(time.time())
+    signature = hmac.new(
+        secret.encode(),
+        f"{timestamp}.{payload}".encode(),
+        hashlib.sha256,
+    ).hexdigest()
+    return f"t={timestamp},v1={signature}"
+
+
+def checkout_event(event_id, event_type, session_id, **session):
+    return {
+        "id": event_id,
+        "object": "event",
+        "type": event_type,
+        "data": {
+            "object": {
+                "id": session_id,
+                "object": "checkout.session",
+                "payment_status": "paid",
+                **session,
+            }
+        },
+    }
+
+
+@override_settings(STRIPE_WEBHOOK_SECRET=WEBHOOK_SECRET)
+@patch("payment.webhooks.notify_payment_status.delay")
+class StripeWebhookTests(APITestCase):
+    def setUp(self):
+        self.url = reverse("payment:payment-webhook")
+        user = User.objects.create_user(
+            email="user@example.com",
+            password="password123",
+            first_name="User",
+            last_name="Example",
+        )
+        book = Book.objects.create(
+            title="Test Book",
+            author="Author",
+            cover="SOFT",
+            inventory=5,
+            daily_fee=1.50,
+        )
+        self.borrowing = Borrowing.objects.create(
+            user=user, expected_return_date=date.today() + timedelta(days=3)
+        )
+        self.borrowing.book.add(book)
+        self.payment = Payment.objects.create(
+            status=Payment.StatusEnum.pending,
+            payment_type=Payment.TypeEnum.payment,
+            borrowing=self.borrowing,
+            session_url="https://checkout.stripe.com/c/pay/cs_test_1",
+            session_id="cs_test_1",
+            money_to_pay=4.50,
+        )
+
+    def post_event(self, event, signature=None):
+        payload = json.dumps(event)
+        return self.client.post(
+            self.url,
+            payload,
+            content_type="application/json",
+            HTTP_STRIPE_SIGNATURE=signature or sign(payload),
+        )
+
+    def test_completed_event_marks_payment_paid(self, notify):
+        event = checkout_event(
+            "evt_1", "checkout.session.completed", "cs_test_1"
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.post_event(event)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.payment.refresh_from_db()
+        self.assertEqual(self.payment.status, Payment.StatusEnum.paid)
+        notify.assert_called_once_with("cs_test_1")
+
+    def test_expired_event_marks_payment_expired(self, notify):
+        event = checkout_event(
+            "evt_1", "checkout.session.expired", "cs_test_1"
+        )
+
+        self.post_event(event)
+
+        self.payment.refresh_from_db()
+        self.assertEqual(self.payment.status, Payment.StatusEnum.expired)
+
+    def test_completed_event_for_a_replaced_session_pays(self, notify):
+        claim_session_refresh(self.payment)
+        event = checkout_event(
+            "evt_1", "checkout.session.completed", "cs_test_1"
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.post_event(event)
+
+        self.payment.refresh_from_db()
+        self.assertEqual(self.payment.status, Payment.StatusEnum.paid)
+        notify.assert_called_once_with("cs_test_1")
+
+    def test_expired_event_for_a_replaced_session_is_ignored(self, notify):
+        claim_session_refresh(self.payment)
+        event = checkout_event(
+            "evt_1", "checkout.session.expired", "cs_test_1"
+        )
+
+        self.post_event(event)
+
+        self.payment.refresh_from_db()
+        self.assertEqual(self.payment.status, Payment.StatusEnum.initializing)
+
+    def test_invalid_signature_is_rejected(self, notify):
+        event = checkout_event(
+            "evt_1", "checkout.session.completed", "cs_test_1"
+        )
+
+        response = self.post_event(
+            event, signature=sign(json.dumps(event), secret="whsec_other")
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.payment.refresh_from_db()
+        self.assertEqual(self.payment.status, Payment.StatusEnum.pending)
+
+    def test_burst_of_replayed_events_is_applied_once(self, notify):
+        events = [
+            checkout_event(
+                f"evt_{number % 50}",
+                "checkout.session.completed",
+                "cs_test_1",
+            )
+            for number in range(500)
+        ]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            responses = [self.post_event(event) for event in events]
+
+        self.assertTrue(
+            all(response.status_code == 200 for response in responses)
+        )
+        self.assertEqual(StripeEvent.objects.count(), 50)
+        notify.assert_called_once_with("cs_test_1")
+
+    def test_success_redirect_does_not_change_status(self, notify):
+        self.client.force_authenticate(user=self.borrowing.user)
+        url = reverse("payment:payment-success", args=[self.borrowing.id])
+
+        response = self.client.get(url, {"payment_type": "1"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["status"], "Pending")
+        self.payment.refresh_from_db()
+        self.assertEqual(self.payment.status, Payment.StatusEnum.pending)
@@ -5,6 +5,7 @@ from payment.views import (
     PaymentSuccessView,
     PaymentCancelView,
     PaymentViewSet,
+    StripeWebhookView,
 )
 
 
@@ -22,5 +23,6 @@ urlpatterns = [
     path(
         "cancel/<int:pk>/", PaymentCancelView.as_view(), name="payment-cancel"
     ),
+    path("webhook/", StripeWebhookView.as_view(), name="payment-webhook"),
     path("", include(router.urls)),
 ]
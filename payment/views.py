@@ -1,83 +1,139 @@
+import stripe
+from django.conf import settings
 from django.db.models import QuerySet
 from django.http import JsonResponse
+from django.shortcuts import get_object_or_404
 from rest_framework import mixins, serializers
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.decorators import action
+from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.request import Request
+from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.viewsets import GenericViewSet
 
-from borrowing.models import Borrowing
+from library_service.conditional import ConditionalGetMixin
+from library_service.fastpath import FastReadMixin
+from library_service.fields import FieldSelectionMixin
 from payment.models import Payment
-from payment.payment_helper import telegram_payment_notification
-from payment.serializers import PaymentSerializer, PaymentListSerializer
+from payment.pagination import PaymentCursorPagination
+from payment.serializers import (
+    PAYMENT_LIST_READER,
+    PAYMENT_READER,
+    PaymentListSerializer,
+    PaymentSerializer,
+)
+from payment.webhooks import handle_event
 
 
 class PaymentSuccessView(APIView):
     def get(self, request: Request, *args, **kwargs) -> JsonResponse:
         """
-        Handles successful payments.
-        Retrieves the payment using the borrowing ID ("borrowing")
-        and payment type ("payment_type") from the request.
-        Updates the payment status to successful
-        and sends a notification via Telegram.
-        Returns a JSON response indicating success.
+        Landing page of a successful checkout.
+        Read-only: the payment status is changed by the Stripe webhook,
+        so this redirect can be replayed safely.
         """
-        borrowing = Borrowing.objects.get(id=kwargs["pk"])
-        payment_type = request.query_params["payment_type"]
-        payment = Payment.objects.get(
-            borrowing_id=borrowing.id, payment_type=payment_type
+        payment = get_payment_status(kwargs["pk"], request)
+        if payment["status"] == Payment.StatusEnum.paid:
+            message = "Payment was successful."
+        else:
+            message = "Payment is being processed."
+        return JsonResponse(
+            {"message": message, "status": payment["status"].label}
         )
-        payment.status = "2"
-        payment.save()
-        telegram_payment_notification(
-            payment=payment,
-            borrowing=borrowing,
-            payment_status="Success payment",
-            payment_type=payment_type,
-        )
-        return JsonResponse({"message": "Payment was successful."})
 
 
 class PaymentCancelView(APIView):
     def get(self, request: Request, *args, **kwargs) -> JsonResponse:
         """
-        Handles canceled or failed payments.
-
-        Retrieves the payment using the borrowing ID ("borrowing")
-        and payment type ("payment_type") from the request.
-        Updates the payment status to canceled/failed
-        and sends a notification via Telegram.
-        Returns a JSON response indicating success.
+        Landing page of a canceled checkout.
+        Read-only: the checkout session stays open until it expires,
+        which is reported by the Stripe webhook.
         """
-        borrowing = Borrowing.objects.get(id=kwargs["pk"])
-        payment_type = request.query_params["payment_type"]
-        payment = Payment.objects.get(
-            borrowing_id=borrowing.id, payment_type=payment_type
-        )
-        payment.status = "3"
-        payment.save()
-        telegram_payment_notification(
-            payment=payment,
-            borrowing=borrowing,
-            payment_status="Canceled payment",
-            payment_type=payment_type,
+        payment = get_payment_status(kwargs["pk"], request)
+        return JsonResponse(
+            {
+                "message": "Payment was canceled or failed.",
+                "status": payment["status"].label,
+            }
         )
-        return JsonResponse({"message": "Payment was canceled or failed."})
+
+
+def get_payment_status(borrowing_id: int, request: Request) -> dict:
+    payment = get_object_or_404(
+        Payment.objects.values("status"),
+        borrowing_id=borrowing_id,
+        payment_type=request.query_params.get("payment_type"),
+    )
+    payment["status"] = Payment.StatusEnum(payment["status"])
+    return payment
+
+
+class StripeWebhookView(APIView):
+    """
+    Receives Stripe checkout session events.
+
+    The signature is verified against STRIPE_WEBHOOK_SECRET and each
+    event is applied once; the view does no other work, so Stripe can
+    deliver bursts of events without being throttled.
+    """
+
+    authentication_classes = []
+    permission_classes = [AllowAny]
+    throttle_classes = []
+
+    def post(self, request: Request, *args, **kwargs) -> JsonResponse:
+        if not settings.STRIPE_WEBHOOK_SECRET:
+            return JsonResponse(
+                {"error": "Webhook is not configured."}, status=503
+            )
+        try:
+            event = stripe.Webhook.construct_event(
+                request.body,
+                request.META.get("HTTP_STRIPE_SIGNATURE", ""),
+                settings.STRIPE_WEBHOOK_SECRET,
+            )
+        except (ValueError, stripe.SignatureVerificationError):
+            return JsonResponse({"error": "Invalid signature."}, status=400)
+
+        handle_event(event)
+        return JsonResponse({"received": True})
 
 
 class PaymentViewSet(
-    GenericViewSet, mixins.ListModelMixin, mixins.RetrieveModelMixin
+    ConditionalGetMixin,
+    FieldSelectionMixin,
+    FastReadMixin,
+    GenericViewSet,
+    mixins.ListModelMixin,
+    mixins.RetrieveModelMixin,
 ):
     """
     ViewSet for managing payments.
 
     Allows retrieving a list of payments and individual payments.
-    Supports filtering by payment status.
+    Lists are cursor paginated, newest first.
+    Supports filtering by payment status, conditional requests
+    (ETag / Last-Modified) and "?fields=" / "?expand=" field selection.
+    Full responses are built from ".values()" rows, without serializers.
     """
 
-    queryset = Payment.objects.select_related("borrowing")
+    queryset = Payment.objects.select_related(
+        "borrowing__user"
+    ).prefetch_related("borrowing__book")
     permission_classes = [IsAuthenticated]
+    pagination_class = PaymentCursorPagination
     filterset_fields = ("status",)
+    select_related_fields = {
+        "borrowing": "borrowing",
+        "borrowing.user": "borrowing__user",
+    }
+    prefetch_related_fields = {"borrowing.book": "borrowing__book"}
+    fast_readers = {"list": PAYMENT_LIST_READER, "retrieve": PAYMENT_READER}
+    last_modified_fields = (
+        "updated_at",
+        "borrowing__updated_at",
+        "borrowing__book__updated_at",
+    )
 
     def get_serializer_class(self) -> serializers.SerializerMetaclass:
         """
@@ -94,9 +150,28 @@ class PaymentViewSet(
         Filters payments by status (canceled/paid/pending) and user.
         Returns the filtered queryset.
         """
-        queryset = self.queryset.select_related(
-            "borrowing__user"
-        ).prefetch_related("borrowing__book")
+        queryset = super().get_queryset()
         if not self.request.user.is_staff:
             return queryset.filter(borrowing__user_id=self.request.user.id)
         return queryset
+
+    @action(detail=True, methods=["get"], url_path="status")
+    def checkout_status(self, request: Request, pk: int = None) -> Response:
+        """
+        Returns the status and checkout URL of a payment.
+        Cheap enough to be polled while the checkout session is created.
+        """
+        payment = get_object_or_404(
+            self.get_queryset()
+            .select_related(None)
+            .prefetch_related(None)
+            .values("id", "status", "session_url"),
+            pk=pk,
+        )
+        return Response(
+            {
+                "id": payment["id"],
+                "status": Payment.StatusEnum(payment["status"]).label,
+                "checkout_url": payment["session_url"] or None,
+            }
+        )
@@ -0,0 +1,57 @@
+from functools import partial
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from payment.checkout import reported_statuses
+from payment.models import Payment, StripeEvent
+from payment.tasks import notify_payment_status
+
+
+EVENT_STATUSES = {
+    "checkout.session.completed": Payment.StatusEnum.paid,
+    "checkout.session.async_payment_succeeded": Payment.StatusEnum.paid,
+    "checkout.session.async_payment_failed": Payment.StatusEnum.canceled,
+    "checkout.session.expired": Payment.StatusEnum.expired,
+}
+
+
+def handle_event(event: dict) -> bool:
+    """
+    Applies a verified Stripe event exactly once.
+
+    The event id is inserted first, so a replayed event fails on the
+    primary key and is dropped. The payment moves out of "Pending" with
+    one conditional UPDATE on its session id (a payment on a session
+    being replaced counts too, see "reported_statuses"); the
+    notification is sent by a Celery task after commit.
+    Returns False for events that were already processed.
+    """
+    session = event["data"]["object"]
+    new_status = EVENT_STATUSES.get(event["type"])
+    if (
+        event["type"] == "checkout.session.completed"
+        and session.get("payment_status") == "unpaid"
+    ):
+        # Delayed payment methods report the outcome in a later event.
+        new_status = None
+
+    try:
+        with transaction.atomic():
+            StripeEvent.objects.create(
+                event_id=event["id"], type=event["type"]
+            )
+            if new_status is None:
+                return True
+            updated = Payment.objects.filter(
+                session_id=session["id"],
+                status__in=reported_statuses(new_status),
+            ).update(status=new_status, updated_at=timezone.now())
+            if updated:
+                transaction.on_commit(
+                    partial(notify_payment_status.delay, session["id"]),
+                    robust=True,
+                )
+    except IntegrityError:
+        return False
+    return True
@@ -1,8 +1,11 @@
-from django.contrib import admin
+from django.contrib import admin, messages
 from django.contrib.auth.admin import UserAdmin as DjangoUserAdmin
+from django.db.models import QuerySet
+from django.http import HttpRequest
 from django.utils.translation import gettext as _
 
 from user.models import User
+from user.revocation import revoke_user
 
 
 @admin.register(User)
@@ -37,3 +40,16 @@ class UserAdmin(DjangoUserAdmin):
     list_display = ("email", "first_name", "last_name", "is_staff")
     search_fields = ("email", "first_name", "last_name")
     ordering = ("email",)
+    actions = ("revoke_tokens",)
+
+    @admin.action(description=_("Revoke all tokens of selected users"))
+    def revoke_tokens(self, request: HttpRequest, queryset: QuerySet) -> None:
+        """Log compromised accounts out of every device."""
+        user_ids = list(queryset.values_list("pk", flat=True))
+        for user_id in user_ids:
+            revoke_user(user_id)
+        self.message_user(
+            request,
+            _("Tokens of %d users were revoked.") % len(user_ids),
+            messages.SUCCESS,
+        )
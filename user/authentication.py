@@ -0,0 +1,116 @@
+from django.core.cache import cache
+from django.db import router, transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import (
+    AuthenticationFailed,
+    InvalidToken,
+)
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import Token
+
+from user.models import User
+from user.revocation import is_revoked
+
+
+USER_CACHE_TIMEOUT = 60
+AUTH_FIELDS = ("id", "email", "is_staff", "is_active")
+
+
+def user_cache_key(user_id: int) -> str:
+    return f"users:auth:{user_id}"
+
+
+def invalidate_user(user_id: int) -> None:
+    """
+    Forget the cached fields of a user, now and again after the current
+    transaction commits, so a concurrent request cannot cache the old
+    row back.
+    """
+    key = user_cache_key(user_id)
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+def user_from_fields(values: tuple) -> User:
+    """
+    Build a user from its AUTH_FIELDS. The other fields are deferred,
+    they are loaded from the database only if they are accessed.
+    """
+    return User.from_db(router.db_for_read(User), AUTH_FIELDS, values)
+
+
+def get_user_id(validated_token: Token) -> int:
+    try:
+        return validated_token[api_settings.USER_ID_CLAIM]
+    except KeyError:
+        raise InvalidToken(
+            _("Token contained no recognizable user identification")
+        )
+
+
+class RevocationCheckMixin:
+    """Rejects tokens revoked on logout or for a compromised account."""
+
+    def get_validated_token(self, raw_token: bytes) -> Token:
+        token = super().get_validated_token(raw_token)
+        if is_revoked(token):
+            raise InvalidToken(_("Token has been revoked"))
+        return token
+
+
+class CachedJWTAuthentication(RevocationCheckMixin, JWTAuthentication):
+    """
+    JWT authentication resolving "request.user" from a short-lived cache
+    of its id, email, is_staff and is_active instead of one query per
+    request. The entry is dropped whenever the user is saved or deleted
+    (see user/signals.py), so deactivations apply on the next request.
+    """
+
+    def get_user(self, validated_token: Token) -> User:
+        if api_settings.CHECK_REVOKE_TOKEN:
+            # Needs the password hash, which is not cached.
+            return super().get_user(validated_token)
+
+        user_id = get_user_id(validated_token)
+        key = user_cache_key(user_id)
+        values = cache.get(key)
+        if values is None:
+            try:
+                values = User.objects.values_list(*AUTH_FIELDS).get(
+                    **{api_settings.USER_ID_FIELD: user_id}
+                )
+            except (User.DoesNotExist, ValueError):
+                raise AuthenticationFailed(
+                    _("User not found"), code="user_not_found"
+                )
+            cache.set(key, values, USER_CACHE_TIMEOUT)
+
+        user = user_from_fields(values)
+        if not user.is_active:
+            raise AuthenticationFailed(
+                _("User is inactive"), code="user_inactive"
+            )
+        return user
+
+
+class StatelessJWTAuthentication(RevocationCheckMixin, JWTAuthentication):
+    """
+    JWT authentication trusting the signed "email" and "is_staff" claims
+    of the token (see LoginSerializer): no database or cache lookup.
+    Changes to a user, deactivation included, only apply to tokens
+    issued afterwards.
+    """
+
+    def get_user(self, validated_token: Token) -> User:
+        user_id = get_user_id(validated_token)
+        try:
+            values = (
+                user_id,
+                validated_token["email"],
+                validated_token["is_staff"],
+                True,
+            )
+        except KeyError:
+            raise InvalidToken(_("Token has no user claims"))
+        return user_from_fields(values)
@@ -0,0 +1,211 @@
+import hashlib
+import logging
+import math
+import threading
+import time
+
+import redis
+from django.core.cache import cache
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import Token
+
+from library_service.redis_client import get_redis
+
+
+logger = logging.getLogger(__name__)
+
+REVOKED_KEY = "auth:revoked:{}"
+# Sorted set of every revoked item, scored by revocation time in ms:
+# processes replay it from their last position to update their filter.
+REVOCATION_LOG = "auth:revocations"
+SYNC_INTERVAL = 1
+# Entries are replayed from slightly before the last position, so that
+# revocations stamped by a node with a late clock are not skipped.
+CLOCK_SKEW = 5
+FILTER_CAPACITY = 100_000
+FILTER_ERROR_RATE = 0.001
+
+
+class BloomFilter:
+    """
+    Set membership in a fixed bit array: no false negatives, and false
+    positives at about "error_rate" while "count" stays below "capacity".
+    """
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        self.capacity = capacity
+        self.size = math.ceil(
+            -capacity * math.log(error_rate) / math.log(2) ** 2
+        )
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str) -> list[int]:
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        step = int.from_bytes(digest[8:], "little") | 1
+        return [(first + i * step) % self.size for i in range(self.hashes)]
+
+    def add(self, item: str) -> None:
+        added = False
+        for position in self._positions(item):
+            mask = 1 << (position & 7)
+            if not self.bits[position >> 3] & mask:
+                self.bits[position >> 3] |= mask
+                added = True
+        self.count += added
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+
+class RedisRevocationList:
+    """
+    Revoked items in Redis, mirrored in a per-process Bloom filter.
+
+    Each revoked item has its own key, expiring with the token, and an
+    entry in REVOCATION_LOG. Lookups only hit Redis when the filter
+    matches, so checking a valid token costs a memory lookup. The filter
+    is updated from the log at most every SYNC_INTERVAL seconds and
+    rebuilt once it holds more than its capacity.
+    """
+
+    def __init__(
+        self,
+        client: redis.Redis,
+        capacity: int = FILTER_CAPACITY,
+        error_rate: float = FILTER_ERROR_RATE,
+        sync_interval: float = SYNC_INTERVAL,
+    ) -> None:
+        self.client = client
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_interval = sync_interval
+        self.filter = BloomFilter(capacity, error_rate)
+        self.position = None
+        self.synced_at = None
+        self.lock = threading.Lock()
+
+    def revoke(self, item: str, value: int, expires_at: int) -> None:
+        now = time.time()
+        if expires_at <= now:
+            return
+        retention = api_settings.REFRESH_TOKEN_LIFETIME.total_seconds()
+        with self.client.pipeline() as pipe:
+            pipe.set(REVOKED_KEY.format(item), value, exat=expires_at)
+            pipe.zadd(REVOCATION_LOG, {item: int(now * 1000)})
+            pipe.zremrangebyscore(
+                REVOCATION_LOG, 0, int((now - retention) * 1000)
+            )
+            pipe.execute()
+        with self.lock:
+            self.filter.add(item)
+
+    def lookup(self, item: str) -> int | None:
+        """
+        Return the value an item was revoked with, None if it was not.
+        When the filter matches but Redis cannot confirm, the item is
+        reported revoked, as of now.
+        """
+        self.sync()
+        if item not in self.filter:
+            return None
+        try:
+            value = self.client.get(REVOKED_KEY.format(item))
+        except redis.RedisError:
+            logger.warning("Revocation store unavailable.", exc_info=True)
+            return int(time.time())
+        return None if value is None else int(value)
+
+    def sync(self) -> None:
+        now = time.monotonic()
+        if self.synced_at and now - self.synced_at < self.sync_interval:
+            return
+        with self.lock:
+            if self.synced_at and now - self.synced_at < self.sync_interval:
+                return
+            rebuild = self.position is None or (
+                self.filter.count > self.capacity
+            )
+            start = 0 if rebuild else self.position - CLOCK_SKEW * 1000
+            try:
+                entries = self.client.zrangebyscore(
+                    REVOCATION_LOG, start, "+inf", withscores=True
+                )
+            except redis.RedisError:
+                logger.warning("Revocation store unavailable.", exc_info=True)
+                # Retried at the next interval, not on every request.
+                self.synced_at = now
+                return
+            if rebuild:
+                self.filter = BloomFilter(self.capacity, self.error_rate)
+            for item, score in entries:
+                self.filter.add(item.decode())
+                self.position = max(self.position or 0, int(score))
+            if self.position is None:
+                self.position = 0
+            self.synced_at = now
+
+
+class CacheRevocationList:
+    """Revoked items in the default cache, used without REDIS_URL."""
+
+    def revoke(self, item: str, value: int, expires_at: int) -> None:
+        timeout = expires_at - time.time()
+        if timeout > 0:
+            cache.set(REVOKED_KEY.format(item), value, timeout)
+
+    def lookup(self, item: str) -> int | None:
+        return cache.get(REVOKED_KEY.format(item))
+
+
+_lists = {}
+_lock = threading.Lock()
+
+
+def get_revocation_list() -> RedisRevocationList | CacheRevocationList:
+    """Return the revocation list shared by the whole process."""
+    client = get_redis()
+    with _lock:
+        if client not in _lists:
+            if client is None:
+                _lists[client] = CacheRevocationList()
+            else:
+                _lists[client] = RedisRevocationList(client)
+        return _lists[client]
+
+
+def revoke_token(token: Token) -> None:
+    """Revoke one access or refresh token until it expires."""
+    get_revocation_list().revoke(f"jti:{token['jti']}", 1, token["exp"])
+
+
+def revoke_user(user_id: int) -> None:
+    """
+    Revoke every token issued to a user before the current second. Token
+    "iat" claims are in whole seconds: a token issued in the same second
+    as the revocation stays valid, so logging in again right after it
+    works.
+    """
+    now = int(time.time())
+    lifetime = max(
+        api_settings.ACCESS_TOKEN_LIFETIME,
+        api_settings.REFRESH_TOKEN_LIFETIME,
+    )
+    get_revocation_list().revoke(
+        f"user:{user_id}", now, now + int(lifetime.total_seconds())
+    )
+
+
+def is_revoked(token: Token) -> bool:
+    revocations = get_revocation_list()
+    if revocations.lookup(f"jti:{token.get('jti')}") is not None:
+        return True
+    revoked_at = revocations.lookup(
+        f"user:{token.get(api_settings.USER_ID_CLAIM)}"
+    )
+    return revoked_at is not None and token.get("iat", 0) < revoked_at
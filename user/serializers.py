@@ -1,6 +1,15 @@
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+)
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken, Token
+
+from user.revocation import is_revoked
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -28,3 +37,40 @@ class UserSerializer(serializers.ModelSerializer):
             user.save()
 
         return user
+
+
+class LoginSerializer(TokenObtainPairSerializer):
+    """
+    Issues token pairs carrying the "email" and "is_staff" claims
+    trusted by StatelessJWTAuthentication.
+    """
+
+    @classmethod
+    def get_token(cls, user: settings.AUTH_USER_MODEL) -> Token:
+        token = super().get_token(user)
+        token["email"] = user.email
+        token["is_staff"] = user.is_staff
+        return token
+
+
+class RefreshSerializer(TokenRefreshSerializer):
+    """Refuses to refresh revoked refresh tokens."""
+
+    def validate(self, attrs: dict) -> dict:
+        if is_revoked(self.token_class(attrs["refresh"])):
+            raise InvalidToken("Token has been revoked")
+        return super().validate(attrs)
+
+
+class LogoutSerializer(serializers.Serializer):
+    refresh = serializers.CharField(write_only=True)
+
+    def validate_refresh(self, value: str) -> RefreshToken:
+        try:
+            token = RefreshToken(value)
+        except TokenError as error:
+            raise serializers.ValidationError(str(error))
+        user = self.context["request"].user
+        if str(token.get(api_settings.USER_ID_CLAIM)) != str(user.pk):
+            raise serializers.ValidationError("Token of another user.")
+        return token
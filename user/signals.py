@@ -0,0 +1,19 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from user.authentication import invalidate_user
+from user.models import User
+from user.revocation import revoke_user
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_user_cache(instance: User, **kwargs) -> None:
+    invalidate_user(instance.pk)
+
+
+@receiver(post_save, sender=User)
+def revoke_inactive_user_tokens(
+    instance: User, created: bool, **kwargs
+) -> None:
+    if not created and not instance.is_active:
+        revoke_user(instance.pk)
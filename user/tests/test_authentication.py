@@ -0,0 +1,112 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.exceptions import (
+    AuthenticationFailed,
+    InvalidToken,
+)
+from rest_framework_simplejwt.tokens import AccessToken
+
+from user.authentication import (
+    CachedJWTAuthentication,
+    StatelessJWTAuthentication,
+)
+from user.serializers import LoginSerializer
+
+
+LOCMEM_CACHE = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "authentication-tests",
+    }
+}
+
+
+def auth_header(token):
+    return {"HTTP_AUTHORIZATION": f"Bearer {token}"}
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class CachedJWTAuthenticationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.user = get_user_model().objects.create_user(
+            email="user@example.com",
+            first_name="Test",
+            last_name="User",
+            password="password123",
+        )
+        self.token = AccessToken.for_user(self.user)
+
+    def authenticate(self):
+        request = APIRequestFactory().get("/", **auth_header(self.token))
+        return CachedJWTAuthentication().authenticate(request)[0]
+
+    def test_user_is_resolved_from_the_cache(self):
+        with self.assertNumQueries(1):
+            self.authenticate()
+        with self.assertNumQueries(0):
+            user = self.authenticate()
+
+        self.assertEqual(user.pk, self.user.pk)
+        self.assertEqual(user.email, "user@example.com")
+        self.assertFalse(user.is_staff)
+        with self.assertNumQueries(1):
+            self.assertEqual(user.first_name, "Test")
+
+    def test_deactivated_user_is_rejected(self):
+        self.authenticate()
+
+        self.user.is_active = False
+        self.user.save()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    def test_profile_update_refreshes_the_cache(self):
+        self.authenticate()
+
+        response = APIClient().patch(
+            reverse("user:user-manage"),
+            {"email": "renamed@example.com"},
+            format="json",
+            **auth_header(self.token),
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.authenticate().email, "renamed@example.com")
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.first_name, "Test")
+        self.assertTrue(self.user.check_password("password123"))
+
+
+class StatelessJWTAuthenticationTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email="staff@example.com",
+            first_name="Staff",
+            last_name="User",
+            password="password123",
+            is_staff=True,
+        )
+
+    def authenticate(self, token):
+        request = APIRequestFactory().get("/", **auth_header(token))
+        return StatelessJWTAuthentication().authenticate(request)[0]
+
+    def test_user_is_built_from_the_claims(self):
+        token = LoginSerializer.get_token(self.user).access_token
+
+        with self.assertNumQueries(0):
+            user = self.authenticate(token)
+
+        self.assertEqual(user.pk, self.user.pk)
+        self.assertEqual(user.email, "staff@example.com")
+        self.assertTrue(user.is_staff)
+
+    def test_token_without_claims_is_rejected(self):
+        with self.assertRaises(InvalidToken):
+            self.authenticate(AccessToken.for_user(self.user))
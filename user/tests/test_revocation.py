@@ -0,0 +1,158 @@
+import time
+from unittest import skipUnless
+from unittest.mock import patch
+
+import redis
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from library_service.tests.test_throttling import (
+    TEST_REDIS_URL,
+    redis_available,
+)
+from user.revocation import (
+    BloomFilter,
+    RedisRevocationList,
+    revoke_user,
+)
+from user.serializers import LoginSerializer
+
+
+LOCMEM_CACHE = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "revocation-tests",
+    }
+}
+
+
+class BloomFilterTests(SimpleTestCase):
+    def test_no_false_negatives_and_few_false_positives(self):
+        bloom = BloomFilter(capacity=10_000, error_rate=0.01)
+        for number in range(10_000):
+            bloom.add(f"jti:{number}")
+
+        self.assertTrue(all(f"jti:{n}" in bloom for n in range(10_000)))
+        false_positives = sum(
+            f"other:{number}" in bloom for number in range(10_000)
+        )
+        self.assertLess(false_positives, 200)
+
+
+@override_settings(CACHES=LOCMEM_CACHE, REDIS_URL=None)
+class LogoutTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.user = get_user_model().objects.create_user(
+            email="user@example.com",
+            first_name="Test",
+            last_name="User",
+            password="password123",
+        )
+        self.refresh = LoginSerializer.get_token(self.user)
+        self.client = APIClient()
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {self.refresh.access_token}"
+        )
+
+    def test_logout_revokes_both_tokens(self):
+        other_session = LoginSerializer.get_token(self.user)
+
+        response = self.client.post(
+            reverse("user:logout"), {"refresh": str(self.refresh)}
+        )
+
+        self.assertEqual(response.status_code, 204)
+        me = self.client.get(reverse("user:user-manage"))
+        self.assertEqual(me.status_code, 401)
+        refreshed = APIClient().post(
+            reverse("user:token_refresh"), {"refresh": str(self.refresh)}
+        )
+        self.assertEqual(refreshed.status_code, 401)
+        refreshed = APIClient().post(
+            reverse("user:token_refresh"), {"refresh": str(other_session)}
+        )
+        self.assertEqual(refreshed.status_code, 200)
+
+    def test_cannot_revoke_tokens_of_another_user(self):
+        other = get_user_model().objects.create_user(
+            email="other@example.com",
+            first_name="Other",
+            last_name="User",
+            password="password123",
+        )
+
+        response = self.client.post(
+            reverse("user:logout"),
+            {"refresh": str(LoginSerializer.get_token(other))},
+        )
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_revoking_a_user_revokes_earlier_tokens(self):
+        with patch("user.revocation.time.time", return_value=time.time() + 1):
+            revoke_user(self.user.pk)
+
+        me = self.client.get(reverse("user:user-manage"))
+        self.assertEqual(me.status_code, 401)
+
+    def test_tokens_issued_after_revoking_a_user_are_valid(self):
+        revoke_user(self.user.pk)
+        access_token = LoginSerializer.get_token(self.user).access_token
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {access_token}")
+
+        me = client.get(reverse("user:user-manage"))
+
+        self.assertEqual(me.status_code, 200)
+
+
+@skipUnless(redis_available(), "Redis is not available.")
+class RedisRevocationListTests(SimpleTestCase):
+    def setUp(self):
+        redis.Redis.from_url(TEST_REDIS_URL).flushdb()
+
+    def process(self, capacity=1000):
+        return RedisRevocationList(
+            redis.Redis.from_url(TEST_REDIS_URL),
+            capacity=capacity,
+            sync_interval=0,
+        )
+
+    def test_revocations_reach_other_processes(self):
+        first, second = self.process(), self.process()
+        second.sync()
+
+        first.revoke("jti:abc", 1, int(time.time()) + 60)
+
+        self.assertEqual(second.lookup("jti:abc"), 1)
+        self.assertIsNone(second.lookup("jti:other"))
+
+    def test_valid_tokens_are_checked_in_memory(self):
+        revocations = self.process()
+        revocations.revoke("jti:abc", 1, int(time.time()) + 60)
+        revocations.sync_interval = 60
+        revocations.sync()
+
+        with patch.object(
+            redis.Redis, "execute_command", autospec=True
+        ) as execute_command:
+            self.assertIsNone(revocations.lookup("jti:other"))
+
+        execute_command.assert_not_called()
+
+    def test_filter_is_rebuilt_without_expired_entries(self):
+        revocations = self.process(capacity=10)
+        for number in range(11):
+            revocations.revoke(f"jti:{number}", 1, int(time.time()) + 60)
+        redis.Redis.from_url(TEST_REDIS_URL).zrem(
+            "auth:revocations", *(f"jti:{n}" for n in range(10))
+        )
+
+        revocations.sync()
+
+        self.assertEqual(revocations.filter.count, 1)
@@ -1,17 +1,59 @@
-from rest_framework import generics
+from rest_framework import generics, status
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework_simplejwt.views import (
+    TokenObtainPairView,
+    TokenRefreshView,
+)
 
 from user.models import User
-from user.serializers import UserSerializer
+from user.revocation import revoke_token
+from user.serializers import (
+    LoginSerializer,
+    LogoutSerializer,
+    RefreshSerializer,
+    UserSerializer,
+)
 
 
 class CreateUserView(generics.CreateAPIView):
     serializer_class = UserSerializer
 
 
+class LoginView(TokenObtainPairView):
+    serializer_class = LoginSerializer
+    throttle_scope = "login"
+
+
+class RefreshView(TokenRefreshView):
+    serializer_class = RefreshSerializer
+
+
+class LogoutView(generics.GenericAPIView):
+    """
+    Revoke the given refresh token and the access token of the request.
+    """
+
+    serializer_class = LogoutSerializer
+    permission_classes = (IsAuthenticated,)
+
+    def post(self, request: Request) -> Response:
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        revoke_token(serializer.validated_data["refresh"])
+        if request.auth is not None:
+            revoke_token(request.auth)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
 class ManageUserView(generics.RetrieveUpdateAPIView):
     serializer_class = UserSerializer
     permission_classes = (IsAuthenticated,)
 
     def get_object(self) -> User:
-        return self.request.user
+        """
+        Load the user afresh: "request.user" may be built from cached
+        fields or token claims, which must not be saved back.
+        """
+        return User.objects.get(pk=self.request.user.pk)